@@ -0,0 +1,70 @@
+import time
+import traceback
+
+import lego.ga_utils as GaUtils
+import lego.rng as Rng
+from lego.brick import LegoBrick
+from lego.collection import LegoBrickCollection
+from lego.layout import LegoBrickLayout
+
+BENCHMARK_SEED = 0
+BENCHMARK_SIZES = [25, 50, 100]
+BENCHMARK_PARENTS = 20
+BENCHMARK_SECONDS = 2.0
+
+
+def createParents(size: int, amount: int):
+    bricks = [
+        LegoBrick(1, 1),
+        LegoBrick(2, 1),
+        LegoBrick(4, 1),
+        LegoBrick(2, 2),
+        LegoBrick(4, 2),
+        LegoBrick(8, 2)
+    ]
+    collection = LegoBrickCollection()
+    collection.initialize(size * size, bricks, uniform=True)
+
+    parents = []
+    for _ in range(amount):
+        layout = LegoBrickLayout()
+        layout.initialize(size, size, collection)
+        parents.append(layout)
+    return parents
+
+
+def benchmarkCrossovers():
+    print("\nCrossover throughput (children per second):")
+    print("%10s" % "size" + "".join(
+        "%12s" % crossoverType.name.lower()
+        for crossoverType in GaUtils.Crossovers))
+
+    for size in BENCHMARK_SIZES:
+        Rng.seed(BENCHMARK_SEED)
+        parents = createParents(size, BENCHMARK_PARENTS)
+        line = "%10s" % ("%dx%d" % (size, size))
+        for crossoverType in GaUtils.Crossovers:
+            children = 0
+            attempts = 0
+            start = time.perf_counter()
+            while time.perf_counter() - start < BENCHMARK_SECONDS:
+                first = parents[attempts % len(parents)]
+                second = parents[(attempts + 1) % len(parents)]
+                attempts += 1
+                result = GaUtils.evolve(first, second, 0.0, crossoverType)
+                if result is not None:
+                    children += len(result)
+            line += "%12.1f" % (children / (time.perf_counter() - start))
+        print(line)
+
+
+# Run the program
+if __name__ == "__main__":
+    try:
+        benchmarkCrossovers()
+    except KeyboardInterrupt:
+        print("\n\nProcess aborted by the user!")
+    except Exception as e:
+        print("Some error occurred during the running! Process aborted..")
+        print("\nError:", str(e))
+        traceback.print_tb(e.__traceback__)
@@ -2,5 +2,8 @@
     on disk as a Python package directories. """
 
 __all__ = [
-    "utils", "exceptions", "brick", "collection", "layout", "ga", "ga_utils"
+    "utils", "exceptions", "brick", "collection", "layout", "ga", "ga_utils",
+    "rng", "scheduler", "seeding", "bounds", "ga_async", "dispatch",
+    "statistics", "profiling", "telemetry",
+    "memory", "render"
 ]
@@ -0,0 +1,59 @@
+# bounds.py
+
+import numpy as np
+
+from lego.collection import LegoBrickCollection
+
+
+def getCoverageBound(width: int, height: int,
+                     brickCollection: LegoBrickCollection) -> int:
+    """
+    The method calculates an upper bound of the area that the available bricks of a collection
+    can cover in a layer: the biggest total area of bricks that fits in the layer area
+    (a bounded knapsack over the bricks areas). The bricks that don't fit in the layer
+    in any orientation are ignored.
+
+    Parameters
+    ----------
+    width : int
+        The layer width.
+    height : int
+        The layer height.
+    brickCollection : LegoBrickCollection
+        The collection of bricks to cover the layer with.
+
+    Returns
+    ----------
+    int
+        The coverage upper bound, at most width * height.
+    """
+    layerArea = width * height
+    areas = []
+    amounts = []
+    for brick, amount in zip(brickCollection.getAvailableBricksTypes(),
+                             brickCollection.getAvailableBricksAmounts()):
+        if (brick.getHeight() <= width and brick.getWidth() <= height) or (
+                brick.getWidth() <= width and brick.getHeight() <= height):
+            areas.append(brick.getArea())
+            amounts.append(amount)
+
+    inventoryArea = int(np.dot(areas, amounts)) if len(areas) > 0 else 0
+    if inventoryArea <= layerArea:
+        return inventoryArea
+
+    # reachable[a] is true if some of the bricks have a total area of a
+    reachable = np.zeros(layerArea + 1, dtype=bool)
+    reachable[0] = True
+    for area, amount in zip(areas, amounts):
+        # a bounded amount is split to groups of 1, 2, 4, ... bricks
+        group = 1
+        while amount > 0:
+            shift = min(group, amount) * area
+            amount -= min(group, amount)
+            group *= 2
+            if shift <= layerArea:
+                reachable[shift:] = reachable[shift:] | reachable[:-shift]
+        if reachable[layerArea]:
+            return layerArea
+
+    return int(np.flatnonzero(reachable)[-1])
@@ -1,9 +1,11 @@
 # collection.py
 
+import itertools
 from typing import List
 
 import numpy as np
 
+import lego.rng as Rng
 from lego.brick import LegoBrick
 from lego.exceptions import NotInitializedException
 
@@ -27,6 +29,10 @@ class LegoBrickCollection(object):
         Gets a random brick from the collection.
     getBrick(width: int, height: int) -> LegoBrick:
         Gets a specific size brick from the collection if it available.
+    getAvailableBricksTypes() -> List[LegoBrick]:
+        Gets the types of the bricks that are still available in the collection.
+    getAvailableBricksAmounts() -> List[int]:
+        Gets the amounts of the bricks types that are still available in the collection.
     returnBrick(brick: LegoBrick) -> bool:
         Returns a brick to the collection.
     getAmountOfAvailableBricks() -> int:
@@ -35,7 +41,8 @@ class LegoBrickCollection(object):
         Gets the number of bricks typed in the collection.
     """
 
-    __next_brick_id = 1
+    # shared by all the collections, next() of a count is atomic between threads
+    __next_brick_id = itertools.count(1)
 
     def __init__(self):
         self.__initialized = False
@@ -123,7 +130,7 @@ class LegoBrickCollection(object):
                 i for i in range(len(self.__brickTypes))
                 if self.__availableBricks[i] > 0
             ]
-            index = np.random.choice(bricks, 1, replace=False)[0]
+            index = Rng.getGenerator().choice(bricks)
         else:
             bricks = []
             probabilities = []
@@ -139,15 +146,13 @@ class LegoBrickCollection(object):
                     bricks.append(i)
                     probabilities.append(
                         self.__brickTypes[i].getArea() / allBrickArea)
-            index = np.random.choice(
-                bricks, 1, replace=False, p=probabilities)[0]
+            index = Rng.getGenerator().choice(bricks, p=probabilities)
 
         self.__availableBricks[index] -= 1
         self.__amountOfAvailableBricks -= 1
         copied = self.__brickTypes[index].copy()
-        copied.setId(LegoBrickCollection.__next_brick_id)
+        copied.setId(next(LegoBrickCollection.__next_brick_id))
         self.__generatedBricks.append(copied)
-        LegoBrickCollection.__next_brick_id += 1
         return copied
 
     def getBrick(self, width: int, height: int) -> LegoBrick:
@@ -177,14 +182,65 @@ class LegoBrickCollection(object):
                 if (self.__availableBricks[i] < 1):
                     return None
                 self.__availableBricks[i] -= 1
+                self.__amountOfAvailableBricks -= 1
                 copied = brick.copy()
-                copied.setId(LegoBrickCollection.__next_brick_id)
+                copied.setId(next(LegoBrickCollection.__next_brick_id))
                 self.__generatedBricks.append(copied)
-                LegoBrickCollection.__next_brick_id += 1
                 return copied
 
         return None
 
+    def getAvailableBricksTypes(self) -> List[LegoBrick]:
+        """
+        Gets the types of the bricks that are still available in the collection.
+
+        Returns
+        -------
+        List[LegoBrick]
+            The available bricks types, sorted by their area. Use getBrick() to take one of them.
+
+        Raises
+        ------
+        NotInitializedException
+            If this method called before initialize() method
+        """
+        if not self.__initialized:
+            raise NotInitializedException(
+                "The instance used before calling initialize method")
+
+        if self.__amountOfAvailableBricks == 0:
+            return []
+
+        return [
+            self.__brickTypes[i] for i in range(len(self.__brickTypes))
+            if self.__availableBricks[i] > 0
+        ]
+
+    def getAvailableBricksAmounts(self) -> List[int]:
+        """
+        Gets the amounts of the bricks types that are still available in the collection.
+
+        Returns
+        -------
+        List[int]
+            The available amount of every type, in the order of getAvailableBricksTypes().
+
+        Raises
+        ------
+        NotInitializedException
+            If this method called before initialize() method
+        """
+        if not self.__initialized:
+            raise NotInitializedException(
+                "The instance used before calling initialize method")
+
+        if self.__amountOfAvailableBricks == 0:
+            return []
+
+        return [
+            int(amount) for amount in self.__availableBricks if amount > 0
+        ]
+
     def returnBrick(self, brick: LegoBrick) -> bool:
         """
         Returns a brick to the collection.
@@ -272,6 +328,44 @@ class LegoBrickCollection(object):
             copy.__initialized = True
         return copy
 
+    @staticmethod
+    def skipBrickIds(lastId: int):
+        """
+        Makes the IDs of the next generated bricks bigger than an ID,
+        used when bricks are loaded from outside (e.g. from a checkpoint).
+        The method isn't thread safe, it shouldn't run while bricks are generated.
+
+        Parameters
+        ----------
+        lastId : int
+            The ID that the next generated bricks IDs will be bigger than.
+        """
+        nextId = next(LegoBrickCollection.__next_brick_id)
+        LegoBrickCollection.__next_brick_id = itertools.count(
+            max(nextId, lastId + 1))
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        if self.__initialized and len(self.__brickTypes) > 0:
+            # the generated bricks are kept as an array, which pickles much faster
+            state["_LegoBrickCollection__generatedBricks"] = np.array(
+                [[brick.getWidth(),
+                  brick.getHeight(),
+                  brick.getId()] for brick in self.__generatedBricks],
+                dtype=np.int32).reshape(-1, 3)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self.__initialized and len(self.__brickTypes) > 0:
+            generated = self.__generatedBricks
+            self.__generatedBricks = [
+                LegoBrick(int(width), int(height), int(id))
+                for width, height, id in generated
+            ]
+            if len(generated) > 0:
+                LegoBrickCollection.skipBrickIds(int(generated[:, 2].max()))
+
     def isInitialized(self) -> bool:
         """
         Gets the initialization state of the instance
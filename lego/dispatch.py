@@ -0,0 +1,192 @@
+# dispatch.py
+
+import threading
+from collections import deque
+
+from lego.ga import GenerationSnapshot, LegoBrickGA
+
+
+class HandlerDispatcher(LegoBrickGA.GaResultHandler):
+    """
+    A result handler that passes the generations to another handler on a background thread,
+    so a slow handler (logging, plotting, persistence) doesn't stall the evolution.
+    The handler receives compact snapshots through GaResultHandler.onGaSnapshot():
+    they hold the best layer and the read-only coverages array, without the population.
+    The snapshots wait in a bounded queue, when it is full the oldest snapshot is dropped.
+
+    Methods
+    -------
+    onGaSnapshot(snapshot: GenerationSnapshot):
+        Queues a compact snapshot of the generation for the handler.
+    flush():
+        Waits until the handler received every queued snapshot.
+    close():
+        Passes the last snapshot and the queued snapshots to the handler, and stops the thread.
+    getDroppedAmount() -> int:
+        Gets the amount of snapshots that were dropped since the queue was full.
+    needsPopulation() -> bool:
+        False, the evolution passes compact snapshots to the dispatcher.
+    """
+
+    def __init__(self,
+                 generationResultHandler: LegoBrickGA.GaResultHandler,
+                 queueSize: int = 16,
+                 decimation: int = 1):
+        """
+        HandlerDispatcher constructor.
+
+        Parameters
+        ----------
+        generationResultHandler : GaResultHandler
+            The handler to pass the generations to.
+        queueSize : int [default = 16]
+            The maximal amount of snapshots that wait for the handler.
+        decimation : int [default = 1]
+            Only every decimation-th generation is passed to the handler,
+            besides the last generation which is passed on close().
+
+        Raises
+        ------
+        TypeError
+            If the handler is None.
+        ValueError
+            If the queue size or the decimation is smaller than 1.
+        """
+        super(HandlerDispatcher, self).__init__()
+        if generationResultHandler is None:
+            raise TypeError("generation result handler is none!")
+        if queueSize < 1:
+            raise ValueError("queue size must be bigger then 0!")
+        if decimation < 1:
+            raise ValueError("decimation must be bigger then 0!")
+        self.__handler = generationResultHandler
+        self.__decimation = decimation
+        self.__queue = deque(maxlen=queueSize)
+        self.__condition = threading.Condition()
+        self.__thread = None
+        self.__closed = False
+        self.__busy = False
+        self.__error = None
+        self.__received = 0
+        self.__dropped = 0
+        self.__skipped = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+
+    def onGaSnapshot(self, snapshot: GenerationSnapshot):
+        """
+        Queues a compact snapshot of the generation for the handler, unless the generation
+        is skipped by the decimation.
+
+        Parameters
+        ----------
+        snapshot : GenerationSnapshot
+            The snapshot of the generation.
+
+        Raises
+        ------
+        ValueError
+            If the dispatcher is closed.
+        """
+        if self.__closed:
+            raise ValueError("the dispatcher is closed!")
+        self.__received += 1
+        if (self.__received - 1) % self.__decimation != 0:
+            # the evolution doesn't modify the layers after its last generation,
+            # so the last skipped snapshot can be compacted on close()
+            self.__skipped = snapshot
+            return
+        self.__skipped = None
+        self.__put(HandlerDispatcher.__compact(snapshot))
+
+    def flush(self):
+        """
+        Waits until the handler received every queued snapshot.
+        """
+        with self.__condition:
+            while (len(self.__queue) > 0 or self.__busy) and (
+                    self.__thread is not None and self.__thread.is_alive()):
+                self.__condition.wait()
+
+    def close(self):
+        """
+        Passes the last snapshot (if the decimation skipped it) and the queued snapshots
+        to the handler, and stops the thread.
+
+        Raises
+        ------
+        Exception
+            The first exception that the handler raised, if any.
+        """
+        if not self.__closed:
+            if self.__skipped is not None:
+                self.__put(HandlerDispatcher.__compact(self.__skipped))
+                self.__skipped = None
+            with self.__condition:
+                self.__closed = True
+                self.__condition.notify_all()
+            if self.__thread is not None:
+                self.__thread.join()
+        if self.__error is not None:
+            error, self.__error = self.__error, None
+            raise error
+
+    def getDroppedAmount(self) -> int:
+        """
+        Gets the amount of snapshots that were dropped since the queue was full.
+
+        Returns
+        -------
+        int
+            The amount of dropped snapshots.
+        """
+        return self.__dropped
+
+    def needsPopulation(self) -> bool:
+        return False
+
+    def getCheckpointState(self) -> object:
+        # the state has to include every generation before the checkpoint
+        self.flush()
+        return self.__handler.getCheckpointState()
+
+    def setCheckpointState(self, state: object):
+        self.__handler.setCheckpointState(state)
+
+    def __put(self, snapshot: GenerationSnapshot):
+        with self.__condition:
+            if len(self.__queue) == self.__queue.maxlen:
+                self.__dropped += 1
+            self.__queue.append(snapshot)
+            if self.__thread is None:
+                self.__thread = threading.Thread(
+                    target=self.__run, name="HandlerDispatcher", daemon=True)
+                self.__thread.start()
+            self.__condition.notify_all()
+
+    def __run(self):
+        while True:
+            with self.__condition:
+                self.__busy = False
+                self.__condition.notify_all()
+                while len(self.__queue) == 0 and not self.__closed:
+                    self.__condition.wait()
+                if len(self.__queue) == 0:
+                    return
+                snapshot = self.__queue.popleft()
+                self.__busy = True
+            try:
+                self.__handler.onGaSnapshot(snapshot)
+            except Exception as e:
+                if self.__error is None:
+                    self.__error = e
+
+    @staticmethod
+    def __compact(snapshot: GenerationSnapshot) -> GenerationSnapshot:
+        # the evolution doesn't modify the layers of a generation, so the best layer
+        # is shared with the population
+        return snapshot._replace(population=None)
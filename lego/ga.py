@@ -1,27 +1,167 @@
 # ga.py
 
+import os
+import pickle
 import time
-from abc import ABC, abstractmethod
-from typing import List
+from abc import ABC
+from collections import namedtuple
+from enum import Enum
+from typing import Iterator, List
 
 import numpy as np
 
+import lego.bounds as Bounds
 import lego.ga_utils as GaUtils
+import lego.memory as Memory
+import lego.profiling as Profiling
+import lego.rng as Rng
+import lego.seeding as Seeding
+import lego.statistics as Statistics
 import lego.utils as Utils
 from lego.brick import LegoBrick
 from lego.collection import LegoBrickCollection
 from lego.exceptions import NotInitializedException
 from lego.layout import LegoBrickLayout
+from lego.scheduler import OperatorScheduler
+
+GenerationSnapshot = namedtuple(
+    "GenerationSnapshot",
+    "generation best bestCoverage meanCoverage seconds elapsed statistics coverages population"
+)
+"""
+GenerationSnapshot holds the results of a generation:
+the generation number, the best layer and its coverage, the mean coverage of the population,
+the wall-clock seconds of the generation and since the evolution started,
+the statistics (as passed to GaResultHandler.onGaStatistics()), a read-only array of the
+coverage of every layer in the population and the population (None unless it was requested).
+The layers are shared with the evolution, don't modify them.
+"""
 
 
 class LegoBrickGA(object):
+    class StagnationResponse(Enum):
+        RESEED = 1
+        MUTATION_BOOST = 2
+        STOP = 3
+
+    __RESEED_FRACTION = 0.5
+    """
+    The fraction of the population, from the worst, that a reseed replaces.
+    """
+
+    __MAX_ATTEMPTS = 10
+    """
+    The attempts of a generation to create offspring are limited to this multiple of the population size.
+    """
+
+    __CHECKPOINT_VERSION = 3
+
+    __MEMORY_SAMPLE = 4
+    """
+    The amount of layers that are measured for the memory statistics of a generation.
+    """
+
     class GaResultHandler(ABC):
         def __init__(self):
             super(LegoBrickGA.GaResultHandler, self).__init__()
 
-        @abstractmethod
         def onGaResult(self, generation: int,
                        population: List[LegoBrickLayout]):
+            """
+            Called by onGaSnapshot() with the population of a generation.
+            Override it in order to receive the populations, a handler that overrides
+            onGaSnapshot() doesn't have to.
+
+            Parameters
+            ----------
+            generation : int
+                The generation number.
+            population : List[LegoBrickLayout]
+                The population, sorted by the covered area.
+            """
+            pass
+
+        def onGaSnapshot(self, snapshot: GenerationSnapshot):
+            """
+            Receives the snapshot of a generation, the default passes its population to
+            onGaResult() and its statistics to onGaStatistics().
+            A compact snapshot (see lego.dispatch.HandlerDispatcher) has no population,
+            so only its best layer is passed as the population.
+            Override it in order to use the snapshot directly, e.g. its coverages array.
+
+            Parameters
+            ----------
+            snapshot : GenerationSnapshot
+                The snapshot of the generation.
+            """
+            self.onGaResult(
+                snapshot.generation, snapshot.population
+                if snapshot.population is not None else [snapshot.best])
+            self.onGaStatistics(snapshot.generation, snapshot.statistics)
+
+        def onGaStatistics(self, generation: int, statistics: dict):
+            """
+            Called after onGaResult() with the measured statistics of the generation,
+            by their names. Override it in order to receive them.
+
+            Parameters
+            ----------
+            generation : int
+                The generation number.
+            statistics : dict
+                "coverageBound" - the coverage upper bound (see getCoverageBound()).
+                "coverage" - the CoverageStatistics of the population.
+                "runCoverage" - the CoverageStatistics of all the populations since the
+                evolution started (see lego.statistics.RunningStatistics).
+                "profile" - when profiling, the ProfileStatistics of the generation: the seconds
+                of its phases (population, selection, crossover, mutation, repair, dedup, sort,
+                localSearch, checkpoint, memory and handler - the time that the previous
+                generation was handled) and its counters (crossovers, crossoverFailures, mutations and
+                mutationFailures by the mutation, validateLayer and duplicateRejections).
+                "profileTotal" - when profiling, the ProfileStatistics of all the generations.
+                "stagnation" - the "rejectionRate" of the offspring in the generation,
+                the "generationsWithoutImprovement", the amount of "stagnations" so far
+                and the current "mutationThreshold".
+                "operators" - when the operators are adaptive, the OperatorStatistics
+                of the "crossovers" and the "mutations" by the operator name.
+                "memory" - when the memory is limited, the MemoryUsage of the population
+                (see lego.memory), measured on a sample of its layers.
+            """
+            pass
+
+        def needsPopulation(self) -> bool:
+            """
+            Whether the snapshots that the handler receives hold the whole population,
+            override it in order to receive compact snapshots (see GenerationSnapshot).
+
+            Returns
+            -------
+            bool
+                True by default.
+            """
+            return True
+
+        def getCheckpointState(self) -> object:
+            """
+            Gets the state of the handler that is saved in the checkpoints,
+            override it (and setCheckpointState()) in order to resume the handler.
+
+            Returns
+            -------
+            object
+                A picklable state, or None if the handler has no state.
+            """
+            return None
+
+        def setCheckpointState(self, state: object):
+            """
+            Restores the state of the handler from a checkpoint.
+
+            Parameters
+            ----------
+            state : object
+                The state that getCheckpointState() returned.
+            """
             pass
 
     def __init__(self,
@@ -29,7 +169,20 @@ class LegoBrickGA(object):
                  height: int,
                  brickCollection: LegoBrickCollection,
                  populationSize: int,
-                 mutationThreshold=float):
+                 mutationThreshold=float,
+                 seed: int = None,
+                 crossoverType: GaUtils.Crossovers = GaUtils.Crossovers.
+                 RECTANGLE,
+                 repairChildren: bool = False,
+                 adaptiveOperators: bool = False,
+                 localSearchElites: int = 0,
+                 localSearchBudget: float = 0.05,
+                 seededFraction: float = 0.0,
+                 stagnationResponse: StagnationResponse = None,
+                 stagnationGenerations: int = 10,
+                 rejectionThreshold: float = 0.9,
+                 profile: bool = False,
+                 maxMemory: int = None):
         if width < 1:
             raise ValueError("width must be bigger then 1!")
         self.__width = width
@@ -46,61 +199,439 @@ class LegoBrickGA(object):
             raise ValueError("population size must be bigger then 1!")
         if populationSize % 2 != 0:
             populationSize += 1
+        self.__maxMemory = maxMemory
+        if maxMemory is not None:
+            maxPopulationSize = Memory.getMaxPopulationSize(
+                width, height, brickCollection.getAvailableBricksTypes(),
+                maxMemory)
+            if maxPopulationSize < 2:
+                raise ValueError(
+                    "max memory is too small for a population of the board!")
+            if maxPopulationSize < populationSize:
+                print("\nThe population size was shrunk from", populationSize,
+                      "to", maxPopulationSize, "to fit in the max memory.")
+                populationSize = maxPopulationSize
         self.__populationSize = populationSize
         if mutationThreshold < 0.0 or mutationThreshold > 1.0:
             raise ValueError("mutation threshold must be in range [0.0,1.0]!")
         self.__mutationThreshold = mutationThreshold
+        self.__baseMutationThreshold = mutationThreshold
+        self.__crossoverType = crossoverType
+        self.__repairChildren = repairChildren
+        self.__crossoverScheduler = None
+        self.__mutationScheduler = None
+        if adaptiveOperators:
+            self.__crossoverScheduler = OperatorScheduler(
+                list(GaUtils.Crossovers))
+            if GaUtils.AdaptiveMutationsList is not None and len(
+                    GaUtils.AdaptiveMutationsList) > 0:
+                self.__mutationScheduler = OperatorScheduler(
+                    GaUtils.AdaptiveMutationsList)
+        if localSearchElites < 0:
+            raise ValueError("local search elites must not be negative!")
+        self.__localSearchElites = min(localSearchElites, populationSize)
+        if localSearchBudget < 0.0:
+            raise ValueError("local search budget must not be negative!")
+        self.__localSearchBudget = localSearchBudget
+        if seededFraction < 0.0 or seededFraction > 1.0:
+            raise ValueError("seeded fraction must be in range [0.0,1.0]!")
+        self.__seededFraction = seededFraction
+        self.__coverageBound = Bounds.getCoverageBound(width, height,
+                                                       brickCollection)
+        self.__stagnationResponse = stagnationResponse
+        if stagnationGenerations < 1:
+            raise ValueError("stagnation generations must be bigger then 0!")
+        self.__stagnationGenerations = stagnationGenerations
+        if rejectionThreshold < 0.0 or rejectionThreshold > 1.0:
+            raise ValueError("rejection threshold must be in range [0.0,1.0]!")
+        self.__rejectionThreshold = rejectionThreshold
+        self.__rejectionRate = 0.0
+        self.__rejected = False
+        self.__generationsWithoutImprovement = 0
+        self.__stagnations = 0
+        self.__stopped = False
+        # The runs are reproducible since every population member and every
+        # generation draws from its own stream spawned from this sequence.
+        self.__seedSequence = np.random.SeedSequence(seed)
+        self.__resumeState = None
+        self.__runningStatistics = Statistics.RunningStatistics()
+        self.__profiler = Profiling.Profiler() if profile else None
 
     def evolveGeneration(self,
                          nTimes=1,
-                         generationResultHandler: GaResultHandler = None
-                         ) -> LegoBrickLayout:
-        population = self.__generatePopulations()
+                         generationResultHandler: GaResultHandler = None,
+                         timeBudget: float = None,
+                         deadline: float = None,
+                         checkpointPath: str = None,
+                         checkpointInterval: float = 10.0) -> LegoBrickLayout:
+        """
+        Evolves a population for the given amount of generations.
+        A genetic algorithm that was loaded from a checkpoint (see loadCheckpoint())
+        continues from the generation of the checkpoint.
 
-        print("\nStarting genetic algorithm..")
-        self.__invokeHandler(generationResultHandler, 0, population)
+        Parameters
+        ----------
+        nTimes : int [default = 1]
+            The maximal amount of generations.
+        generationResultHandler : GaResultHandler [default = None]
+            Receives the population and the statistics of every generation.
+        timeBudget : float [default = None]
+            The wall-clock seconds that the call may take, None for no limit.
+        deadline : float [default = None]
+            The time.monotonic() time that the call has to end by, None for no deadline.
+            With a time budget, the earlier of them is used.
+        checkpointPath : str [default = None]
+            The file to save checkpoints of the evolution to, None for no checkpoints.
+        checkpointInterval : float [default = 10.0]
+            The minimal wall-clock seconds between two checkpoints.
 
-        print(
-            "You can stop the process by pressing CTRL+C, the result until the stopping moment will be displayed."
-        )
+        Returns
+        -------
+        LegoBrickLayout
+            The best layer of the last completed generation.
 
-        Utils.printProgressBar(
-            0,
+        Notes
+        -----
+        With a time budget or a deadline, a generation is started only if the last generation
+        fits in the remaining time, and the local search budget of every generation is adapted
+        to the time that the remaining generations leave to it.
+        """
+        snapshot = None
+        starting = True
+        generations = self.iterGenerations(
             nTimes,
-            prefix="Progress",
-            suffix="of generations has evolved",
-            fill='#')
-
+            timeBudget,
+            deadline,
+            includePopulation=generationResultHandler is not None
+            and generationResultHandler.needsPopulation(),
+            checkpointPath=checkpointPath,
+            checkpointInterval=checkpointInterval,
+            generationResultHandler=generationResultHandler)
         try:
-            for i in range(nTimes):
-                if population[0].getCoveredArea(
-                ) == population[0].getWidth() * population[1].getHeight():
-                    # found optimal solution
-                    return population[0]
-                newPopulation = self.__evolve(population)
-                population = newPopulation  # avoid running over on cancel event
+            for snapshot in generations:
+                if starting:
+                    print("\nStarting genetic algorithm..")
+                    if snapshot.generation == 0:
+                        # a resumed evolution starts from a generation that
+                        # the handler has received before the checkpoint
+                        self.__invokeHandler(generationResultHandler,
+                                             snapshot)
+                    print(
+                        "You can stop the process by pressing CTRL+C, the result until the stopping moment will be displayed."
+                    )
                 Utils.printProgressBar(
-                    i + 1,
+                    snapshot.generation,
                     nTimes,
                     prefix="Progress",
                     suffix="of generations has evolved",
                     fill='#')
-                self.__invokeHandler(generationResultHandler, i + 1,
-                                     population)
+                if not starting:
+                    self.__invokeHandler(generationResultHandler, snapshot)
+                starting = False
         except KeyboardInterrupt:
             print("\n\nProcess aborted by the user!")
+            if snapshot is None:
+                raise
+        finally:
+            generations.close()
 
-        result = max(population, key=lambda item: item.getCoveredArea())
         print("Genetic algorithm finished!")
-        return result
+        return snapshot.best
+
+    def iterGenerations(self,
+                        nTimes=1,
+                        timeBudget: float = None,
+                        deadline: float = None,
+                        includePopulation: bool = False,
+                        checkpointPath: str = None,
+                        checkpointInterval: float = 10.0,
+                        generationResultHandler: GaResultHandler = None
+                        ) -> Iterator[GenerationSnapshot]:
+        """
+        Evolves a population generation by generation, as a generator.
+        The initial population is yielded as generation 0, and the iteration ends after nTimes
+        generations, or earlier when the coverage bound is reached, the evolution stagnated
+        (see StagnationResponse.STOP) or the time is over.
+        The caller may stop the iteration at any time.
+        A genetic algorithm that was loaded from a checkpoint (see loadCheckpoint()) yields
+        the generation of the checkpoint first, and continues from it up to nTimes generations.
+
+        Parameters
+        ----------
+        nTimes : int [default = 1]
+            The maximal amount of generations.
+        timeBudget : float [default = None]
+            The wall-clock seconds that the iteration may take, None for no limit.
+        deadline : float [default = None]
+            The time.monotonic() time that the iteration has to end by, None for no deadline.
+            With a time budget, the earlier of them is used.
+        includePopulation : bool [default = False]
+            If true the snapshots hold the whole population, otherwise only its best layer.
+        checkpointPath : str [default = None]
+            The file to save checkpoints of the evolution to, None for no checkpoints.
+            A checkpoint is saved between the generations when the interval passed,
+            and when the iteration ends or is stopped (by the caller or by a KeyboardInterrupt
+            in the middle of a generation, which saves the last completed generation).
+        checkpointInterval : float [default = 10.0]
+            The minimal wall-clock seconds between two checkpoints.
+        generationResultHandler : GaResultHandler [default = None]
+            The handler whose state (see GaResultHandler.getCheckpointState()) is saved
+            in the checkpoints.
+
+        Returns
+        -------
+        Iterator[GenerationSnapshot]
+            The snapshot of every generation.
+        """
+        start = time.monotonic()
+        if timeBudget is not None:
+            if timeBudget < 0.0:
+                raise ValueError("time budget must not be negative!")
+            deadline = start + timeBudget if deadline is None else min(
+                deadline, start + timeBudget)
+
+        if checkpointInterval < 0.0:
+            raise ValueError("checkpoint interval must not be negative!")
+
+        Profiling.setProfiler(self.__profiler)
+        resumed = self.__resumeState is not None
+        if resumed:
+            population, generation = self.__resumeState
+            self.__resumeState = None
+        else:
+            generation = 0
+            self.__mutationThreshold = self.__baseMutationThreshold
+            self.__rejectionRate = 0.0
+            self.__generationsWithoutImprovement = 0
+            self.__stagnations = 0
+            self.__stopped = False
+            self.__runningStatistics = Statistics.RunningStatistics()
+            if self.__profiler is not None:
+                self.__profiler = Profiling.Profiler()
+                Profiling.setProfiler(self.__profiler)
+            population = self.__generatePopulations()
+        firstGeneration = generation
+        lastCheckpoint = time.monotonic()
+        # the last completed generation, an interrupted generation isn't saved
+        completedPopulation, completedGeneration = population, generation
+        try:
+            # the statistics and the profile of a resumed generation were kept
+            # in the checkpoint
+            yield from self.__publish(
+                self.__createSnapshot(generation, population,
+                                      time.monotonic() - start, start,
+                                      includePopulation, resumed), resumed)
+
+            evolveSeconds = 0.0
+            for generation in range(firstGeneration, nTimes):
+                if self.__stopped:
+                    print("\nThe evolution stagnated after", generation,
+                          "generations, stopping..")
+                    break
+                if population[0].getCoveredArea() >= self.__coverageBound:
+                    # found optimal solution
+                    break
+                if checkpointPath is not None and time.monotonic(
+                ) - lastCheckpoint >= checkpointInterval:
+                    checkpointStart = Profiling.start()
+                    self.__saveCheckpoint(checkpointPath, population,
+                                          generation, generationResultHandler)
+                    Profiling.stop("checkpoint", checkpointStart)
+                    lastCheckpoint = time.monotonic()
+                searchBudget = self.__localSearchBudget
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= evolveSeconds:
+                        # the next generation won't be completed in time
+                        print("\nThe time budget expired after",
+                              generation - firstGeneration, "generations.")
+                        break
+                    # the local search takes at most the time that the evolution
+                    # of the remaining generations leaves
+                    searchBudget = min(
+                        searchBudget,
+                        remaining / (nTimes - generation) - evolveSeconds)
+                best = population[0].getCoveredArea()
+                generationStart = time.monotonic()
+                population = self.__evolve(population)
+                evolveSeconds = time.monotonic() - generationStart
+                if self.__localSearchElites > 0 and searchBudget > 0:
+                    searchStart = Profiling.start()
+                    self.__improveElites(population, searchBudget)
+                    Profiling.stop("localSearch", searchStart)
+                stagnated = self.__detectStagnation(
+                    best, population[0].getCoveredArea())
+                # counted before the yield, so a checkpoint saved when the
+                # caller stops at the yield labels the population correctly
+                generation += 1
+                snapshot = self.__createSnapshot(
+                    generation, population,
+                    time.monotonic() - generationStart, start,
+                    includePopulation)
+                # the response is applied before the yield too, so a checkpoint
+                # saved when the caller stops at the yield resumes like a run
+                # that wasn't stopped
+                if stagnated:
+                    self.__stopped = self.__stagnationResponse == (
+                        LegoBrickGA.StagnationResponse.STOP)
+                    if not self.__stopped:
+                        population = self.__respondStagnation(population)
+                completedPopulation, completedGeneration = population, generation
+                yield from self.__publish(snapshot)
+        except (GeneratorExit, KeyboardInterrupt):
+            # the caller stopped the iteration between two generations,
+            # or the user stopped it in the middle of a generation
+            if checkpointPath is not None:
+                self.__saveCheckpoint(checkpointPath, completedPopulation,
+                                      completedGeneration,
+                                      generationResultHandler)
+            raise
+        if checkpointPath is not None:
+            self.__saveCheckpoint(checkpointPath, population, generation,
+                                  generationResultHandler)
+
+    @staticmethod
+    def loadCheckpoint(path: str,
+                       generationResultHandler: GaResultHandler = None
+                       ) -> 'LegoBrickGA':
+        """
+        Loads a genetic algorithm from a checkpoint (see iterGenerations()).
+        The next evolution of the loaded genetic algorithm continues from the population,
+        the generation and the random generators state of the checkpoint,
+        so a seeded run that is resumed evolves like a run that wasn't stopped.
+
+        Parameters
+        ----------
+        path : str
+            The checkpoint file.
+        generationResultHandler : GaResultHandler [default = None]
+            A handler to restore the state that was saved in the checkpoint into.
+
+        Returns
+        -------
+        LegoBrickGA
+            The loaded genetic algorithm.
+
+        Raises
+        ------
+        ValueError
+            If the file isn't a checkpoint of a supported version.
+        """
+        with open(path, "rb") as file:
+            checkpoint = pickle.load(file)
+        if not isinstance(checkpoint, dict) or checkpoint.get(
+                "version") != LegoBrickGA.__CHECKPOINT_VERSION:
+            raise ValueError("unsupported checkpoint file!")
+        ga = checkpoint["ga"]
+        ga.__resumeState = (checkpoint["population"], checkpoint["generation"])
+        if generationResultHandler is not None:
+            generationResultHandler.setCheckpointState(checkpoint["handler"])
+        return ga
+
+    def getCoverageBound(self) -> int:
+        """
+        Gets an upper bound of the coverage that the bricks collection can reach,
+        the evolution stops when the best layer reaches it.
+
+        Returns
+        -------
+        int
+            The coverage upper bound.
+        """
+        return self.__coverageBound
+
+    def __publish(self, snapshot: GenerationSnapshot, resumed: bool = False
+                  ) -> Iterator[GenerationSnapshot]:
+        if self.__profiler is not None and not resumed:
+            self.__profiler.nextGeneration()
+        start = Profiling.start()
+        yield snapshot
+        # the iteration may be resumed by another thread (see lego.ga_async)
+        Profiling.setProfiler(self.__profiler)
+        if not resumed:
+            # the caller handles the generation until it resumes the iteration
+            Profiling.stop("handler", start)
+
+    def __saveCheckpoint(self, path: str, population: List[LegoBrickLayout],
+                         generation: int,
+                         generationResultHandler: GaResultHandler):
+        checkpoint = {
+            "version": LegoBrickGA.__CHECKPOINT_VERSION,
+            "ga": self,
+            "population": population,
+            "generation": generation,
+            "handler": None if generationResultHandler is None else
+            generationResultHandler.getCheckpointState()
+        }
+        # the checkpoint is written aside and replaces the previous one at once,
+        # so a crash never leaves a partial checkpoint
+        temporaryPath = path + ".tmp"
+        with open(temporaryPath, "wb") as file:
+            pickle.dump(checkpoint, file, protocol=pickle.HIGHEST_PROTOCOL)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporaryPath, path)
 
     def __invokeHandler(self, generationResultHandler: GaResultHandler,
-                        generation: int, population: List[LegoBrickLayout]):
+                        snapshot: GenerationSnapshot):
         if generationResultHandler is not None:
-            generationResultHandler.onGaResult(generation, population)
+            generationResultHandler.onGaSnapshot(snapshot)
+
+    def __createSnapshot(self,
+                         generation: int,
+                         population: List[LegoBrickLayout],
+                         seconds: float,
+                         start: float,
+                         includePopulation: bool,
+                         resumed: bool = False) -> GenerationSnapshot:
+        covered = np.array([layout.getCoveredArea() for layout in population],
+                           dtype=np.int32)
+        covered.flags.writeable = False
+        coverage = Statistics.getCoverageStatistics(covered)
+        if not resumed:
+            self.__runningStatistics.addAll(covered)
+        statistics = self.__getStatistics(coverage)
+        if self.__maxMemory is not None:
+            memoryStart = Profiling.start()
+            statistics["memory"] = Memory.getPopulationUsage(
+                population, LegoBrickGA.__MEMORY_SAMPLE)
+            Profiling.stop("memory", memoryStart)
+        return GenerationSnapshot(
+            generation, population[int(np.argmax(covered))], coverage.max,
+            coverage.mean, seconds, time.monotonic() - start, statistics,
+            covered,
+            list(population) if includePopulation else None)
+
+    def __getStatistics(self,
+                        coverage: Statistics.CoverageStatistics) -> dict:
+        statistics = {
+            "coverageBound": self.__coverageBound,
+            "coverage": coverage,
+            "runCoverage": self.__runningStatistics.getStatistics(),
+            "stagnation": {
+                "rejectionRate": self.__rejectionRate,
+                "generationsWithoutImprovement":
+                self.__generationsWithoutImprovement,
+                "stagnations": self.__stagnations,
+                "mutationThreshold": self.__mutationThreshold
+            }
+        }
+        if self.__crossoverScheduler is not None:
+            statistics["operators"] = {
+                "crossovers": self.__crossoverScheduler.getStatistics(),
+                "mutations": {}
+            }
+            if self.__mutationScheduler is not None:
+                statistics["operators"][
+                    "mutations"] = self.__mutationScheduler.getStatistics()
+        if self.__profiler is not None:
+            statistics["profile"] = self.__profiler.getGeneration()
+            statistics["profileTotal"] = self.__profiler.getTotal()
+        return statistics
 
     def __generatePopulations(self) -> List[LegoBrickLayout]:
         print("\nGenerating population..")
+        start = Profiling.start()
 
         Utils.printProgressBar(
             0,
@@ -109,22 +640,35 @@ class LegoBrickGA(object):
             suffix="of population has created",
             fill='#')
 
+        populationSequence = self.__seedSequence.spawn(1)[0]
         population = []
+        seededAmount = round(self.__seededFraction * self.__populationSize)
+        seeded = 0
+        seedingAttempts = 0
         while len(population) < self.__populationSize:
-            bricks = self.__brickCollection.copy()
-            layout = LegoBrickLayout()
-            layout.initialize(self.__width, self.__height, bricks)
-            if not layout.isInitialized():
-                raise NotInitializedException(
-                    "Failed on try to initialize LegoBrickLayout")
+            # each candidate owns a stream, so it does not matter who creates it
+            Rng.setGenerator(Rng.spawnGenerators(populationSequence, 1)[0])
+            # the heuristics may repeat themselves on small boards, so after
+            # too many attempts the rest of the population is random
+            isSeeded = seeded < seededAmount and (seedingAttempts <
+                                                  seededAmount * 10)
+            if isSeeded:
+                layout = self.__createLayout(Seeding.SeedingsList[
+                    seedingAttempts % len(Seeding.SeedingsList)])
+                seedingAttempts += 1
+            else:
+                layout = self.__createLayout()
             toAdd = True
             for layoutInPopulation in population:
                 if (layoutInPopulation.hasSameCoverage(layout)):
                     toAdd = False
                     break
             if not toAdd:
+                Profiling.count("duplicateRejections")
                 continue
             population.append(layout)
+            if isSeeded:
+                seeded += 1
             Utils.printProgressBar(
                 len(population),
                 self.__populationSize,
@@ -133,11 +677,88 @@ class LegoBrickGA(object):
                 fill='#')
 
         population.sort(key=lambda item: item.getCoveredArea(), reverse=True)
+        Profiling.stop("population", start)
         print("A population of", len(population), " created.")
         return population
 
+    def __createLayout(self,
+                       seeding: Seeding.Seedings = None) -> LegoBrickLayout:
+        bricks = self.__brickCollection.copy()
+        if seeding is not None:
+            layout = Seeding.createLayout(seeding, self.__width,
+                                          self.__height, bricks)
+        else:
+            layout = LegoBrickLayout()
+            layout.initialize(self.__width, self.__height, bricks)
+        if not layout.isInitialized():
+            raise NotInitializedException(
+                "Failed on try to initialize LegoBrickLayout")
+        return layout
+
+    def __detectStagnation(self, previousBest: int, best: int) -> bool:
+        if best > previousBest:
+            self.__generationsWithoutImprovement = 0
+            # a boost lasts until the next improvement
+            self.__mutationThreshold = self.__baseMutationThreshold
+        else:
+            self.__generationsWithoutImprovement += 1
+
+        if self.__stagnationResponse is None:
+            return False
+        if not self.__rejected and (self.__generationsWithoutImprovement <
+                                    self.__stagnationGenerations):
+            return False
+        self.__generationsWithoutImprovement = 0
+        self.__stagnations += 1
+        return True
+
+    def __respondStagnation(
+            self, population: List[LegoBrickLayout]) -> List[LegoBrickLayout]:
+        if self.__stagnationResponse == (
+                LegoBrickGA.StagnationResponse.MUTATION_BOOST):
+            self.__mutationThreshold = min(1.0, self.__mutationThreshold * 2)
+            return population
+
+        # replace the worst layers with new ones
+        Rng.setGenerator(Rng.spawnGenerators(self.__seedSequence, 1)[0])
+        generator = Rng.getGenerator()
+        kept = population[:len(population) - int(
+            len(population) * LegoBrickGA.__RESEED_FRACTION)]
+        newPopulation = list(kept)
+        attempts = 0
+        while len(newPopulation) < len(population) and (
+                attempts < len(population) * LegoBrickGA.__MAX_ATTEMPTS):
+            attempts += 1
+            seeding = None
+            if generator.random() < self.__seededFraction:
+                seeding = Seeding.SeedingsList[generator.integers(
+                    len(Seeding.SeedingsList))]
+            layout = self.__createLayout(seeding)
+            if not any(
+                    item.hasSameCoverage(layout) for item in newPopulation):
+                newPopulation.append(layout)
+        self.__fillFrom(newPopulation, population, len(population))
+
+        newPopulation.sort(
+            key=lambda item: item.getCoveredArea(), reverse=True)
+        return newPopulation
+
+    def __fillFrom(self, newPopulation: List[LegoBrickLayout],
+                   population: List[LegoBrickLayout], size: int):
+        # the best layers of the population that aren't in the new population yet
+        for layout in population:
+            if len(newPopulation) >= size:
+                return
+            if not any(
+                    item.hasSameCoverage(layout) for item in newPopulation):
+                newPopulation.append(layout)
+
     def __evolve(self,
                  population: List[LegoBrickLayout]) -> List[LegoBrickLayout]:
+        start = Profiling.start()
+        Rng.setGenerator(Rng.spawnGenerators(self.__seedSequence, 1)[0])
+        generator = Rng.getGenerator()
+
         newPopulation = []
 
         newPopulation.append(population[0])
@@ -148,38 +769,93 @@ class LegoBrickGA(object):
         probabilities = []
         for item in population:
             probabilities.append(item.getCoveredArea() / populationValue)
+        Profiling.stop("selection", start)
 
+        attempts = 0
+        rejected = 0
+        self.__rejected = False
         while (len(newPopulation) < len(population)):
-            select = np.random.choice(
-                population, 2, replace=False, p=probabilities)
+            if attempts >= len(population) * LegoBrickGA.__MAX_ATTEMPTS or (
+                    self.__stagnationResponse is not None
+                    and attempts >= len(population)
+                    and rejected / attempts > self.__rejectionThreshold):
+                # the population saturated, the crossover fails or every child
+                # is a duplicate, the survivors complete the generation
+                self.__rejected = True
+                self.__fillFrom(newPopulation, population, len(population))
+                break
 
-            children = GaUtils.evolve(select[0], select[1],
-                                      self.__mutationThreshold)
-            if children is None:
-                continue
-            value = [select[0], select[1], children[0], children[1]]
-            value.sort(key=lambda item: item.getCoveredArea(), reverse=True)
+            # all the missing pairs are evolved as one batch, so the mutations
+            # run once over all the children of the batch
+            start = Profiling.start()
+            pairs = []
+            for _ in range((len(population) - len(newPopulation)) // 2):
+                pairs.append([
+                    population[index] for index in generator.choice(
+                        len(population), 2, replace=False, p=probabilities)
+                ])
+            Profiling.stop("selection", start)
 
-            potentialToAdd = []
+            childrenPairs = GaUtils.evolvePairs(
+                pairs, self.__mutationThreshold, self.__crossoverType,
+                self.__repairChildren, self.__crossoverScheduler,
+                self.__mutationScheduler)
 
-            for generateLayout in value:
-                toAdd = True
-                for populationLayout in newPopulation:
-                    if populationLayout.hasSameCoverage(generateLayout):
-                        toAdd = False
+            attempts += len(pairs)
+            start = Profiling.start()
+            for select, children in zip(pairs, childrenPairs):
+                if children is None:
+                    rejected += 1
+                    continue
+                value = [select[0], select[1], children[0], children[1]]
+                value.sort(
+                    key=lambda item: item.getCoveredArea(), reverse=True)
+
+                potentialToAdd = []
+
+                for generateLayout in value:
+                    toAdd = True
+                    for populationLayout in newPopulation:
+                        if populationLayout.hasSameCoverage(generateLayout):
+                            toAdd = False
+                            break
+                    if toAdd:
+                        potentialToAdd.append(generateLayout)
+                    if len(potentialToAdd) == 2:
                         break
-                if toAdd:
-                    potentialToAdd.append(generateLayout)
-                if len(potentialToAdd) == 2:
-                    break
 
-            if len(potentialToAdd) < 2:
-                continue
+                if len(potentialToAdd) < 2:
+                    Profiling.count("duplicateRejections")
+                    rejected += 1
+                    continue
 
-            newPopulation.append(potentialToAdd[0])
-            newPopulation.append(potentialToAdd[1])
+                newPopulation.append(potentialToAdd[0])
+                newPopulation.append(potentialToAdd[1])
+            Profiling.stop("dedup", start)
 
+        self.__rejectionRate = rejected / max(attempts, 1)
+        start = Profiling.start()
         newPopulation.sort(
             key=lambda item: item.getCoveredArea(), reverse=True)
+        Profiling.stop("sort", start)
 
         return newPopulation
+
+    def __improveElites(self, population: List[LegoBrickLayout],
+                        budget: float):
+        # every elite gets an equal share of the budget, in the clock of the deadline
+        start = time.monotonic()
+        share = budget / self.__localSearchElites
+        for i in range(self.__localSearchElites):
+            # the search runs on a copy, since the elite is shared with the
+            # previous generation
+            improved = population[i].copy()
+            if GaUtils.localSearch(improved, start + share * (i + 1)) <= 0:
+                continue
+            if any(
+                    layout.hasSameCoverage(improved)
+                    for layout in population):
+                continue
+            population[i] = improved
+
+        population.sort(key=lambda item: item.getCoveredArea(), reverse=True)
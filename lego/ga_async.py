@@ -0,0 +1,202 @@
+# ga_async.py
+
+import asyncio
+import math
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import AsyncIterator, List, Tuple
+
+from lego.ga import GenerationSnapshot, LegoBrickGA
+from lego.layout import LegoBrickLayout
+
+__END = object()
+
+
+async def iterGenerations(ga: LegoBrickGA,
+                          nTimes=1,
+                          timeBudget: float = None,
+                          deadline: float = None,
+                          includePopulation: bool = False,
+                          executor: Executor = None,
+                          chunkSize: int = 10
+                          ) -> AsyncIterator[GenerationSnapshot]:
+    """
+    Iterates the generations of a LegoBrickGA (see LegoBrickGA.iterGenerations()) without
+    blocking the event loop: every generation is computed by one call in the executor,
+    and the event loop runs between the generations.
+    In a ProcessPoolExecutor every call evolves a chunk of generations instead, from the
+    checkpoint (see LegoBrickGA.loadCheckpoint()) that the previous call saved, so the
+    genetic algorithm itself isn't evolved, and the snapshots of a chunk are yielded
+    when the chunk is completed.
+    Every run keeps a single call in the executor at a time, so the runs that share
+    an executor take turns by the order of their requests.
+
+    Parameters
+    ----------
+    ga : LegoBrickGA
+        The genetic algorithm to run.
+    nTimes : int [default = 1]
+        The maximal amount of generations.
+    timeBudget : float [default = None]
+        The wall-clock seconds that the iteration may take, None for no limit.
+    deadline : float [default = None]
+        The time.monotonic() time that the iteration has to end by, None for no deadline.
+    includePopulation : bool [default = False]
+        If true the snapshots hold the whole population, otherwise only its best layer.
+    executor : Executor [default = None]
+        The executor to run the generations in, None for the default executor of the loop.
+    chunkSize : int [default = 10]
+        The amount of generations that a call in a ProcessPoolExecutor evolves.
+
+    Returns
+    -------
+    AsyncIterator[GenerationSnapshot]
+        The snapshot of every generation.
+
+    Raises
+    ------
+    ValueError
+        If the chunk size isn't bigger then 0.
+    """
+    if chunkSize < 1:
+        raise ValueError("chunk size must be bigger then 0!")
+    if isinstance(executor, ProcessPoolExecutor):
+        if timeBudget is not None:
+            # the processes share the monotonic clock of the system
+            deadline = time.monotonic() + timeBudget if deadline is None \
+                else min(deadline, time.monotonic() + timeBudget)
+        async for snapshot in __iterChunks(ga, nTimes, deadline,
+                                           includePopulation, executor,
+                                           chunkSize):
+            yield snapshot
+        return
+
+    loop = asyncio.get_running_loop()
+    generations = ga.iterGenerations(nTimes, timeBudget, deadline,
+                                     includePopulation)
+    future = None
+    try:
+        while True:
+            future = loop.run_in_executor(executor, next, generations, __END)
+            # a running generation can't be interrupted, a cancellation leaves it
+            # to complete in the background
+            snapshot = await asyncio.shield(future)
+            if snapshot is __END:
+                return
+            yield snapshot
+    finally:
+        if future is not None and not future.done():
+            future.add_done_callback(lambda _: generations.close())
+        else:
+            generations.close()
+
+
+async def __iterChunks(ga: LegoBrickGA, nTimes: int, deadline: float,
+                       includePopulation: bool, executor: Executor,
+                       chunkSize: int) -> AsyncIterator[GenerationSnapshot]:
+    loop = asyncio.get_running_loop()
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "checkpoint")
+    source = ga
+    last = None
+    future = None
+    try:
+        while True:
+            end = chunkSize if last is None else last.generation + chunkSize
+            future = loop.run_in_executor(executor, __evolveChunk, source,
+                                          path, nTimes, end, deadline,
+                                          includePopulation)
+            snapshots, ended = await asyncio.shield(future)
+            # a resumed evolution yields the generation of the checkpoint first
+            for snapshot in snapshots if last is None else snapshots[1:]:
+                last = snapshot
+                yield snapshot
+            if ended:
+                return
+            source = None
+    finally:
+        # a running chunk is left to complete in the background, like a generation
+        if future is not None and not future.done():
+            future.add_done_callback(
+                lambda _: shutil.rmtree(directory, ignore_errors=True))
+        else:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+def __evolveChunk(ga: LegoBrickGA, path: str, nTimes: int, end: int,
+                  deadline: float, includePopulation: bool
+                  ) -> Tuple[List[GenerationSnapshot], bool]:
+    if ga is None:
+        ga = LegoBrickGA.loadCheckpoint(path)
+    # the generations are evolved up to nTimes like in a single run, and the iteration
+    # is stopped at the end of the chunk, which saves the checkpoint of the next chunk
+    generations = ga.iterGenerations(nTimes, None, deadline,
+                                     includePopulation, path, math.inf)
+    snapshots = []
+    try:
+        for snapshot in generations:
+            snapshots.append(snapshot)
+            if snapshot.generation >= end:
+                return snapshots, snapshot.generation >= nTimes
+        return snapshots, True
+    finally:
+        generations.close()
+
+
+async def evolveGeneration(ga: LegoBrickGA,
+                           nTimes=1,
+                           generationResultHandler: LegoBrickGA.
+                           GaResultHandler = None,
+                           timeBudget: float = None,
+                           deadline: float = None,
+                           executor: Executor = None,
+                           chunkSize: int = 10) -> LegoBrickLayout:
+    """
+    Evolves a LegoBrickGA like LegoBrickGA.evolveGeneration() without blocking the event loop.
+    A cancellation of the task stops the evolution like a KeyboardInterrupt does:
+    the task completes with the best layer of the last completed generation.
+
+    Parameters
+    ----------
+    ga : LegoBrickGA
+        The genetic algorithm to run.
+    nTimes : int [default = 1]
+        The maximal amount of generations.
+    generationResultHandler : GaResultHandler [default = None]
+        Receives the population and the statistics of every generation, in the event loop.
+    timeBudget : float [default = None]
+        The wall-clock seconds that the evolution may take, None for no limit.
+    deadline : float [default = None]
+        The time.monotonic() time that the evolution has to end by, None for no deadline.
+    executor : Executor [default = None]
+        The executor to run the generations in, None for the default executor of the loop
+        (see iterGenerations()).
+    chunkSize : int [default = 10]
+        The amount of generations that a call in a ProcessPoolExecutor evolves.
+
+    Returns
+    -------
+    LegoBrickLayout
+        The best layer of the last completed generation.
+
+    Raises
+    ------
+    asyncio.CancelledError
+        If the task is cancelled before the initial population is created.
+    """
+    snapshot = None
+    try:
+        async for snapshot in iterGenerations(
+                ga, nTimes, timeBudget, deadline,
+                generationResultHandler is not None
+                and generationResultHandler.needsPopulation(), executor,
+                chunkSize):
+            if generationResultHandler is not None:
+                generationResultHandler.onGaSnapshot(snapshot)
+    except asyncio.CancelledError:
+        if snapshot is None:
+            raise
+    return snapshot.best
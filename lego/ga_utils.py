@@ -1,43 +1,66 @@
 # ga_utils.py
 
+import time
 from enum import Enum
 from typing import List, Tuple
 
 import numpy as np
 
+import lego.profiling as Profiling
+import lego.rng as Rng
 import lego.utils as Utils
 from lego.layout import LegoBrickLayout
+from lego.scheduler import OperatorScheduler
 from lego.utils import Rectangle
 
 
 class Mutations(Enum):
     """
     Mutation is an enum Which represents the possible mutations.
-    You can cancel the use of certain mutations by changing the list MutationsList.
+    You can cancel the use of certain mutations by changing the list MutationsList
+    (and AdaptiveMutationsList for the adaptive operators).
     """
     CHANGE = 1
     ADD = 2
     REMOVE = 3
     MOVE = 4
+    SLIDE = 5
+    SNAP = 6
 
 
-MutationsList = list(Mutations)
+MutationsList = [
+    Mutations.CHANGE, Mutations.ADD, Mutations.REMOVE, Mutations.MOVE
+]
 """
 MutationList is the list of possible mutation during evolution.
 Change this list will effect evolve() method.
 """
 
-
-class __Directions(Enum):
-    LEFT = 1
-    UP = 2
-    RIGHT = 3
-    DOWN = 4
+AdaptiveMutationsList = list(Mutations)
+"""
+AdaptiveMutationsList is the list of possible mutations when they are selected by
+an OperatorScheduler (see LegoBrickGA adaptiveOperators), it adds the slide and the snap
+mutations, which the scheduler selects only as long as they pay off.
+"""
 
 
-def evolve(
-        firstParent: LegoBrickLayout, secondParent: LegoBrickLayout,
-        mutationThreshold: float) -> Tuple[LegoBrickLayout, LegoBrickLayout]:
+class Crossovers(Enum):
+    """
+    Crossovers is an enum Which represents the possible crossover operators.
+    """
+    RECTANGLE = 1
+    GUILLOTINE = 2
+    BAND = 3
+
+
+def evolve(firstParent: LegoBrickLayout,
+           secondParent: LegoBrickLayout,
+           mutationThreshold: float,
+           crossoverType: Crossovers = Crossovers.RECTANGLE,
+           repairChildren: bool = False,
+           crossoverScheduler: OperatorScheduler = None,
+           mutationScheduler: OperatorScheduler = None
+           ) -> Tuple[LegoBrickLayout, LegoBrickLayout]:
     """
     The method evolve 2 LegoBrickLayout (parents) using crossover and mutation.
 
@@ -49,24 +72,139 @@ def evolve(
         Second layer to evolve.
     mutationThreshold : float
         The probability of a mutation occurring, in range [0.0, 1.0]
+    crossoverType : Crossovers [default = Crossovers.RECTANGLE]
+        The crossover operator to use.
+    repairChildren : bool [default = False]
+        If true the holes that the crossover and the mutations left in the children will be
+        filled with repair().
+    crossoverScheduler : OperatorScheduler [default = None]
+        If not None, selects the crossover operator instead of crossoverType and learns from its result.
+    mutationScheduler : OperatorScheduler [default = None]
+        If not None, selects the mutations instead of MutationsList and learns from their results.
 
     Returns
     -------
     Tuple[LegoBrickLayout, LegoBrickLayout]
         The 2 evolved LegoBrickLayout (children) or None if an error occurred
     """
-    children = crossover(firstParent, secondParent)
-
-    if children is None:
-        return None
+    return evolvePairs([(firstParent, secondParent)], mutationThreshold,
+                       crossoverType, repairChildren, crossoverScheduler,
+                       mutationScheduler)[0]
+
+
+def evolvePairs(parentsPairs: List[Tuple[LegoBrickLayout, LegoBrickLayout]],
+                mutationThreshold: float,
+                crossoverType: Crossovers = Crossovers.RECTANGLE,
+                repairChildren: bool = False,
+                crossoverScheduler: OperatorScheduler = None,
+                mutationScheduler: OperatorScheduler = None
+                ) -> List[Tuple[LegoBrickLayout, LegoBrickLayout]]:
+    """
+    The method evolve pairs of LegoBrickLayout (parents) using crossover and mutation.
+    Every pair is crossed over by itself, then all the children are mutated as one batch
+    with mutateBatch().
 
-    if MutationsList is not None and len(MutationsList) > 0:
-        tryMutate(mutationThreshold, children[0])
-        tryMutate(mutationThreshold, children[1])
+    Parameters
+    ----------
+    parentsPairs : List[Tuple[LegoBrickLayout, LegoBrickLayout]]
+        The pairs of layers to evolve.
+    mutationThreshold : float
+        The probability of a mutation occurring, in range [0.0, 1.0]
+    crossoverType : Crossovers [default = Crossovers.RECTANGLE]
+        The crossover operator to use.
+    repairChildren : bool [default = False]
+        If true the holes that the crossover and the mutations left in the children will be
+        filled with repair().
+    crossoverScheduler : OperatorScheduler [default = None]
+        If not None, selects the crossover operator instead of crossoverType and learns from its result.
+    mutationScheduler : OperatorScheduler [default = None]
+        If not None, selects the mutations instead of MutationsList and learns from their results.
 
+    Returns
+    -------
+    List[Tuple[LegoBrickLayout, LegoBrickLayout]]
+        The 2 evolved LegoBrickLayout (children) of every pair, or None for a pair that an error occurred on
+    """
+    start = Profiling.start()
+    childrenPairs = [
+        __scheduledCrossover(firstParent, secondParent, crossoverType,
+                             crossoverScheduler)
+        for firstParent, secondParent in parentsPairs
+    ]
+    children = [
+        child for pair in childrenPairs if pair is not None for child in pair
+    ]
+    Profiling.stop("crossover", start)
+    Profiling.count("crossovers", len(childrenPairs))
+    Profiling.count("crossoverFailures",
+                    len(childrenPairs) - len(children) // 2)
+
+    if mutationScheduler is not None or (MutationsList is not None
+                                         and len(MutationsList) > 0):
+        start = Profiling.start()
+        mutateBatch(mutationThreshold, children, mutationScheduler)
+        Profiling.stop("mutation", start)
+
+    if repairChildren:
+        start = Profiling.start()
+        for child in children:
+            repair(child)
+        Profiling.stop("repair", start)
+
+    return childrenPairs
+
+
+def __scheduledCrossover(firstParent: LegoBrickLayout,
+                         secondParent: LegoBrickLayout,
+                         crossoverType: Crossovers,
+                         crossoverScheduler: OperatorScheduler
+                         ) -> Tuple[LegoBrickLayout, LegoBrickLayout]:
+    if crossoverScheduler is None:
+        return crossoverBy(crossoverType, firstParent, secondParent)
+
+    crossoverType = crossoverScheduler.select()
+    start = time.perf_counter()
+    children = crossoverBy(crossoverType, firstParent, secondParent)
+    seconds = time.perf_counter() - start
+    gain = 0
+    if children is not None:
+        gain = max(children[0].getCoveredArea(),
+                   children[1].getCoveredArea()) - max(
+                       firstParent.getCoveredArea(),
+                       secondParent.getCoveredArea())
+    crossoverScheduler.update(crossoverType, children is not None, gain,
+                              seconds)
     return children
 
 
+def crossoverBy(crossoverType: Crossovers, firstParent: LegoBrickLayout,
+                secondParent: LegoBrickLayout
+                ) -> Tuple[LegoBrickLayout, LegoBrickLayout]:
+    """
+    The method crossover 2 LegoBrickLayout with a specific crossover operator.
+
+    Parameters
+    ----------
+    crossoverType : Crossovers
+        The crossover operator to use.
+    firstParent : LegoBrickLayout
+        First layer to crossover.
+    secondParent : LegoBrickLayout
+        Second layer to crossover.
+
+    Returns
+    -------
+    Tuple[LegoBrickLayout, LegoBrickLayout]
+        The 2 crossovers children (LegoBrickLayout) or None if the operation did not succeed
+    """
+    if crossoverType == Crossovers.GUILLOTINE:
+        return guillotineCrossover(firstParent, secondParent)
+    elif crossoverType == Crossovers.BAND:
+        return bandCrossover(firstParent, secondParent)
+    else:
+        return crossover(firstParent, secondParent)
+
+
 def crossover(firstParent: LegoBrickLayout, secondParent: LegoBrickLayout
               ) -> Tuple[LegoBrickLayout, LegoBrickLayout]:
     """
@@ -95,10 +233,10 @@ def crossover(firstParent: LegoBrickLayout, secondParent: LegoBrickLayout
         width = min(firstParent.getWidth(), secondParent.getWidth())
         height = min(firstParent.getHeight(), secondParent.getHeight())
 
-        crossWidth = np.random.randint(2, width)
-        crossHeight = np.random.randint(2, height)
+        crossWidth = Rng.getGenerator().integers(2, width)
+        crossHeight = Rng.getGenerator().integers(2, height)
 
-        points = np.random.choice(width - crossWidth, 2)
+        points = Rng.getGenerator().choice(width - crossWidth, 2)
 
         firstChildCross, firstChildConstraints = getCrossAndConstraints(
             (points[0], points[0] + crossWidth - 1),
@@ -119,31 +257,201 @@ def crossover(firstParent: LegoBrickLayout, secondParent: LegoBrickLayout
         if i == 100:
             return None
 
-    firstChildBricks = firstChild.getAreaBricks()
     for brick in firstChildCross:
-        firstChildBricks.remove(brick)
-    secondChildBricks = secondChild.getAreaBricks()
+        firstChild.removeBrick(brick)
     for brick in secondChildCross:
-        secondChildBricks.remove(brick)
-
-    # Safe add but not efficient at all:
-    firstChild.validateLayer()
-    secondChild.validateLayer()
+        secondChild.removeBrick(brick)
 
+    # the resolved cross bricks don't overlap the constraints of the other child
     for brick in firstChildCross:
-        if not secondChild.tryAddBrick(brick[0], brick[1], brick[2], brick[3]):
-            # should not happend!
-            return None
-        secondChild.validateLayer()
+        secondChild.tryAddBrick(brick[0], brick[1], brick[2], brick[3])
     for brick in secondChildCross:
-        if not firstChild.tryAddBrick(brick[0], brick[1], brick[2], brick[3]):
-            # should not happend!
-            return None
-        firstChild.validateLayer()
+        firstChild.tryAddBrick(brick[0], brick[1], brick[2], brick[3])
 
     return (firstChild, secondChild)
 
 
+def guillotineCrossover(firstParent: LegoBrickLayout,
+                        secondParent: LegoBrickLayout
+                        ) -> Tuple[LegoBrickLayout, LegoBrickLayout]:
+    """
+    The method crossover 2 LegoBrickLayout by cutting them over a line that no brick
+    of both of them crosses, and swapping the parts beyond the line.
+    Since no brick crosses the line, the swap is always valid.
+    If the parents have no common free line, each parent is cut over its free line nearest
+    to a random line (or over the random line if it has no free line), the parts are swapped,
+    the bricks that overlap are dropped and the holes are repaired (see repair()).
+
+    Parameters
+    ----------
+    firstParent : LegoBrickLayout
+        First layer to crossover.
+    secondParent : LegoBrickLayout
+        Second layer to crossover.
+
+    Returns
+    -------
+    Tuple[LegoBrickLayout, LegoBrickLayout]
+        The 2 crossovers children (LegoBrickLayout) or None if the layers are a single cell
+    """
+    rowCuts = np.intersect1d(firstParent.getFreeRowCuts(),
+                             secondParent.getFreeRowCuts())
+    columnCuts = np.intersect1d(firstParent.getFreeColumnCuts(),
+                                secondParent.getFreeColumnCuts())
+    if len(rowCuts) + len(columnCuts) == 0:
+        return __nearestCutsCrossover(firstParent, secondParent)
+
+    index = Rng.getGenerator().integers(len(rowCuts) + len(columnCuts))
+    if index < len(rowCuts):
+        axis, cut = 0, rowCuts[index]
+    else:
+        axis, cut = 1, columnCuts[index - len(rowCuts)]
+
+    firstChild = firstParent.copy()
+    secondChild = secondParent.copy()
+    __swapBeyondCut(firstChild, secondParent, axis, cut, cut)
+    __swapBeyondCut(secondChild, firstParent, axis, cut, cut)
+    return (firstChild, secondChild)
+
+
+def __nearestCutsCrossover(firstParent: LegoBrickLayout,
+                           secondParent: LegoBrickLayout
+                           ) -> Tuple[LegoBrickLayout, LegoBrickLayout]:
+    sizes = (firstParent.getWidth(), firstParent.getHeight())
+    axes = [axis for axis in range(2) if sizes[axis] > 1]
+    if len(axes) == 0:
+        return None
+    generator = Rng.getGenerator()
+    axis = axes[generator.integers(len(axes))]
+    line = int(generator.integers(1, sizes[axis]))
+    firstCut = __getNearestCut(firstParent, axis, line)
+    secondCut = __getNearestCut(secondParent, axis, line)
+
+    firstChild = firstParent.copy()
+    secondChild = secondParent.copy()
+    __swapBeyondCut(firstChild, secondParent, axis, firstCut, secondCut)
+    __swapBeyondCut(secondChild, firstParent, axis, secondCut, firstCut)
+    repair(firstChild)
+    repair(secondChild)
+    return (firstChild, secondChild)
+
+
+def __getNearestCut(layer: LegoBrickLayout, axis: int, line: int) -> int:
+    cuts = layer.getFreeRowCuts() if axis == 0 else layer.getFreeColumnCuts()
+    if len(cuts) == 0:
+        return line
+    return int(cuts[np.argmin(np.abs(cuts - line))])
+
+
+def __swapBeyondCut(child: LegoBrickLayout, otherParent: LegoBrickLayout,
+                    axis: int, cut: int, otherCut: int):
+    # if the cut is free, a brick which starts beyond it is fully beyond it,
+    # otherwise the bricks of the other parent which overlap the kept bricks are dropped
+    for brick in [
+            brick for brick in child.getAreaBricks() if brick[axis] >= cut
+    ]:
+        child.removeBrick(brick)
+    for brick in otherParent.getAreaBricks():
+        if brick[axis] >= otherCut:
+            child.tryAddBrick(brick[0], brick[1], brick[2].copy(), brick[3])
+
+
+def bandCrossover(firstParent: LegoBrickLayout, secondParent: LegoBrickLayout
+                  ) -> Tuple[LegoBrickLayout, LegoBrickLayout]:
+    """
+    The method crossover 2 LegoBrickLayout by swapping the bricks inside a random band
+    of rows or columns.
+    The bricks are classified with set operations on the area matrices: a brick straddles
+    the band if its ID appears on both sides of a band boundary, and a brick is swapped
+    only if it doesn't overlap a brick that stays in the other layer.
+
+    Parameters
+    ----------
+    firstParent : LegoBrickLayout
+        First layer to crossover.
+    secondParent : LegoBrickLayout
+        Second layer to crossover.
+
+    Returns
+    -------
+    Tuple[LegoBrickLayout, LegoBrickLayout]
+        The 2 crossovers children (LegoBrickLayout) or None if the operation did not succeed
+    """
+    firstArea = firstParent.getAreaMatrix()
+    secondArea = secondParent.getAreaMatrix()
+    if firstArea.shape != secondArea.shape:
+        return None
+
+    for _ in range(100):
+        axis = Rng.getGenerator().integers(2)
+        size = firstArea.shape[axis]
+        start, end = np.sort(Rng.getGenerator().choice(size + 1, 2, False))
+        if end - start == size:
+            # swapping the whole layers gives the parents again
+            continue
+
+        # work on rows, a columns band is a rows band of the transposed matrix
+        first = firstArea if axis == 0 else firstArea.T
+        second = secondArea if axis == 0 else secondArea.T
+        firstMove = __getBandInsideIds(first, start, end)
+        secondMove = __getBandInsideIds(second, start, end)
+        firstBand, secondBand = first[start:end], second[start:end]
+
+        dirty = True
+        while dirty:
+            firstStay = (firstBand != 0) & ~np.isin(firstBand, firstMove)
+            secondBlocked = np.intersect1d(secondBand[firstStay], secondMove)
+            secondMove = np.setdiff1d(secondMove, secondBlocked)
+
+            secondStay = (secondBand != 0) & ~np.isin(secondBand, secondMove)
+            firstBlocked = np.intersect1d(firstBand[secondStay], firstMove)
+            firstMove = np.setdiff1d(firstMove, firstBlocked)
+
+            dirty = len(firstBlocked) != 0 or len(secondBlocked) != 0
+
+        if len(firstMove) == 0 and len(secondMove) == 0:
+            continue
+
+        if axis == 0:
+            area = (start, 0, end, firstArea.shape[1])
+        else:
+            area = (0, start, firstArea.shape[0], end)
+        firstChild = firstParent.copy()
+        secondChild = secondParent.copy()
+        firstCross = [
+            brick for brick in firstChild.getBricksInArea(*area)
+            if brick[2].getId() in firstMove
+        ]
+        secondCross = [
+            brick for brick in secondChild.getBricksInArea(*area)
+            if brick[2].getId() in secondMove
+        ]
+        for brick in firstCross:
+            firstChild.removeBrick(brick)
+        for brick in secondCross:
+            secondChild.removeBrick(brick)
+        for brick in firstCross:
+            secondChild.tryAddBrick(brick[0], brick[1], brick[2], brick[3])
+        for brick in secondCross:
+            firstChild.tryAddBrick(brick[0], brick[1], brick[2], brick[3])
+        return (firstChild, secondChild)
+
+    return None
+
+
+def __getBandInsideIds(area: np.ndarray, start: int, end: int) -> np.ndarray:
+    # a brick straddles a boundary if it covers the rows on both of its sides
+    straddling = []
+    if start > 0:
+        straddling.append(np.intersect1d(area[start - 1], area[start]))
+    if end < area.shape[0]:
+        straddling.append(np.intersect1d(area[end - 1], area[end]))
+    inside = np.setdiff1d(np.unique(area[start:end]), [0])
+    for ids in straddling:
+        inside = np.setdiff1d(inside, ids, assume_unique=True)
+    return inside
+
+
 def validateCrossAndConstaints(
         firstChildCross: List, firstChildConstraints: List,
         secondChildCross: List, secondChildConstraints: List) -> bool:
@@ -167,43 +475,55 @@ def validateCrossAndConstaints(
 def validateCrossAndConstaints2(
         firstChildCross: List, firstChildConstraints: List,
         secondChildCross: List, secondChildConstraints: List) -> bool:
+    bricks = firstChildCross + firstChildConstraints + secondChildCross
+    bricks += secondChildConstraints
+    if len(bricks) == 0:
+        return False
+
+    # occupancy grids of the cells which stay in each child, a cross brick can't
+    # move to the other child over its staying cells.
+    rectangles = [__getBrickRectangle(brick) for brick in bricks]
+    shape = (max(rect.yMax for rect in rectangles),
+             max(rect.xMax for rect in rectangles))
+    firstChildStay = np.zeros(shape, dtype=bool)
+    secondChildStay = np.zeros(shape, dtype=bool)
+    for constraint in firstChildConstraints:
+        __markBrick(firstChildStay, constraint)
+    for constraint in secondChildConstraints:
+        __markBrick(secondChildStay, constraint)
+
     dirty = True
     while dirty:
-        dirty = False
-
-        if len(secondChildConstraints) != 0:
-            toRemoveFromFirstCross = []
-            for cross in firstChildCross:
-                crossRect = __getBrickRectangle(cross)
-                for constraint in secondChildConstraints:
-                    constraintRect = __getBrickRectangle(constraint)
-                    if Utils.rectangleOverlappedArea(crossRect,
-                                                     constraintRect) != 0:
-                        firstChildConstraints.append(cross)
-                        toRemoveFromFirstCross.append(cross)
-                        dirty = True
-                        break
-            for toRemove in toRemoveFromFirstCross:
-                firstChildCross.remove(toRemove)
-
-        if len(firstChildConstraints) != 0:
-            toRemoveFromSecondCross = []
-            for cross in secondChildCross:
-                crossRect = __getBrickRectangle(cross)
-                for constraint in firstChildConstraints:
-                    constraintRect = __getBrickRectangle(constraint)
-                    if Utils.rectangleOverlappedArea(crossRect,
-                                                     constraintRect) != 0:
-                        secondChildConstraints.append(cross)
-                        toRemoveFromSecondCross.append(cross)
-                        dirty = True
-                        break
-            for toRemove in toRemoveFromSecondCross:
-                secondChildCross.remove(toRemove)
+        dirty = __moveBlockedToConstraints(firstChildCross,
+                                           firstChildConstraints,
+                                           firstChildStay, secondChildStay)
+        dirty = __moveBlockedToConstraints(
+            secondChildCross, secondChildConstraints, secondChildStay,
+            firstChildStay) or dirty
 
     return len(firstChildCross) != 0 or len(secondChildCross) != 0
 
 
+def __moveBlockedToConstraints(cross: List, constraints: List,
+                               stay: np.ndarray,
+                               otherStay: np.ndarray) -> bool:
+    blocked = []
+    for brick in cross:
+        rect = __getBrickRectangle(brick)
+        if otherStay[rect.yMin:rect.yMax, rect.xMin:rect.xMax].any():
+            blocked.append(brick)
+            stay[rect.yMin:rect.yMax, rect.xMin:rect.xMax] = True
+    for brick in blocked:
+        cross.remove(brick)
+        constraints.append(brick)
+    return len(blocked) != 0
+
+
+def __markBrick(grid: np.ndarray, brick):
+    rect = __getBrickRectangle(brick)
+    grid[rect.yMin:rect.yMax, rect.xMin:rect.xMax] = True
+
+
 def __getBrickRectangle(brick) -> Rectangle:
     if brick[3] == LegoBrickLayout.Orientation.HORIZONTAL:
         return Rectangle(brick[1], brick[0], brick[1] + brick[2].getWidth(),
@@ -220,6 +540,7 @@ def getCrossAndConstraints(
         stopOnOneConstaint: bool = False) -> Tuple[List, List]:
     """
     The method finds the bricks that are fully within the range and partially within the area.
+    Only the bricks which cover the range in the layout area matrix are checked.
 
     Parameters
     ----------
@@ -237,36 +558,210 @@ def getCrossAndConstraints(
     Tuple[List, List]
         2 lists, the first one is list of the bricks in cross area and the second one is list of the constraints.
     """
-    layoutBricks = layout.getAreaBricks()
     cross = []
     constraints = []
 
-    crossRect = Rectangle(xRange[0], yRange[0], xRange[1] + 1, yRange[1] + 1)
-    for brick in layoutBricks:
-        isCross = False
-        if brick[3] == LegoBrickLayout.Orientation.HORIZONTAL:
-            if brick[1] >= xRange[0] and brick[0] >= yRange[0] and brick[
-                    1] + brick[2].getWidth() - 1 <= xRange[1] and brick[
-                        0] + brick[2].getHeight() - 1 <= yRange[1]:
-                # all the brick in crossover area
-                cross.append(brick)
-                isCross = True
+    for brick in layout.getBricksInArea(yRange[0], xRange[0], yRange[1] + 1,
+                                        xRange[1] + 1):
+        brickRect = __getBrickRectangle(brick)
+        if brickRect.xMin >= xRange[0] and brickRect.yMin >= yRange[
+                0] and brickRect.xMax - 1 <= xRange[
+                    1] and brickRect.yMax - 1 <= yRange[1]:
+            # all the brick in crossover area
+            cross.append(brick)
         else:
-            if brick[1] >= xRange[0] and brick[0] >= yRange[
-                    0] and brick[1] + brick[2].getHeight() - 1 <= xRange[
-                        1] and brick[0] + brick[2].getWidth() - 1 <= yRange[1]:
-                cross.append(brick)
-                isCross = True
-        if not isCross:
-            brickRect = __getBrickRectangle(brick)
-            if Utils.rectangleOverlappedArea(crossRect, brickRect) > 0:
-                constraints.append(brick)
-                if (stopOnOneConstaint):
-                    break
+            constraints.append(brick)
+            if (stopOnOneConstaint):
+                break
     return cross, constraints
 
 
-def tryMutate(mutationThreshold: float, layer: LegoBrickLayout) -> None:
+def repair(layer: LegoBrickLayout) -> int:
+    """
+    The method fills the empty cells in the changed area of a layer (see LegoBrickLayout.getChangedArea())
+    with the available bricks of the layer collection, the biggest bricks first.
+    Only the changed area is scanned, and afterwards the layer is marked as unchanged.
+
+    Parameters
+    ----------
+    layout : LegoBrickLayout
+        The layout to repair
+
+    Returns
+    ----------
+    int
+        The covered area that the repair added
+    """
+    changedArea = layer.getChangedArea()
+    layer.clearChangedArea()
+    if changedArea is None:
+        return 0
+
+    collection = layer.getCollection()
+    bricksTypes = collection.getAvailableBricksTypes()
+    bricksTypes.sort(key=lambda brick: brick.getArea(), reverse=True)
+
+    area = layer.getAreaMatrix()
+    row, column, rowEnd, columnEnd = changedArea
+    coveredBefore = layer.getCoveredArea()
+    for emptyRow, emptyColumn in np.argwhere(
+            area[row:rowEnd, column:columnEnd] == 0):
+        if len(bricksTypes) == 0:
+            break
+        __fillCell(layer, emptyRow + row, emptyColumn + column, bricksTypes)
+
+    return layer.getCoveredArea() - coveredBefore
+
+
+def __fillCell(layer: LegoBrickLayout, row: int, column: int,
+               bricksTypes: List) -> bool:
+    # bricksTypes is ordered by the preference, the types that run out are removed from it
+    area = layer.getAreaMatrix()
+    if area[row, column] != 0:
+        return False
+    for brickType in list(bricksTypes):
+        orientation = __getFittingOrientation(area, row, column, brickType)
+        if orientation is None:
+            continue
+        brick = layer.getCollection().getBrick(brickType.getWidth(),
+                                               brickType.getHeight())
+        if brick is None:
+            # this type run out
+            bricksTypes.remove(brickType)
+            continue
+        return layer.tryAddBrick(row, column, brick, orientation)
+    return False
+
+
+def __getFittingOrientation(area: np.ndarray, row: int, column: int,
+                            brick) -> Enum:
+    orientations = [(LegoBrickLayout.Orientation.HORIZONTAL,
+                     brick.getHeight(), brick.getWidth())]
+    if brick.getWidth() != brick.getHeight():
+        orientations.append((LegoBrickLayout.Orientation.VERTICAL,
+                             brick.getWidth(), brick.getHeight()))
+    for orientation, rows, columns in orientations:
+        if row + rows <= area.shape[0] and column + columns <= area.shape[
+                1] and not area[row:row + rows, column:column +
+                                columns].any():
+            return orientation
+    return None
+
+
+def localSearch(layer: LegoBrickLayout, deadline: float,
+                maxFailures: int = 50) -> int:
+    """
+    The method improves a layer with a bounded first-improvement hill climb:
+    on every step a random move (add, move or change) is tried, and it is kept only
+    if it increases the covered area.
+
+    Parameters
+    ----------
+    layout : LegoBrickLayout
+        The layout to improve
+    deadline : float
+        The time.monotonic() time that the search stops at.
+    maxFailures : int [default = 50]
+        The search stops after this amount of tries in a row without an improvement.
+
+    Returns
+    ----------
+    int
+        The covered area that the search added
+    """
+    coveredBefore = layer.getCoveredArea()
+    moves = [__localAdd, __localMove, __localChange]
+    generator = Rng.getGenerator()
+    failures = 0
+    while failures < maxFailures and time.monotonic() < deadline:
+        if moves[generator.integers(len(moves))](layer):
+            failures = 0
+        else:
+            failures += 1
+    return layer.getCoveredArea() - coveredBefore
+
+
+def __localAdd(layer: LegoBrickLayout) -> bool:
+    # the biggest available brick that fits in a random empty cell
+    emptyPlaces = np.argwhere(layer.getAreaMatrix() == 0)
+    if len(emptyPlaces) == 0:
+        return False
+    bricksTypes = layer.getCollection().getAvailableBricksTypes()
+    bricksTypes.reverse()
+    row, column = emptyPlaces[Rng.getGenerator().integers(len(emptyPlaces))]
+    return __fillCell(layer, row, column, bricksTypes)
+
+
+def __localMove(layer: LegoBrickLayout) -> bool:
+    # snap a random brick, it is kept only if the cells it left can be covered
+    if len(layer.getAreaBricks()) == 0:
+        return False
+    brickToMove = layer.getAreaBricks()[Rng.getGenerator().integers(
+        len(layer.getAreaBricks()))]
+    distances = layer.getSlideDistances(brickToMove)
+    directions = [(distance, rowStep, columnStep)
+                  for distance, rowStep, columnStep in zip(
+                      distances, [-1, 1, 0, 0], [0, 0, -1, 1])
+                  if distance > 0]
+    if len(directions) == 0:
+        # The brick is stuck
+        return False
+    distance, rowStep, columnStep = directions[Rng.getGenerator().integers(
+        len(directions))]
+
+    rectangle = __getBrickRectangle(brickToMove)
+    layer.beginTransaction()
+    layer.removeBrick(brickToMove)
+    layer.tryAddBrick(brickToMove[0] + rowStep * distance,
+                      brickToMove[1] + columnStep * distance, brickToMove[2],
+                      brickToMove[3])
+
+    bricksTypes = layer.getCollection().getAvailableBricksTypes()
+    bricksTypes.reverse()
+    area = layer.getAreaMatrix()
+    filled = False
+    for emptyRow, emptyColumn in np.argwhere(
+            area[rectangle.yMin:rectangle.yMax, rectangle.xMin:rectangle.
+                 xMax] == 0):
+        if __fillCell(layer, emptyRow + brickToMove[0],
+                      emptyColumn + brickToMove[1], bricksTypes):
+            filled = True
+
+    if filled:
+        layer.commitTransaction()
+    else:
+        layer.rollbackTransaction()
+    return filled
+
+
+def __localChange(layer: LegoBrickLayout) -> bool:
+    # replace a random brick with a bigger available brick at the same place
+    if len(layer.getAreaBricks()) == 0:
+        return False
+    brickToChange = layer.getAreaBricks()[Rng.getGenerator().integers(
+        len(layer.getAreaBricks()))]
+    bricksTypes = [
+        brickType
+        for brickType in layer.getCollection().getAvailableBricksTypes()
+        if brickType.getArea() > brickToChange[2].getArea()
+    ]
+    if len(bricksTypes) == 0:
+        return False
+    bricksTypes.reverse()
+
+    layer.beginTransaction()
+    layer.removeBrick(brickToChange)
+    if __fillCell(layer, brickToChange[0], brickToChange[1], bricksTypes):
+        layer.commitTransaction()
+        layer.getCollection().returnBrick(brickToChange[2])
+        return True
+    layer.rollbackTransaction()
+    return False
+
+
+def tryMutate(mutationThreshold: float,
+              layer: LegoBrickLayout,
+              scheduler: OperatorScheduler = None) -> None:
     """
     The method try to perform a random mutation on a layer.
     The method chose a mutation from MutationsList.
@@ -277,21 +772,131 @@ def tryMutate(mutationThreshold: float, layer: LegoBrickLayout) -> None:
         The probability of a mutation occurring, in range [0.0, 1.0]
     layout : LegoBrickLayout
         The layout to mutate
+    scheduler : OperatorScheduler [default = None]
+        If not None, the mutation is selected by the scheduler instead of MutationsList,
+        and the scheduler is updated with the mutation result.
 
     """
-    rndValue = np.random.rand()
+    rndValue = Rng.getGenerator().random()
     if rndValue > mutationThreshold:
         return
-    mutationType = np.random.choice(MutationsList, size=1, replace=False)[0]
 
+    if scheduler is None:
+        mutationType = MutationsList[Rng.getGenerator().integers(
+            len(MutationsList))]
+        mutate(mutationType, layer)
+        return
+
+    mutationType = scheduler.select()
+    coveredBefore = layer.getCoveredArea()
+    start = time.perf_counter()
+    success = mutate(mutationType, layer)
+    scheduler.update(mutationType, success,
+                     layer.getCoveredArea() - coveredBefore,
+                     time.perf_counter() - start)
+
+
+def mutateBatch(mutationThreshold: float,
+                layers: List[LegoBrickLayout],
+                scheduler: OperatorScheduler = None) -> None:
+    """
+    The method try to perform random mutations on a batch of layers.
+    The layers that mutate and their mutations are drawn at once, then every mutation runs
+    over its group of layers with a shared precomputation (the empty cells of all the
+    layers of an add mutation group are found with one vectorized operation).
+
+    Parameters
+    ----------
+    mutationThreshold : float
+        The probability of a mutation occurring on every layer, in range [0.0, 1.0]
+    layers : List[LegoBrickLayout]
+        The layouts to mutate
+    scheduler : OperatorScheduler [default = None]
+        If not None, the mutations are selected by the scheduler instead of MutationsList,
+        and the scheduler is updated with the mutations results.
+    """
+    generator = Rng.getGenerator()
+    mutating = np.flatnonzero(
+        generator.random(len(layers)) <= mutationThreshold)
+    if len(mutating) == 0:
+        return
+
+    if scheduler is None:
+        operators = MutationsList
+        selected = generator.integers(len(operators), size=len(mutating))
+    else:
+        operators = scheduler.getOperators()
+        selected = generator.choice(
+            len(operators),
+            size=len(mutating),
+            p=scheduler.getProbabilities())
+
+    for index in np.unique(selected):
+        group = [layers[i] for i in mutating[selected == index]]
+        __mutateGroup(operators[index], group, scheduler)
+
+
+def __mutateGroup(mutationType: Mutations, layers: List[LegoBrickLayout],
+                  scheduler: OperatorScheduler):
+    coveredBefore = [layer.getCoveredArea() for layer in layers]
+    start = time.perf_counter()
+
+    if mutationType == Mutations.ADD and len(
+            set(layer.getAreaMatrix().shape for layer in layers)) == 1:
+        empty = np.nonzero(
+            np.stack([layer.getAreaMatrix() for layer in layers]) == 0)
+        # the empty cells are ordered by their layer
+        bounds = np.searchsorted(empty[0], np.arange(len(layers) + 1))
+        results = [
+            addMutation(layers[i], (empty[1][bounds[i]:bounds[i + 1]],
+                                    empty[2][bounds[i]:bounds[i + 1]]))
+            for i in range(len(layers))
+        ]
+    else:
+        results = [mutate(mutationType, layer) for layer in layers]
+
+    successes = sum(1 for result in results if result)
+    Profiling.count("mutations:" + mutationType.name.lower(), successes)
+    Profiling.count("mutationFailures:" + mutationType.name.lower(),
+                    len(results) - successes)
+
+    if scheduler is not None:
+        seconds = (time.perf_counter() - start) / len(layers)
+        for i in range(len(layers)):
+            scheduler.update(mutationType, results[i],
+                             layers[i].getCoveredArea() - coveredBefore[i],
+                             seconds)
+
+
+def mutate(mutationType: Mutations, layer: LegoBrickLayout) -> bool:
+    """
+    The method performs a specific mutation on a layer.
+
+    Parameters
+    ----------
+    mutationType : Mutations
+        The mutation to perform.
+    layout : LegoBrickLayout
+        The layout to mutate
+
+    Returns
+    ----------
+    bool
+        true if the mutation succeed
+    """
     if mutationType == Mutations.CHANGE:
-        changeMutation(layer)
+        return changeMutation(layer)
     elif mutationType == Mutations.ADD:
-        addMutation(layer)
+        return addMutation(layer)
     elif mutationType == Mutations.REMOVE:
-        removeMutation(layer)
+        return removeMutation(layer)
     elif mutationType == Mutations.MOVE:
-        moveMutation(layer)
+        return moveMutation(layer)
+    elif mutationType == Mutations.SLIDE:
+        return slideMutation(layer)
+    elif mutationType == Mutations.SNAP:
+        return slideMutation(layer, snap=True)
+    return False
 
 
 def changeMutation(layer: LegoBrickLayout) -> bool:
@@ -314,37 +919,30 @@ def changeMutation(layer: LegoBrickLayout) -> bool:
     if (len(layer.getAreaBricks()) == 0):
         # There are no more bricks to remove
         return False
-    indexToRemove = np.random.randint(len(layer.getAreaBricks()))
+    indexToRemove = Rng.getGenerator().integers(len(layer.getAreaBricks()))
     brickToRemove = layer.getAreaBricks()[indexToRemove]
-    layer.getAreaBricks().remove(brickToRemove)
-    layer.validateLayer()
 
     randomBrick = layer.getCollection().getRandomBrick()
     if randomBrick.getHeight() == brickToRemove[2].getHeight(
-    ) or randomBrick.getWidth() == brickToRemove[2].getWidth():
-        if not layer.tryAddBrick(brickToRemove[0], brickToRemove[1],
-                                 brickToRemove[2], brickToRemove[3]):
-            # Should never happen
-            layer.getCollection().returnBrick(brickToRemove[2])
-        else:
-            layer.validateLayer()
+    ) and randomBrick.getWidth() == brickToRemove[2].getWidth():
+        # The same brick gives the same coverage
+        layer.getCollection().returnBrick(randomBrick)
+        return False
 
+    layer.beginTransaction()
+    layer.removeBrick(brickToRemove)
     if layer.tryAddBrick(brickToRemove[0], brickToRemove[1], randomBrick):
+        layer.commitTransaction()
         layer.getCollection().returnBrick(brickToRemove[2])
-        layer.validateLayer()
         return True
     else:
+        layer.rollbackTransaction()
         layer.getCollection().returnBrick(randomBrick)
-        if not layer.tryAddBrick(brickToRemove[0], brickToRemove[1],
-                                 brickToRemove[2], brickToRemove[3]):
-            # Should never happen
-            layer.getCollection().returnBrick(brickToRemove[2])
-        else:
-            layer.validateLayer()
         return False
 
 
-def addMutation(layer: LegoBrickLayout) -> bool:
+def addMutation(layer: LegoBrickLayout,
+                emptyPlaces: Tuple[np.ndarray, np.ndarray] = None) -> bool:
     """
     The method try to perform an add mutation on a layer.
 
@@ -352,6 +950,8 @@ def addMutation(layer: LegoBrickLayout) -> bool:
     ----------
     layout : LegoBrickLayout
         The layout to mutate
+    emptyPlaces : Tuple[np.ndarray, np.ndarray] [default = None]
+        The rows and the columns of the empty cells of the layer, computed if None.
 
     Returns
     ----------
@@ -362,16 +962,16 @@ def addMutation(layer: LegoBrickLayout) -> bool:
         # There are no more bricks to add
         return False
 
-    emptyPlaces = np.where(layer.getAreaMatrix() == 0)
+    if emptyPlaces is None:
+        emptyPlaces = np.where(layer.getAreaMatrix() == 0)
     if len(emptyPlaces[0]) == 0:
         return False
 
-    rndIndex = np.random.randint(len(emptyPlaces[0]))
+    rndIndex = Rng.getGenerator().integers(len(emptyPlaces[0]))
 
     brick = layer.getCollection().getRandomBrick()
     if layer.tryAddBrick(emptyPlaces[0][rndIndex], emptyPlaces[1][rndIndex],
                          brick):
-        layer.validateLayer()
         return True
     else:
         layer.getCollection().returnBrick(brick)
@@ -395,17 +995,19 @@ def removeMutation(layer: LegoBrickLayout) -> bool:
     if (len(layer.getAreaBricks()) == 0):
         # There are no more bricks to remove
         return False
-    indexToRemove = np.random.randint(len(layer.getAreaBricks()))
+    indexToRemove = Rng.getGenerator().integers(
+        len(layer.getAreaBricks()))
     brickToRemove = layer.getAreaBricks()[indexToRemove]
-    layer.getAreaBricks().remove(brickToRemove)
+    layer.removeBrick(brickToRemove)
     layer.getCollection().returnBrick(brickToRemove[2])
-    layer.validateLayer()
     return True
 
 
 def moveMutation(layer: LegoBrickLayout) -> bool:
     """
-    The method try to perform a move mutation on a layer.
+    The method try to perform a move mutation on a layer:
+    a random brick moves by one cell to one of the directions that are free.
+    The free distances are queried from the layer, so the move can't fail on a collision.
 
     Parameters
     ----------
@@ -421,36 +1023,64 @@ def moveMutation(layer: LegoBrickLayout) -> bool:
         # There are no more bricks to move
         return False
 
-    indexToRemove = np.random.randint(len(layer.getAreaBricks()))
-    brickToRemove = layer.getAreaBricks()[indexToRemove]
-    layer.getAreaBricks().remove(brickToRemove)
-    layer.validateLayer()
-
-    DirectionsList = list(__Directions)
-    np.random.shuffle(DirectionsList)
-    for direction in DirectionsList:
-        added = False
-        if direction == __Directions.LEFT:
-            added = layer.tryAddBrick(brickToRemove[0] - 1, brickToRemove[1],
-                                      brickToRemove[2], brickToRemove[3])
-        elif direction == __Directions.UP:
-            added = layer.tryAddBrick(brickToRemove[0], brickToRemove[1] - 1,
-                                      brickToRemove[2], brickToRemove[3])
-        elif direction == __Directions.RIGHT:
-            added = layer.tryAddBrick(brickToRemove[0] + 1, brickToRemove[1],
-                                      brickToRemove[2], brickToRemove[3])
-        elif direction == __Directions.DOWN:
-            added = layer.tryAddBrick(brickToRemove[0], brickToRemove[1] + 1,
-                                      brickToRemove[2], brickToRemove[3])
-        if added:
-            layer.validateLayer()
-            return True
-
-    if not layer.tryAddBrick(brickToRemove[0], brickToRemove[1],
-                             brickToRemove[2], brickToRemove[3]):
-        # Should never happen
-        layer.getCollection().returnBrick(brickToRemove[2])
-    else:
-        layer.validateLayer()
+    indexToMove = Rng.getGenerator().integers(len(layer.getAreaBricks()))
+    brickToMove = layer.getAreaBricks()[indexToMove]
+    steps = [
+        step for distance, step in zip(
+            layer.getSlideDistances(brickToMove), [(-1, 0), (1, 0), (0, -1),
+                                                   (0, 1)]) if distance > 0
+    ]
+    if len(steps) == 0:
+        # The brick is stuck
+        return False
 
-    return False
+    rowStep, columnStep = steps[Rng.getGenerator().integers(len(steps))]
+    layer.removeBrick(brickToMove)
+    layer.tryAddBrick(brickToMove[0] + rowStep, brickToMove[1] + columnStep,
+                      brickToMove[2], brickToMove[3])
+    return True
+
+
+def slideMutation(layer: LegoBrickLayout, snap: bool = False) -> bool:
+    """
+    The method try to perform a slide mutation on a layer:
+    a random brick slides to a random free destination in one of the directions.
+    The free distances are queried from the layer, so the slide can't fail on a collision.
+
+    Parameters
+    ----------
+    layout : LegoBrickLayout
+        The layout to mutate
+    snap : bool [default = False]
+        If true the brick slides all the way until it touches a neighbor brick
+        or the layer border, which compacts the holes.
+
+    Returns
+    ----------
+    bool
+        true if the mutation succeed
+    """
+    if (len(layer.getAreaBricks()) == 0):
+        # There are no more bricks to move
+        return False
+
+    indexToMove = Rng.getGenerator().integers(len(layer.getAreaBricks()))
+    brickToMove = layer.getAreaBricks()[indexToMove]
+    up, down, left, right = layer.getSlideDistances(brickToMove)
+
+    destinations = []
+    for distance, rowStep, columnStep in [(up, -1, 0), (down, 1, 0),
+                                          (left, 0, -1), (right, 0, 1)]:
+        steps = [distance] if snap and distance > 0 else range(
+            1, distance + 1)
+        destinations += [(brickToMove[0] + rowStep * step,
+                          brickToMove[1] + columnStep * step)
+                         for step in steps]
+    if len(destinations) == 0:
+        # The brick is stuck
+        return False
+
+    row, column = destinations[Rng.getGenerator().integers(len(destinations))]
+    layer.removeBrick(brickToMove)
+    layer.tryAddBrick(row, column, brickToMove[2], brickToMove[3])
+    return True
@@ -1,12 +1,13 @@
 # layout.py
 
 import math
-import random
 from enum import Enum
 from typing import List, Tuple
 
 import numpy as np
 
+import lego.profiling as Profiling
+import lego.rng as Rng
 from lego.brick import LegoBrick
 from lego.collection import LegoBrickCollection
 from lego.exceptions import NotInitializedException
@@ -43,6 +44,26 @@ class LegoBrickLayout(object):
         Validate the layer after changes from outside.
     def tryAddBrick(row: int, column: int, brick: LegoBrick, orientation: LegoBrickLayout.Orientation = None) -> bool:
         Try to add the received brick to a specific place at the layer.
+    removeBrick(placement: Tuple[int, int, LegoBrick, LegoBrickLayout.Orientation]) -> bool:
+        Removes a brick from the layer, the brick isn't returned to the layer collection.
+    beginTransaction():
+        Starts a transaction, the following changes can be undone together by rollbackTransaction().
+    commitTransaction():
+        Keeps the changes of the innermost open transaction.
+    rollbackTransaction():
+        Undoes the changes of the innermost open transaction.
+    getBricksInArea(row: int, column: int, rowEnd: int, columnEnd: int) -> List[Tuple[int, int, LegoBrick, LegoBrickLayout.Orientation]]:
+        Gets the bricks which cover at least one cell of a rectangular area of the layer.
+    getSlideDistances(placement: Tuple[int, int, LegoBrick, LegoBrickLayout.Orientation]) -> Tuple[int, int, int, int]:
+        Gets how far a brick of the layer can slide in every direction.
+    getChangedArea() -> Tuple[int, int, int, int]:
+        Gets the bounding box of the cells that removeBrick() freed since the last call to clearChangedArea().
+    clearChangedArea():
+        Marks the whole layer as unchanged.
+    getFreeRowCuts() -> np.ndarray:
+        Gets the lines between rows that no brick crosses.
+    getFreeColumnCuts() -> np.ndarray:
+        Gets the lines between columns that no brick crosses.
     isSameCoverage(otherLayout: LegoBrickLayout) -> bool:
         Check if the received layer has exactly the same coverage.
     """
@@ -51,11 +72,18 @@ class LegoBrickLayout(object):
         VERTICAL = 1
         HORIZONTAL = 2
 
+    # the actions of the transactions undo log
+    __ADDED = 1
+    __REMOVED = 2
+
     def __init__(self):
         self.__initialized = False
 
-    def initialize(self, width: int, height: int,
-                   brickCollection: LegoBrickCollection):
+    def initialize(self,
+                   width: int,
+                   height: int,
+                   brickCollection: LegoBrickCollection,
+                   randomLayout: bool = True):
         """
         LegoBrickLayout instance initialization.
         This function should be called once, more calls will be meaningless.
@@ -68,6 +96,8 @@ class LegoBrickLayout(object):
             The brick height.
         brickCollection : LegoBrickCollection
             An collection of bricks to create the layer
+        randomLayout : bool [default = True]
+            If true the layer is filled with random bricks, otherwise the layer starts empty.
 
         Raises
         ------
@@ -96,8 +126,18 @@ class LegoBrickLayout(object):
         self.__layout = []
         self.__coveredArea = 0
         self.__area = np.zeros((width, height), dtype=np.int32)
-
-        if self.__brickCollection.getAmountOfAvailableBricks() != 0:
+        # the amount of bricks which cross the line before each row/column
+        self.__rowCuts = np.zeros(width + 1, dtype=np.int32)
+        self.__columnCuts = np.zeros(height + 1, dtype=np.int32)
+        # the bricks by the ID that marks their cells in the area matrix
+        self.__placements = {}
+        # bounding box of the cells freed since the last clearChangedArea()
+        self.__changedArea = None
+        self.__undoLog = []
+        self.__savepoints = []
+
+        if randomLayout and self.__brickCollection.getAmountOfAvailableBricks(
+        ) != 0:
             self.__createRandomLayout()
 
         self.__initialized = True
@@ -113,7 +153,7 @@ class LegoBrickLayout(object):
                     return
                 if self.__area[i][j] != 0:
                     continue
-                firstVertical = bool(random.getrandbits(1))
+                firstVertical = bool(Rng.getGenerator().integers(2))
                 selectedBrick = self.__brickCollection.getRandomBrick()
                 if not self.__tryAdd(i, j, selectedBrick, firstVertical):
                     self.__brickCollection.returnBrick(selectedBrick)
@@ -125,11 +165,11 @@ class LegoBrickLayout(object):
             if self.__brickCollection.getAmountOfAvailableBricks() == 0:
                 # the bricks collection is empty
                 return
-            x = np.random.randint(self.__height)
-            y = np.random.randint(self.__width)
+            x = Rng.getGenerator().integers(self.__width)
+            y = Rng.getGenerator().integers(self.__height)
             if self.__area[x][y] != 0:
                 continue
-            firstVertical = bool(random.getrandbits(1))
+            firstVertical = bool(Rng.getGenerator().integers(2))
             selectedBrick = self.__brickCollection.getRandomBrick()
             if not self.__tryAdd(x, y, selectedBrick, firstVertical):
                 self.__brickCollection.returnBrick(selectedBrick)
@@ -159,18 +199,13 @@ class LegoBrickLayout(object):
         ) > self.__width:
             return False
 
-        for i in range(row, row + brick.getHeight()):
-            for j in range(column, column + brick.getWidth()):
-                if self.__area[i][j] != 0:
-                    return False
-
-        self.__layout.append((row, column, brick,
-                              LegoBrickLayout.Orientation.HORIZONTAL))
-
-        for i in range(row, row + brick.getHeight()):
-            self.__area[i][column:column + brick.getWidth()] = brick.getId()
+        if self.__area[row:row + brick.getHeight(), column:column +
+                       brick.getWidth()].any():
+            return False
 
-        self.__coveredArea += brick.getArea()
+        self.__place((row, column, brick,
+                      LegoBrickLayout.Orientation.HORIZONTAL))
+        self.__log(LegoBrickLayout.__ADDED)
         return True
 
     def __tryAddVertical(self, row: int, column: int,
@@ -179,20 +214,57 @@ class LegoBrickLayout(object):
         ) > self.__width:
             return False
 
-        for i in range(row, row + brick.getWidth()):
-            for j in range(column, column + brick.getHeight()):
-                if self.__area[i][j] != 0:
-                    return False
-
-        self.__layout.append((row, column, brick,
-                              LegoBrickLayout.Orientation.VERTICAL))
-
-        for i in range(row, row + brick.getWidth()):
-            self.__area[i][column:column + brick.getHeight()] = brick.getId()
+        if self.__area[row:row + brick.getWidth(), column:column +
+                       brick.getHeight()].any():
+            return False
 
-        self.__coveredArea += brick.getArea()
+        self.__place((row, column, brick,
+                      LegoBrickLayout.Orientation.VERTICAL))
+        self.__log(LegoBrickLayout.__ADDED)
         return True
 
+    def __place(self, placement: Tuple[int, int, LegoBrick, Enum]):
+        row, column = placement[0], placement[1]
+        rowEnd, columnEnd = LegoBrickLayout.__getPlacementEnd(placement)
+
+        # keep the bricks sorted by their position, like validateLayer() does
+        self.__layout.insert(self.__findIndex(row, column), placement)
+        self.__lastPlaced = placement
+        self.__placements.setdefault(placement[2].getId(), []).append(placement)
+
+        self.__area[row:rowEnd, column:columnEnd] = placement[2].getId()
+        self.__rowCuts[row + 1:rowEnd] += 1
+        self.__columnCuts[column + 1:columnEnd] += 1
+        self.__coveredArea += placement[2].getArea()
+
+    def __findIndex(self, row: int, column: int) -> int:
+        low, high = 0, len(self.__layout)
+        while low < high:
+            middle = (low + high) // 2
+            if (self.__layout[middle][0], self.__layout[middle][1]) < (row,
+                                                                       column):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def __removeFromPlacements(self, placement):
+        placements = self.__placements[placement[2].getId()]
+        for i in range(len(placements)):
+            if placements[i] is placement:
+                del placements[i]
+                break
+        if len(placements) == 0:
+            del self.__placements[placement[2].getId()]
+
+    @staticmethod
+    def __getPlacementEnd(placement) -> Tuple[int, int]:
+        if placement[3] == LegoBrickLayout.Orientation.HORIZONTAL:
+            return (placement[0] + placement[2].getHeight(),
+                    placement[1] + placement[2].getWidth())
+        return (placement[0] + placement[2].getWidth(),
+                placement[1] + placement[2].getHeight())
+
     def tryAddBrick(self,
                     row: int,
                     column: int,
@@ -235,13 +307,132 @@ class LegoBrickLayout(object):
             return self.__tryAddHorizontal(row, column, brick)
 
         if orientation is None:
-            firstVertical = bool(random.getrandbits(1))
+            firstVertical = bool(Rng.getGenerator().integers(2))
             return self.__tryAdd(row, column, brick, firstVertical)
         elif orientation == LegoBrickLayout.Orientation.HORIZONTAL:
             return self.__tryAddHorizontal(row, column, brick)
         else:
             return self.__tryAddVertical(row, column, brick)
 
+    def removeBrick(self, placement: Tuple[int, int, LegoBrick, Enum]) -> bool:
+        """
+        Removes a brick from the layer, the brick isn't returned to the layer collection.
+
+        Parameters
+        ----------
+        placement : Tuple[int, int, LegoBrick, LegoBrickLayout.Orientation]
+            The brick to remove, as received from getAreaBricks().
+
+        Returns
+        -------
+        bool
+            True if the brick removed successfully and false if it isn't part of the layer.
+
+        Raises
+        ------
+        NotInitializedException
+            If this method called before initialize() method
+        """
+        if not self.__initialized:
+            raise NotInitializedException(
+                "The instance used before calling initialize method")
+
+        try:
+            index = self.__layout.index(placement)
+        except ValueError:
+            return False
+        if len(self.__savepoints) != 0:
+            self.__undoLog.append((LegoBrickLayout.__REMOVED,
+                                   self.__layout[index], self.__changedArea))
+        self.__unplace(index)
+        return True
+
+    def __unplace(self, index: int):
+        placement = self.__layout.pop(index)
+        self.__removeFromPlacements(placement)
+
+        row, column = placement[0], placement[1]
+        rowEnd, columnEnd = LegoBrickLayout.__getPlacementEnd(placement)
+        self.__area[row:rowEnd, column:columnEnd] = 0
+        if self.__changedArea is None:
+            self.__changedArea = (row, column, rowEnd, columnEnd)
+        else:
+            self.__changedArea = (min(self.__changedArea[0], row),
+                                  min(self.__changedArea[1], column),
+                                  max(self.__changedArea[2], rowEnd),
+                                  max(self.__changedArea[3], columnEnd))
+        self.__rowCuts[row + 1:rowEnd] -= 1
+        self.__columnCuts[column + 1:columnEnd] -= 1
+        self.__coveredArea -= placement[2].getArea()
+
+    def __log(self, action: int):
+        if len(self.__savepoints) != 0:
+            self.__undoLog.append((action, self.__lastPlaced,
+                                   self.__changedArea))
+
+    def beginTransaction(self):
+        """
+        Starts a transaction, all the following tryAddBrick() and removeBrick() calls
+        can be undone together by rollbackTransaction().
+        Transactions can be nested, every begin has to be closed by a commit or a rollback.
+
+        Raises
+        ------
+        NotInitializedException
+            If this method called before initialize() method
+        """
+        if not self.__initialized:
+            raise NotInitializedException(
+                "The instance used before calling initialize method")
+        self.__savepoints.append(len(self.__undoLog))
+
+    def commitTransaction(self):
+        """
+        Keeps the changes of the innermost open transaction.
+
+        Raises
+        ------
+        NotInitializedException
+            If this method called before initialize() method
+        ValueError
+            If there is no open transaction.
+        """
+        if not self.__initialized:
+            raise NotInitializedException(
+                "The instance used before calling initialize method")
+        if len(self.__savepoints) == 0:
+            raise ValueError("there is no open transaction!")
+        self.__savepoints.pop()
+        if len(self.__savepoints) == 0:
+            self.__undoLog = []
+
+    def rollbackTransaction(self):
+        """
+        Undoes the changes of the innermost open transaction, in the order opposite to
+        the order they were made. Only the changed cells are touched.
+
+        Raises
+        ------
+        NotInitializedException
+            If this method called before initialize() method
+        ValueError
+            If there is no open transaction.
+        """
+        if not self.__initialized:
+            raise NotInitializedException(
+                "The instance used before calling initialize method")
+        if len(self.__savepoints) == 0:
+            raise ValueError("there is no open transaction!")
+        savepoint = self.__savepoints.pop()
+        while len(self.__undoLog) > savepoint:
+            action, placement, changedArea = self.__undoLog.pop()
+            if action == LegoBrickLayout.__ADDED:
+                self.__unplace(
+                    self.__findIndex(placement[0], placement[1]))
+            else:
+                self.__place(placement)
+            self.__changedArea = changedArea
+
     def copy(self) -> object:
         """
         Gets a copy instance with the same attributes.
@@ -257,12 +448,62 @@ class LegoBrickLayout(object):
             copy.__height = self.__height
             copy.__area = self.__area.copy()
             copy.__coveredArea = self.__coveredArea
+            copy.__rowCuts = self.__rowCuts.copy()
+            copy.__columnCuts = self.__columnCuts.copy()
+            copy.__changedArea = self.__changedArea
+            copy.__undoLog = []
+            copy.__savepoints = []
             copy.__layout = [[brick[0], brick[1], brick[2].copy(), brick[3]]
                              for brick in self.__layout]
+            copy.__placements = {}
+            for brick in copy.__layout:
+                copy.__placements.setdefault(brick[2].getId(),
+                                             []).append(brick)
             copy.__brickCollection = self.__brickCollection.copy()
             copy.__initialized = True
         return copy
 
+    def __getstate__(self):
+        # the area matrix, the cuts and the placements are rebuilt from the
+        # bricks on loading, which keeps the pickle compact
+        if not self.__initialized:
+            return {"initialized": False}
+        return {
+            "initialized": True,
+            "width": self.__width,
+            "height": self.__height,
+            "changedArea": self.__changedArea,
+            "collection": self.__brickCollection,
+            "bricks": np.array(
+                [[
+                    brick[0], brick[1], brick[2].getWidth(),
+                    brick[2].getHeight(),
+                    brick[2].getId(), brick[3].value
+                ] for brick in self.__layout],
+                dtype=np.int32).reshape(-1, 6)
+        }
+
+    def __setstate__(self, state):
+        self.__initialized = state["initialized"]
+        if not self.__initialized:
+            return
+        self.__width = state["width"]
+        self.__height = state["height"]
+        self.__changedArea = state["changedArea"]
+        self.__brickCollection = state["collection"]
+        self.__layout = [[
+            int(row),
+            int(column),
+            LegoBrick(int(width), int(height), int(id)),
+            LegoBrickLayout.Orientation(orientation)
+        ] for row, column, width, height, id, orientation in state["bricks"]]
+        self.__area = np.zeros((self.__width, self.__height), dtype=np.int32)
+        self.__rowCuts = np.zeros(self.__width + 1, dtype=np.int32)
+        self.__columnCuts = np.zeros(self.__height + 1, dtype=np.int32)
+        self.validateLayer()
+        if len(state["bricks"]) > 0:
+            LegoBrickCollection.skipBrickIds(int(state["bricks"][:, 4].max()))
+
     def isInitialized(self) -> bool:
         """
         Gets the initialization state of the instance
@@ -388,9 +629,173 @@ class LegoBrickLayout(object):
                 "The instance used before calling initialize method")
         return self.__height
 
+    def getBricksInArea(self, row: int, column: int, rowEnd: int,
+                        columnEnd: int) -> List[Tuple[int, int, LegoBrick, Enum]]:
+        """
+        Gets the bricks which cover at least one cell of a rectangular area of the layer.
+        The bricks are found from the area matrix, without scanning all the bricks of the layer.
+
+        Parameters
+        ----------
+        row : int
+            The first row of the area.
+        column : int
+            The first column of the area.
+        rowEnd : int
+            The row after the last row of the area.
+        columnEnd : int
+            The column after the last column of the area.
+
+        Returns
+        -------
+        List[Tuple[int, int, LegoBrick, LegoBrickLayout.Orientation]]
+            The bricks in the area, in the same order as in getAreaBricks().
+
+        Raises
+        ------
+        NotInitializedException
+            If this method called before initialize() method
+        """
+        if not self.__initialized:
+            raise NotInitializedException(
+                "The instance used before calling initialize method")
+
+        row, column = max(row, 0), max(column, 0)
+        bricks = []
+        for id in np.unique(self.__area[row:rowEnd, column:columnEnd]):
+            if id == 0:
+                continue
+            for placement in self.__placements.get(id, []):
+                # IDs may repeat, so the brick itself has to be in the area
+                end = LegoBrickLayout.__getPlacementEnd(placement)
+                if placement[0] < rowEnd and end[0] > row and placement[
+                        1] < columnEnd and end[1] > column:
+                    bricks.append(placement)
+        bricks.sort(key=lambda brickPos: (brickPos[0], brickPos[1]))
+        return bricks
+
+    def getSlideDistances(self, placement: Tuple[int, int, LegoBrick, Enum]
+                          ) -> Tuple[int, int, int, int]:
+        """
+        Gets how far a brick of the layer can slide in every direction before it hits
+        another brick or the layer border.
+
+        Parameters
+        ----------
+        placement : Tuple[int, int, LegoBrick, LegoBrickLayout.Orientation]
+            The brick to check, as received from getAreaBricks().
+
+        Returns
+        -------
+        Tuple[int, int, int, int]
+            The free distances toward the lower rows, the higher rows, the lower columns
+            and the higher columns.
+
+        Raises
+        ------
+        NotInitializedException
+            If this method called before initialize() method
+        """
+        if not self.__initialized:
+            raise NotInitializedException(
+                "The instance used before calling initialize method")
+
+        row, column = placement[0], placement[1]
+        rowEnd, columnEnd = LegoBrickLayout.__getPlacementEnd(placement)
+
+        rows = self.__area[:, column:columnEnd].any(axis=1)
+        columns = self.__area[row:rowEnd, :].any(axis=0)
+
+        blocked = np.flatnonzero(rows[:row])
+        up = row if len(blocked) == 0 else row - blocked[-1] - 1
+        blocked = np.flatnonzero(rows[rowEnd:])
+        down = self.__width - rowEnd if len(blocked) == 0 else blocked[0]
+        blocked = np.flatnonzero(columns[:column])
+        left = column if len(blocked) == 0 else column - blocked[-1] - 1
+        blocked = np.flatnonzero(columns[columnEnd:])
+        right = self.__height - columnEnd if len(blocked) == 0 else blocked[0]
+        return int(up), int(down), int(left), int(right)
+
+    def getChangedArea(self) -> Tuple[int, int, int, int]:
+        """
+        Gets the bounding box of the cells that removeBrick() freed since the last call
+        to clearChangedArea().
+
+        Returns
+        -------
+        Tuple[int, int, int, int]
+            (row, column, rowEnd, columnEnd) of the changed area, or None if nothing changed.
+
+        Raises
+        ------
+        NotInitializedException
+            If this method called before initialize() method
+        """
+        if not self.__initialized:
+            raise NotInitializedException(
+                "The instance used before calling initialize method")
+        return self.__changedArea
+
+    def clearChangedArea(self):
+        """
+        Marks the whole layer as unchanged.
+
+        Raises
+        ------
+        NotInitializedException
+            If this method called before initialize() method
+        """
+        if not self.__initialized:
+            raise NotInitializedException(
+                "The instance used before calling initialize method")
+        self.__changedArea = None
+
+    def getFreeRowCuts(self) -> np.ndarray:
+        """
+        Gets the lines between rows that no brick crosses.
+        A line k is between the row k-1 and the row k, so cutting the layer over it
+        divides the layer without breaking any brick.
+
+        Returns
+        -------
+        np.ndarray
+            sorted indexes of the free lines, in range [1, width-1].
+
+        Raises
+        ------
+        NotInitializedException
+            If this method called before initialize() method
+        """
+        if not self.__initialized:
+            raise NotInitializedException(
+                "The instance used before calling initialize method")
+        return np.flatnonzero(self.__rowCuts[1:-1] == 0) + 1
+
+    def getFreeColumnCuts(self) -> np.ndarray:
+        """
+        Gets the lines between columns that no brick crosses.
+        A line k is between the column k-1 and the column k, so cutting the layer over it
+        divides the layer without breaking any brick.
+
+        Returns
+        -------
+        np.ndarray
+            sorted indexes of the free lines, in range [1, height-1].
+
+        Raises
+        ------
+        NotInitializedException
+            If this method called before initialize() method
+        """
+        if not self.__initialized:
+            raise NotInitializedException(
+                "The instance used before calling initialize method")
+        return np.flatnonzero(self.__columnCuts[1:-1] == 0) + 1
+
     def validateLayer(self) -> bool:
         """
         Validate the layer after changes from outside.
+        The open transactions are committed, since the changes from outside can't be undone.
 
         Raises
         ------
@@ -401,17 +806,27 @@ class LegoBrickLayout(object):
             raise NotInitializedException(
                 "The instance used before calling initialize method")
 
+        Profiling.count("validateLayer")
+        self.__undoLog = []
+        self.__savepoints = []
+
         try:
             self.__layout.sort(key=lambda brickPos: (brickPos[0], brickPos[1]))
 
             self.__coveredArea = np.sum(
                 [brick[2].getArea() for brick in self.__layout])
 
-            for x in range(self.__width):
-                for y in range(self.__height):
-                    self.__area[x][y] = 0
+            self.__area.fill(0)
+            self.__rowCuts.fill(0)
+            self.__columnCuts.fill(0)
+            self.__placements = {}
 
             for brick in self.__layout:
+                self.__placements.setdefault(brick[2].getId(),
+                                             []).append(brick)
+                rowEnd, columnEnd = LegoBrickLayout.__getPlacementEnd(brick)
+                self.__rowCuts[brick[0] + 1:rowEnd] += 1
+                self.__columnCuts[brick[1] + 1:columnEnd] += 1
                 if (brick[3] == LegoBrickLayout.Orientation.HORIZONTAL):
                     for i in range(brick[0], brick[0] + brick[2].getHeight()):
                         self.__area[i][brick[1]:brick[1] +
@@ -0,0 +1,223 @@
+# memory.py
+
+import sys
+from collections import namedtuple
+from enum import Enum
+from types import FunctionType, ModuleType
+from typing import List
+
+import numpy as np
+
+import lego.rng as Rng
+from lego.brick import LegoBrick
+from lego.collection import LegoBrickCollection
+from lego.layout import LegoBrickLayout
+
+MemoryUsage = namedtuple("MemoryUsage", "layers bytesPerLayer totalBytes")
+"""
+MemoryUsage holds the measured memory of a population:
+the amount of layers, the mean bytes of a layer and the bytes of all the layers.
+"""
+
+# the previous population is kept while the next population is created
+POPULATIONS_IN_MEMORY = 2
+
+# the rib of the board that the estimations measure
+__SAMPLE_RIB = 32
+
+
+def getObjectBytes(obj: object, seen: set = None) -> int:
+    """
+    The method measures the bytes of an object and of all the objects that it references,
+    NumPy arrays included. Classes, functions, modules and enumeration members are shared
+    by all the objects, so they aren't counted.
+
+    Parameters
+    ----------
+    obj : object
+        The object to measure.
+    seen : set [default = None]
+        The IDs of the objects that were already counted, they are skipped and the IDs
+        of the measured objects are added to it. Passing the same set to several calls
+        counts the objects that they share once.
+
+    Returns
+    ----------
+    int
+        The bytes of the object.
+    """
+    if seen is None:
+        seen = set()
+    total = 0
+    objects = [obj]
+    while len(objects) > 0:
+        item = objects.pop()
+        if id(item) in seen or isinstance(
+                item, (type, Enum, ModuleType, FunctionType)):
+            continue
+        seen.add(id(item))
+        # the data of an array is included, unless it is a view of another array
+        total += sys.getsizeof(item)
+        if isinstance(item, np.ndarray):
+            if item.base is not None:
+                objects.append(item.base)
+            continue
+        if isinstance(item, dict):
+            objects.extend(item.keys())
+            objects.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            objects.extend(item)
+        if hasattr(item, "__dict__"):
+            objects.append(item.__dict__)
+    return total
+
+
+def getPopulationUsage(population: List[LegoBrickLayout],
+                       sampleSize: int = None) -> MemoryUsage:
+    """
+    The method measures the memory of a population.
+
+    Parameters
+    ----------
+    population : List[LegoBrickLayout]
+        The population.
+    sampleSize : int [default = None]
+        The amount of layers, evenly spread over the population, that are measured,
+        None for measuring all the layers.
+
+    Returns
+    ----------
+    MemoryUsage
+        The memory of the population.
+    """
+    if len(population) == 0:
+        return MemoryUsage(0, 0, 0)
+    sample = population
+    if sampleSize is not None and sampleSize < len(population):
+        sample = [
+            population[i] for i in np.unique(
+                np.linspace(0, len(population) - 1, max(sampleSize, 1),
+                            dtype=int))
+        ]
+    # the objects that the layers share are counted once
+    bytesPerLayer = getObjectBytes(sample, set()) // len(sample)
+    return MemoryUsage(len(population), bytesPerLayer,
+                       bytesPerLayer * len(population))
+
+
+def estimateLayoutBytes(width: int, height: int,
+                        bricks: List[LegoBrick]) -> int:
+    """
+    The method estimates the bytes of a random layer of a board.
+    The area matrix takes 4 bytes per cell, and the bricks (their placements, their copies
+    and their entries in the collection) take bytes in proportion to the area,
+    which are measured on a random layer of a sample board.
+
+    Parameters
+    ----------
+    width : int
+        The width of the board.
+    height : int
+        The height of the board.
+    bricks : List[LegoBrick]
+        The types of the bricks.
+
+    Returns
+    ----------
+    int
+        The estimated bytes of a layer.
+
+    Raises
+    ------
+    ValueError
+        If the width or the height isn't bigger then 0.
+    TypeError
+        If the bricks are None.
+    """
+    if width < 1:
+        raise ValueError("width must be bigger then 1!")
+    if height < 1:
+        raise ValueError("height must be bigger then 1!")
+    if bricks is None:
+        raise TypeError("bricks are none!")
+    sampleWidth = min(width, __SAMPLE_RIB)
+    sampleHeight = min(height, __SAMPLE_RIB)
+    collection = LegoBrickCollection()
+    collection.initialize(sampleWidth * sampleHeight, bricks, uniform=True)
+
+    # the sample doesn't draw from the random generator of the caller
+    generator = Rng.getGenerator()
+    Rng.setGenerator(np.random.default_rng(0))
+    try:
+        layout = LegoBrickLayout()
+        layout.initialize(sampleWidth, sampleHeight, collection)
+        # the population members are copies, which don't share their bricks
+        layout = layout.copy()
+    finally:
+        Rng.setGenerator(generator)
+
+    cells = sampleWidth * sampleHeight
+    matrixBytes = cells * np.dtype(np.int32).itemsize
+    bricksBytes = max(getObjectBytes(layout) - matrixBytes, 0)
+    return int(width * height *
+               (np.dtype(np.int32).itemsize + bricksBytes / cells))
+
+
+def estimatePopulationBytes(width: int, height: int, populationSize: int,
+                            bricks: List[LegoBrick]) -> int:
+    """
+    The method estimates the peak bytes of the populations of an evolution,
+    while the next population is created the previous population is kept.
+
+    Parameters
+    ----------
+    width : int
+        The width of the board.
+    height : int
+        The height of the board.
+    populationSize : int
+        The size of the population.
+    bricks : List[LegoBrick]
+        The types of the bricks.
+
+    Returns
+    ----------
+    int
+        The estimated peak bytes.
+    """
+    return POPULATIONS_IN_MEMORY * populationSize * estimateLayoutBytes(
+        width, height, bricks)
+
+
+def getMaxPopulationSize(width: int, height: int, bricks: List[LegoBrick],
+                         maxBytes: int) -> int:
+    """
+    The method gets the biggest (even) population size whose estimated peak bytes
+    (see estimatePopulationBytes()) fit in a memory budget.
+
+    Parameters
+    ----------
+    width : int
+        The width of the board.
+    height : int
+        The height of the board.
+    bricks : List[LegoBrick]
+        The types of the bricks.
+    maxBytes : int
+        The memory budget in bytes.
+
+    Returns
+    ----------
+    int
+        The biggest population size, 0 if not even two layers fit.
+
+    Raises
+    ------
+    ValueError
+        If the memory budget isn't positive.
+    """
+    if maxBytes <= 0:
+        raise ValueError("max bytes must be positive!")
+    size = maxBytes // (POPULATIONS_IN_MEMORY *
+                        estimateLayoutBytes(width, height, bricks))
+    return int(size - size % 2)
@@ -0,0 +1,295 @@
+# profiling.py
+
+import os
+import sys
+import threading
+import time
+from collections import namedtuple
+from typing import Dict
+
+ProfileStatistics = namedtuple("ProfileStatistics",
+                               "phases counters generations")
+"""
+ProfileStatistics holds the measurements of generations:
+the wall-clock seconds of every phase and the amount of every counted event, by their names,
+and the amount of measured generations.
+"""
+
+# the profilers that the threads set, so concurrent runs don't mix their measurements
+__threadProfilers = threading.local()
+
+
+class Profiler(object):
+    """
+    A class used to measure where the time of the evolution goes: the wall-clock seconds of
+    every phase and the amount of every counted event, of the current generation and in total.
+    The measured code reports to the profiler of its thread (see setProfiler()) through the
+    module functions start(), stop() and count(), which do nothing when no profiler is set.
+
+    Methods
+    -------
+    addSeconds(phase: str, seconds: float):
+        Adds seconds to a phase of the current generation.
+    count(counter: str, amount: int = 1):
+        Counts events of the current generation.
+    nextGeneration():
+        Starts measuring the next generation.
+    getGeneration() -> ProfileStatistics:
+        Gets the measurements of the current generation.
+    getTotal() -> ProfileStatistics:
+        Gets the measurements of all the generations, including the current generation.
+    """
+
+    def __init__(self):
+        self.__phases = {}
+        self.__counters = {}
+        self.__totalPhases = {}
+        self.__totalCounters = {}
+        self.__generations = 0
+
+    def addSeconds(self, phase: str, seconds: float):
+        """
+        Adds seconds to a phase of the current generation.
+
+        Parameters
+        ----------
+        phase : str
+            The phase name.
+        seconds : float
+            The seconds that the phase took.
+        """
+        self.__phases[phase] = self.__phases.get(phase, 0.0) + seconds
+
+    def count(self, counter: str, amount: int = 1):
+        """
+        Counts events of the current generation.
+
+        Parameters
+        ----------
+        counter : str
+            The counter name.
+        amount : int [default = 1]
+            The amount of events.
+        """
+        self.__counters[counter] = self.__counters.get(counter, 0) + amount
+
+    def nextGeneration(self):
+        """
+        Adds the measurements of the current generation to the total, and starts
+        measuring the next generation.
+        """
+        Profiler.__merge(self.__totalPhases, self.__phases)
+        Profiler.__merge(self.__totalCounters, self.__counters)
+        self.__phases = {}
+        self.__counters = {}
+        self.__generations += 1
+
+    def getGeneration(self) -> ProfileStatistics:
+        """
+        Gets the measurements of the current generation.
+
+        Returns
+        -------
+        ProfileStatistics
+            The measurements.
+        """
+        return ProfileStatistics(
+            dict(self.__phases), dict(self.__counters), 1)
+
+    def getTotal(self) -> ProfileStatistics:
+        """
+        Gets the measurements of all the generations, including the current generation.
+
+        Returns
+        -------
+        ProfileStatistics
+            The measurements.
+        """
+        phases = dict(self.__totalPhases)
+        counters = dict(self.__totalCounters)
+        Profiler.__merge(phases, self.__phases)
+        Profiler.__merge(counters, self.__counters)
+        return ProfileStatistics(phases, counters, self.__generations + 1)
+
+    @staticmethod
+    def __merge(total: dict, values: dict):
+        for name, value in values.items():
+            total[name] = total.get(name, 0) + value
+
+
+class StackSampler(object):
+    """
+    A class used to sample the call stacks of a thread on a background thread,
+    in order to find where the time goes without instrumenting the code.
+    The stacks are counted in the collapsed format (the frames from the root, separated
+    by semicolons) that the flame graph tools read.
+
+    Methods
+    -------
+    start():
+        Starts sampling the current thread.
+    stop():
+        Stops sampling.
+    getStacks() -> Dict[str, int]:
+        Gets the amount of samples of every collapsed stack.
+    writeCollapsed(path: str):
+        Writes the collapsed stacks to a file, a stack and its amount of samples in a line.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        """
+        StackSampler constructor.
+
+        Parameters
+        ----------
+        interval : float [default = 0.005]
+            The seconds between two samples.
+
+        Raises
+        ------
+        ValueError
+            If the interval isn't positive.
+        """
+        if interval <= 0.0:
+            raise ValueError("interval must be positive!")
+        self.__interval = interval
+        self.__stacks = {}
+        self.__thread = None
+        self.__stopped = threading.Event()
+
+    def start(self):
+        """
+        Starts sampling the current thread.
+
+        Raises
+        ------
+        ValueError
+            If the sampler was already started.
+        """
+        if self.__thread is not None:
+            raise ValueError("the sampler was already started!")
+        self.__thread = threading.Thread(
+            target=self.__run,
+            args=(threading.get_ident(), ),
+            name="StackSampler",
+            daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        """
+        Stops sampling.
+        """
+        self.__stopped.set()
+        if self.__thread is not None:
+            self.__thread.join()
+
+    def getStacks(self) -> Dict[str, int]:
+        """
+        Gets the amount of samples of every collapsed stack.
+
+        Returns
+        -------
+        Dict[str, int]
+            The amount of samples by the collapsed stack.
+        """
+        return dict(self.__stacks)
+
+    def writeCollapsed(self, path: str):
+        """
+        Writes the collapsed stacks to a file, a stack and its amount of samples in a line.
+
+        Parameters
+        ----------
+        path : str
+            The file path.
+        """
+        with open(path, "w") as file:
+            for stack, samples in sorted(self.__stacks.items()):
+                file.write("%s %d\n" % (stack, samples))
+
+    def __run(self, threadId: int):
+        while not self.__stopped.wait(self.__interval):
+            frame = sys._current_frames().get(threadId)
+            if frame is None:
+                break
+            frames = []
+            while frame is not None:
+                code = frame.f_code
+                frames.append("%s (%s:%d)" %
+                              (code.co_name, os.path.basename(
+                                  code.co_filename), code.co_firstlineno))
+                frame = frame.f_back
+            stack = ";".join(reversed(frames))
+            self.__stacks[stack] = self.__stacks.get(stack, 0) + 1
+
+
+def getProfiler() -> Profiler:
+    """
+    Gets the profiler that the current thread reports to.
+
+    Returns
+    -------
+    Profiler
+        The profiler of the current thread, or None if the thread isn't profiled.
+    """
+    return getattr(__threadProfilers, "profiler", None)
+
+
+def setProfiler(profiler: Profiler):
+    """
+    Sets the profiler that the current thread reports to.
+
+    Parameters
+    ----------
+    profiler : Profiler
+        The profiler, None to stop profiling the thread.
+    """
+    __threadProfilers.profiler = profiler
+
+
+def start() -> float:
+    """
+    Starts measuring a phase.
+
+    Returns
+    -------
+    float
+        The start time to pass to stop(), or None if the thread isn't profiled.
+    """
+    if getattr(__threadProfilers, "profiler", None) is None:
+        return None
+    return time.perf_counter()
+
+
+def stop(phase: str, start: float):
+    """
+    Ends measuring a phase, and adds its seconds to the profiler of the current thread.
+
+    Parameters
+    ----------
+    phase : str
+        The phase name.
+    start : float
+        The time that start() returned.
+    """
+    if start is None:
+        return
+    profiler = getattr(__threadProfilers, "profiler", None)
+    if profiler is not None:
+        profiler.addSeconds(phase, time.perf_counter() - start)
+
+
+def count(counter: str, amount: int = 1):
+    """
+    Counts events in the profiler of the current thread.
+
+    Parameters
+    ----------
+    counter : str
+        The counter name.
+    amount : int [default = 1]
+        The amount of events.
+    """
+    profiler = getattr(__threadProfilers, "profiler", None)
+    if profiler is not None:
+        profiler.count(counter, amount)
@@ -0,0 +1,169 @@
+# render.py
+
+import math
+import struct
+import zlib
+
+import numpy as np
+
+# the colors of the rendered cells, as RGB
+UNCOVERED_COLOR = (255, 0, 0)
+COVERED_COLOR = (0, 0, 255)
+# the ends of the gradient, close to matplotlib's "YlGn" colormap
+GRADIENT_LOW_COLOR = (255, 255, 229)
+GRADIENT_HIGH_COLOR = (0, 69, 41)
+
+
+def remapIds(matrix: np.ndarray, firstId: int = 1) -> np.ndarray:
+    """
+    The method renumbers the brick IDs of an area matrix to consecutive numbers,
+    by the order of their first cell in a row by row scan. 0 (uncovered) stays 0.
+
+    Parameters
+    ----------
+    matrix : np.ndarray
+        The area matrix.
+    firstId : int [default = 1]
+        The number of the first brick.
+
+    Returns
+    ----------
+    np.ndarray
+        A new matrix with the renumbered IDs.
+    """
+    ids, firstCells, inverse = np.unique(
+        matrix, return_index=True, return_inverse=True)
+    covered = ids != 0
+    values = np.zeros(len(ids), dtype=matrix.dtype)
+    # the rank of every brick by its first cell
+    order = np.argsort(firstCells[covered], kind="stable")
+    ranks = np.empty(len(order), dtype=matrix.dtype)
+    ranks[order] = np.arange(firstId, firstId + len(order))
+    values[covered] = ranks
+    return values[inverse].reshape(matrix.shape)
+
+
+def getPreview(matrix: np.ndarray, maxSize: int) -> np.ndarray:
+    """
+    The method downsamples an area matrix by keeping every n-th cell of every n-th row,
+    so its ribs are at most a size. The kept cells keep their values.
+
+    Parameters
+    ----------
+    matrix : np.ndarray
+        The area matrix.
+    maxSize : int
+        The maximal size of a rib of the preview.
+
+    Returns
+    ----------
+    np.ndarray
+        The preview, a view of the matrix (or the matrix itself if it is small enough).
+
+    Raises
+    ------
+    ValueError
+        If the maximal size isn't bigger then 0.
+    """
+    if maxSize < 1:
+        raise ValueError("max size must be bigger then 0!")
+    step = getPreviewStep(matrix.shape, maxSize)
+    if step == 1:
+        return matrix
+    return matrix[::step, ::step]
+
+
+def getPreviewStep(shape: tuple, maxSize: int) -> int:
+    """
+    The method gets the step between the kept cells of a preview (see getPreview()).
+
+    Parameters
+    ----------
+    shape : tuple
+        The shape of the area matrix.
+    maxSize : int
+        The maximal size of a rib of the preview.
+
+    Returns
+    ----------
+    int
+        The step, 1 if the matrix is small enough.
+    """
+    return max(1, math.ceil(max(shape) / maxSize))
+
+
+def getColors(matrix: np.ndarray, gradient: bool = True) -> np.ndarray:
+    """
+    The method colors the cells of an area matrix.
+
+    Parameters
+    ----------
+    matrix : np.ndarray
+        The area matrix.
+    gradient : bool [default = True]
+        If true the cells are colored by a gradient of their IDs (like the gradient coloring
+        style of run.py), otherwise the covered and the uncovered cells get two colors.
+
+    Returns
+    ----------
+    np.ndarray
+        The RGB colors as a uint8 array, with the shape of the matrix and a last axis of 3.
+    """
+    if not gradient:
+        palette = np.array([UNCOVERED_COLOR, COVERED_COLOR], dtype=np.uint8)
+        return palette[(matrix > 0).astype(np.intp)]
+    low = np.array(GRADIENT_LOW_COLOR, dtype=np.float64)
+    high = np.array(GRADIENT_HIGH_COLOR, dtype=np.float64)
+    maximum = max(int(matrix.max(initial=0)), 1)
+    fractions = (matrix / maximum)[..., np.newaxis]
+    return np.rint(low + fractions * (high - low)).astype(np.uint8)
+
+
+def writeImage(path: str,
+               matrix: np.ndarray,
+               gradient: bool = True,
+               scale: int = 1):
+    """
+    The method writes an area matrix to a PNG image straight from the array,
+    a cell in a square of pixels, without matplotlib.
+    Like the plots of run.py, the rows of the matrix are the columns of the image.
+
+    Parameters
+    ----------
+    path : str
+        The image path.
+    matrix : np.ndarray
+        The area matrix.
+    gradient : bool [default = True]
+        The coloring style (see getColors()).
+    scale : int [default = 1]
+        The rib of the pixels square of a cell.
+
+    Raises
+    ------
+    ValueError
+        If the scale isn't bigger then 0.
+    """
+    if scale < 1:
+        raise ValueError("scale must be bigger then 0!")
+    pixels = getColors(matrix.T, gradient)
+    if scale > 1:
+        pixels = pixels.repeat(scale, axis=0).repeat(scale, axis=1)
+    height, width = pixels.shape[:2]
+    # every row of pixels starts with its filter type, 0 is none
+    rows = np.zeros((height, width * 3 + 1), dtype=np.uint8)
+    rows[:, 1:] = pixels.reshape(height, width * 3)
+
+    with open(path, "wb") as file:
+        file.write(b"\x89PNG\r\n\x1a\n")
+        __writeChunk(file, b"IHDR",
+                     struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        __writeChunk(file, b"IDAT", zlib.compress(rows.tobytes(), 6))
+        __writeChunk(file, b"IEND", b"")
+
+
+def __writeChunk(file, chunkType: bytes, data: bytes):
+    file.write(struct.pack(">I", len(data)))
+    file.write(chunkType)
+    file.write(data)
+    file.write(struct.pack(">I", zlib.crc32(chunkType + data) & 0xffffffff))
@@ -0,0 +1,85 @@
+# rng.py
+
+import threading
+from typing import List
+
+import numpy as np
+
+__generator = np.random.default_rng()
+# the generators that the threads set, so concurrent runs don't share a stream
+__threadGenerators = threading.local()
+
+
+def seed(seed: int = None) -> np.random.SeedSequence:
+    """
+    Seeds the random generator of the current thread.
+
+    Parameters
+    ----------
+    seed : int [default = None]
+        The seed, None for a fresh seed from the OS entropy.
+
+    Returns
+    -------
+    np.random.SeedSequence
+        The seed sequence that the random generator was created from.
+    """
+    seedSequence = np.random.SeedSequence(seed)
+    setGenerator(np.random.default_rng(seedSequence))
+    return seedSequence
+
+
+def getGenerator() -> np.random.Generator:
+    """
+    Gets the random generator that all the random decisions of the project draw from.
+    Every thread draws from the generator that it set, or from a shared generator if it didn't set one.
+
+    Returns
+    -------
+    np.random.Generator
+        The random generator of the current thread.
+    """
+    return getattr(__threadGenerators, "generator", __generator)
+
+
+def setGenerator(generator: np.random.Generator):
+    """
+    Sets the random generator that all the random decisions of the current thread draw from.
+
+    Parameters
+    ----------
+    generator : np.random.Generator
+        The new random generator of the current thread.
+
+    Raises
+    ------
+    TypeError
+        If the generator is None.
+    """
+    if generator is None:
+        raise TypeError("generator is none!")
+    __threadGenerators.generator = generator
+
+
+def spawnGenerators(seedSequence: np.random.SeedSequence,
+                    amount: int) -> List[np.random.Generator]:
+    """
+    Spawns independent random generators from a seed sequence.
+    Every task (not worker) should own one of the generators, so the results
+    stay the same no matter how the tasks are spread between the workers.
+
+    Parameters
+    ----------
+    seedSequence : np.random.SeedSequence
+        The parent seed sequence.
+    amount : int
+        The amount of generators to spawn.
+
+    Returns
+    -------
+    List[np.random.Generator]
+        The spawned generators, in a deterministic order.
+    """
+    return [
+        np.random.default_rng(child) for child in seedSequence.spawn(amount)
+    ]
@@ -0,0 +1,166 @@
+# scheduler.py
+
+from collections import namedtuple
+from enum import Enum
+from typing import Dict, List
+
+import numpy as np
+
+import lego.rng as Rng
+
+OperatorStatistics = namedtuple(
+    "OperatorStatistics", "calls successes gain seconds probability")
+"""
+OperatorStatistics holds the measured results of an operator:
+the amount of calls, the amount of successful calls, the total coverage gain,
+the total wall-clock seconds and the current selection probability.
+"""
+
+
+class OperatorScheduler(object):
+    """
+    A class used to select genetic operators adaptively, as a multi-armed bandit.
+    Every operator is rewarded with its coverage gain per millisecond, and the selection
+    probabilities follow the recency-weighted rewards (probability matching),
+    while every operator keeps a minimal probability in order to keep exploring.
+
+    Methods
+    -------
+    select() -> Enum:
+        Selects an operator.
+    getProbabilities() -> np.ndarray:
+        Gets the current selection probability of every operator.
+    getOperators() -> List[Enum]:
+        Gets the scheduled operators.
+    update(operator: Enum, success: bool, gain: int, seconds: float):
+        Updates the scheduler with the result of an operator call.
+    getStatistics() -> Dict[str, OperatorStatistics]:
+        Gets the measured results of every operator.
+    """
+
+    def __init__(self,
+                 operators: List[Enum],
+                 minProbability: float = 0.05,
+                 adaptationRate: float = 0.1):
+        """
+        OperatorScheduler constructor.
+
+        Parameters
+        ----------
+        operators : List[Enum]
+            The operators to schedule.
+        minProbability : float [default = 0.05]
+            The minimal selection probability of every operator.
+        adaptationRate : float [default = 0.1]
+            The weight of a new reward in the recency-weighted reward, in range (0.0, 1.0].
+
+        Raises
+        ------
+        ValueError
+            If there are no operators or the parameters are out of their range.
+        """
+        if operators is None or len(operators) == 0:
+            raise ValueError("operators list must not be empty!")
+        if minProbability < 0.0 or minProbability * len(operators) > 1.0:
+            raise ValueError(
+                "minimal probability must be in range [0.0, 1/operators]!")
+        if adaptationRate <= 0.0 or adaptationRate > 1.0:
+            raise ValueError("adaptation rate must be in range (0.0,1.0]!")
+
+        self.__operators = list(operators)
+        self.__minProbability = minProbability
+        self.__adaptationRate = adaptationRate
+        self.__rewards = np.zeros(len(operators))
+        self.__calls = np.zeros(len(operators), dtype=np.int64)
+        self.__successes = np.zeros(len(operators), dtype=np.int64)
+        self.__gains = np.zeros(len(operators), dtype=np.int64)
+        self.__seconds = np.zeros(len(operators))
+        self.__probabilities = np.full(len(operators), 1.0 / len(operators))
+
+    def select(self) -> Enum:
+        """
+        Selects an operator by the current selection probabilities.
+
+        Returns
+        -------
+        Enum
+            The selected operator.
+        """
+        index = Rng.getGenerator().choice(
+            len(self.__operators), p=self.__probabilities)
+        return self.__operators[index]
+
+    def getProbabilities(self) -> np.ndarray:
+        """
+        Gets the current selection probability of every operator.
+
+        Returns
+        -------
+        np.ndarray
+            The probabilities, in the order of getOperators().
+        """
+        return self.__probabilities.copy()
+
+    def getOperators(self) -> List[Enum]:
+        """
+        Gets the scheduled operators.
+
+        Returns
+        -------
+        List[Enum]
+            The scheduled operators.
+        """
+        return list(self.__operators)
+
+    def update(self, operator: Enum, success: bool, gain: int,
+               seconds: float):
+        """
+        Updates the scheduler with the result of an operator call.
+
+        Parameters
+        ----------
+        operator : Enum
+            The called operator.
+        success : bool
+            True if the operator succeeded.
+        gain : int
+            The coverage gain of the call, may be negative.
+        seconds : float
+            The wall-clock seconds of the call (time.perf_counter(), like lego.profiling).
+        """
+        index = self.__operators.index(operator)
+        self.__calls[index] += 1
+        self.__successes[index] += int(success)
+        self.__gains[index] += gain
+        self.__seconds[index] += seconds
+
+        # a failure or a loss is worth nothing, the time is wasted anyway
+        reward = max(gain, 0) / max(seconds * 1000.0, 1e-3)
+        self.__rewards[index] += self.__adaptationRate * (
+            reward - self.__rewards[index])
+
+        total = np.sum(self.__rewards)
+        if total <= 0:
+            self.__probabilities.fill(1.0 / len(self.__operators))
+        else:
+            self.__probabilities = self.__minProbability + (
+                1.0 - self.__minProbability * len(self.__operators)
+            ) * self.__rewards / total
+
+    def getStatistics(self) -> Dict[str, OperatorStatistics]:
+        """
+        Gets the measured results of every operator.
+
+        Returns
+        -------
+        Dict[str, OperatorStatistics]
+            The results by the operator name.
+        """
+        return {
+            self.__operators[i].name:
+            OperatorStatistics(
+                int(self.__calls[i]), int(self.__successes[i]),
+                int(self.__gains[i]), float(self.__seconds[i]),
+                float(self.__probabilities[i]))
+            for i in range(len(self.__operators))
+        }
@@ -0,0 +1,256 @@
+# seeding.py
+
+from enum import Enum
+from typing import List, Tuple
+
+import numpy as np
+
+import lego.rng as Rng
+from lego.brick import LegoBrick
+from lego.collection import LegoBrickCollection
+from lego.layout import LegoBrickLayout
+
+
+class Seedings(Enum):
+    BOTTOM_LEFT = 1
+    MAXIMAL_RECTANGLES = 2
+    SKYLINE = 3
+
+
+SeedingsList = list(Seedings)
+
+__CANDIDATES = 3
+"""
+Every placement is drawn from the best candidates, it keeps the seeded layouts diverse.
+"""
+
+
+def createLayout(seeding: Seedings, width: int, height: int,
+                 brickCollection: LegoBrickCollection) -> LegoBrickLayout:
+    """
+    The method creates a layout with a constructive heuristic.
+
+    Parameters
+    ----------
+    seeding : Seedings
+        The heuristic to fill the layout with.
+    width : int
+        The layout width.
+    height : int
+        The layout height.
+    brickCollection : LegoBrickCollection
+        The collection of bricks to create the layer from.
+
+    Returns
+    ----------
+    LegoBrickLayout
+        The created layout.
+    """
+    layout = LegoBrickLayout()
+    layout.initialize(width, height, brickCollection, randomLayout=False)
+    fillLayout(seeding, layout)
+    return layout
+
+
+def fillLayout(seeding: Seedings, layer: LegoBrickLayout) -> int:
+    """
+    The method fills the empty cells of a layer with a constructive heuristic,
+    using the available bricks of the layer collection.
+
+    Parameters
+    ----------
+    seeding : Seedings
+        The heuristic to fill the layer with.
+    layer : LegoBrickLayout
+        The layer to fill.
+
+    Returns
+    ----------
+    int
+        The covered area that the heuristic added
+
+    Raises
+    ------
+    ValueError
+        If the seeding is unknown.
+    """
+    coveredBefore = layer.getCoveredArea()
+    if seeding == Seedings.BOTTOM_LEFT:
+        bottomLeftFill(layer)
+    elif seeding == Seedings.MAXIMAL_RECTANGLES:
+        maximalRectanglesFill(layer)
+    elif seeding == Seedings.SKYLINE:
+        skylineFill(layer)
+    else:
+        raise ValueError("unknown seeding!")
+    return layer.getCoveredArea() - coveredBefore
+
+
+def bottomLeftFill(layer: LegoBrickLayout):
+    """
+    The method visits the empty cells of a layer row by row, and places in every
+    cell one of the biggest available bricks that fit there.
+
+    Parameters
+    ----------
+    layer : LegoBrickLayout
+        The layer to fill.
+    """
+    area = layer.getAreaMatrix()
+    collection = layer.getCollection()
+    for row, column in np.argwhere(area == 0):
+        if collection.getAmountOfAvailableBricks() == 0:
+            break
+        if area[row, column] != 0:
+            # covered by a brick that placed on a previous cell
+            continue
+        candidates = [
+            (brickType, orientation)
+            for brickType in collection.getAvailableBricksTypes()
+            for orientation, rows, columns in __getOrientations(brickType)
+            if row + rows <= area.shape[0] and column + columns <= area.shape[
+                1] and not area[row:row + rows, column:column + columns].any()
+        ]
+        if len(candidates) == 0:
+            continue
+        candidates.sort(key=lambda item: item[0].getArea(), reverse=True)
+        brickType, orientation = __drawCandidate(candidates)
+        __place(layer, row, column, brickType, orientation)
+
+
+def skylineFill(layer: LegoBrickLayout):
+    """
+    The method packs bricks on the skyline of a layer: every brick is placed on the
+    lowest segment of the skyline, the bricks that cover most of the segment first.
+    A segment that no brick fits in is wasted, and raised to its lowest neighbor.
+
+    Parameters
+    ----------
+    layer : LegoBrickLayout
+        The layer to fill, expected to be empty.
+    """
+    rows, columns = layer.getAreaMatrix().shape
+    collection = layer.getCollection()
+    skyline = np.zeros(columns, dtype=np.int32)
+    while collection.getAmountOfAvailableBricks() > 0:
+        level = skyline.min()
+        if level >= rows:
+            break
+        start = int(np.argmax(skyline == level))
+        end = start + int(np.argmax(np.append(skyline[start:], -1) != level))
+
+        candidates = [(brickType, orientation, brickRows, brickColumns)
+                      for brickType in collection.getAvailableBricksTypes()
+                      for orientation, brickRows, brickColumns in
+                      __getOrientations(brickType)
+                      if brickColumns <= end - start
+                      and level + brickRows <= rows]
+        if len(candidates) == 0:
+            neighbors = skyline[[
+                i for i in [start - 1, end] if i >= 0 and i < columns
+            ]]
+            skyline[start:end] = rows if len(neighbors) == 0 else min(
+                neighbors)
+            continue
+
+        candidates.sort(
+            key=lambda item: (item[3], item[0].getArea()), reverse=True)
+        brickType, orientation, brickRows, brickColumns = __drawCandidate(
+            candidates)
+        __place(layer, level, start, brickType, orientation)
+        skyline[start:start + brickColumns] = level + brickRows
+
+
+def maximalRectanglesFill(layer: LegoBrickLayout):
+    """
+    The method packs bricks in the maximal free rectangles of a layer:
+    one of the biggest available bricks is placed in the free rectangle that fits it best
+    (the shortest leftover side), and the free rectangles it overlaps are split.
+
+    Parameters
+    ----------
+    layer : LegoBrickLayout
+        The layer to fill, expected to be empty.
+    """
+    rows, columns = layer.getAreaMatrix().shape
+    collection = layer.getCollection()
+    # row, column, row end, column end
+    free = np.array([[0, 0, rows, columns]], dtype=np.int32)
+    while collection.getAmountOfAvailableBricks() > 0 and len(free) > 0:
+        freeRows = free[:, 2] - free[:, 0]
+        freeColumns = free[:, 3] - free[:, 1]
+        candidates = []
+        for brickType in collection.getAvailableBricksTypes():
+            for orientation, brickRows, brickColumns in __getOrientations(
+                    brickType):
+                fits = np.flatnonzero((freeRows >= brickRows)
+                                      & (freeColumns >= brickColumns))
+                if len(fits) == 0:
+                    continue
+                leftover = np.minimum(freeRows[fits] - brickRows,
+                                      freeColumns[fits] - brickColumns)
+                best = np.argmin(leftover)
+                candidates.append((brickType, orientation, brickRows,
+                                   brickColumns, fits[best], leftover[best]))
+        if len(candidates) == 0:
+            break
+
+        candidates.sort(key=lambda item: (-item[0].getArea(), item[5]))
+        brickType, orientation, brickRows, brickColumns, index, _ = __drawCandidate(
+            candidates)
+        row, column = free[index, 0], free[index, 1]
+        __place(layer, row, column, brickType, orientation)
+        free = __splitFreeRectangles(free, row, column, row + brickRows,
+                                     column + brickColumns)
+
+
+def __splitFreeRectangles(free: np.ndarray, row: int, column: int,
+                          rowEnd: int, columnEnd: int) -> np.ndarray:
+    overlapped = (free[:, 0] < rowEnd) & (free[:, 2] > row) & (
+        free[:, 1] < columnEnd) & (free[:, 3] > column)
+    split = free[overlapped]
+    kept = free[~overlapped]
+
+    above = split[split[:, 0] < row].copy()
+    above[:, 2] = row
+    below = split[split[:, 2] > rowEnd].copy()
+    below[:, 0] = rowEnd
+    left = split[split[:, 1] < column].copy()
+    left[:, 3] = column
+    right = split[split[:, 3] > columnEnd].copy()
+    right[:, 1] = columnEnd
+    pieces = np.unique(np.concatenate([above, below, left, right]), axis=0)
+    if len(pieces) == 0:
+        return kept
+
+    # a piece is maximal only if no other free rectangle contains it
+    others = np.concatenate([kept, pieces])
+    contained = (others[None, :, 0] <= pieces[:, None, 0]) & (
+        others[None, :, 1] <= pieces[:, None, 1]) & (
+            others[None, :, 2] >= pieces[:, None, 2]) & (
+                others[None, :, 3] >= pieces[:, None, 3])
+    return np.concatenate([kept, pieces[np.sum(contained, axis=1) == 1]])
+
+
+def __getOrientations(
+        brick: LegoBrick) -> List[Tuple[LegoBrickLayout.Orientation, int, int]]:
+    # the orientation, and the rows and the columns that the brick covers in it
+    orientations = [(LegoBrickLayout.Orientation.HORIZONTAL, brick.getHeight(),
+                     brick.getWidth())]
+    if brick.getWidth() != brick.getHeight():
+        orientations.append((LegoBrickLayout.Orientation.VERTICAL,
+                             brick.getWidth(), brick.getHeight()))
+    return orientations
+
+
+def __drawCandidate(candidates: List):
+    # the candidates are sorted from the best
+    return candidates[Rng.getGenerator().integers(
+        min(__CANDIDATES, len(candidates)))]
+
+
+def __place(layer: LegoBrickLayout, row: int, column: int,
+            brickType: LegoBrick, orientation: LegoBrickLayout.Orientation):
+    brick = layer.getCollection().getBrick(brickType.getWidth(),
+                                           brickType.getHeight())
+    layer.tryAddBrick(row, column, brick, orientation)
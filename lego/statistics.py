@@ -0,0 +1,374 @@
+# statistics.py
+
+from collections import namedtuple
+from typing import List
+
+import numpy as np
+
+CoverageStatistics = namedtuple("CoverageStatistics",
+                                "max min mean median sum count")
+"""
+CoverageStatistics holds the statistics of covered areas:
+the maximal, the minimal, the mean and the median coverage,
+the sum of the coverages and their amount.
+"""
+
+
+def getCoverageStatistics(coverages: np.ndarray) -> CoverageStatistics:
+    """
+    The method calculates the exact statistics of covered areas, without sorting them.
+
+    Parameters
+    ----------
+    coverages : np.ndarray
+        The covered areas.
+
+    Returns
+    ----------
+    CoverageStatistics
+        The statistics of the covered areas.
+
+    Raises
+    ------
+    ValueError
+        If there are no covered areas.
+    """
+    if len(coverages) == 0:
+        raise ValueError("coverages must not be empty!")
+    total = int(np.sum(coverages))
+    return CoverageStatistics(
+        int(np.max(coverages)), int(np.min(coverages)),
+        total / len(coverages), float(np.median(coverages)), total,
+        len(coverages))
+
+
+class P2Quantile(object):
+    """
+    A class used to estimate a quantile of a stream of values in constant memory,
+    with the P-square algorithm (Jain and Chlamtac, 1985): five markers track the minimum,
+    the quantile, the maximum and two middle quantiles, and are moved toward their desired
+    positions by a piecewise-parabolic interpolation.
+    The estimate is exact up to five values.
+
+    Methods
+    -------
+    add(value: float):
+        Adds a value to the stream.
+    addAll(values: np.ndarray):
+        Adds values to the stream.
+    getQuantile() -> float:
+        Gets the estimated quantile of the stream.
+    getCount() -> int:
+        Gets the amount of values in the stream.
+    """
+
+    def __init__(self, quantile: float = 0.5):
+        """
+        P2Quantile constructor.
+
+        Parameters
+        ----------
+        quantile : float [default = 0.5]
+            The quantile to estimate, in range (0.0, 1.0).
+
+        Raises
+        ------
+        ValueError
+            If the quantile is out of its range.
+        """
+        if quantile <= 0.0 or quantile >= 1.0:
+            raise ValueError("quantile must be in range (0.0,1.0)!")
+        self.__quantile = quantile
+        self.__count = 0
+        # heights and positions of the markers
+        self.__heights = []
+        self.__positions = [1, 2, 3, 4, 5]
+        self.__desired = [
+            1, 1 + 2 * quantile, 1 + 4 * quantile, 3 + 2 * quantile, 5
+        ]
+        self.__increments = [0, quantile / 2, quantile, (1 + quantile) / 2, 1]
+
+    def add(self, value: float):
+        """
+        Adds a value to the stream.
+
+        Parameters
+        ----------
+        value : float
+            The value.
+        """
+        self.__count += 1
+        heights = self.__heights
+        if self.__count <= 5:
+            heights.append(float(value))
+            heights.sort()
+            return
+
+        positions = self.__positions
+        if value < heights[0]:
+            heights[0] = float(value)
+            k = 0
+        elif value >= heights[4]:
+            heights[4] = float(value)
+            k = 3
+        else:
+            k = 0
+            while value >= heights[k + 1]:
+                k += 1
+        for i in range(k + 1, 5):
+            positions[i] += 1
+        for i in range(5):
+            self.__desired[i] += self.__increments[i]
+
+        for i in range(1, 4):
+            d = self.__desired[i] - positions[i]
+            if (d >= 1 and positions[i + 1] - positions[i] > 1) or (
+                    d <= -1 and positions[i - 1] - positions[i] < -1):
+                d = 1 if d > 0 else -1
+                height = self.__parabolic(i, d)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = heights[i] + d * (heights[i + d] - heights[i]) / (
+                        positions[i + d] - positions[i])
+                heights[i] = height
+                positions[i] += d
+
+    def addAll(self, values: np.ndarray):
+        """
+        Adds values to the stream, in their order.
+
+        Parameters
+        ----------
+        values : np.ndarray
+            The values.
+        """
+        for value in np.asarray(values).tolist():
+            self.add(value)
+
+    def getQuantile(self) -> float:
+        """
+        Gets the estimated quantile of the stream.
+
+        Returns
+        -------
+        float
+            The estimated quantile, or None if the stream is empty.
+        """
+        if self.__count == 0:
+            return None
+        if self.__count <= 5:
+            return float(np.quantile(self.__heights, self.__quantile))
+        return self.__heights[2]
+
+    def getCount(self) -> int:
+        """
+        Gets the amount of values in the stream.
+
+        Returns
+        -------
+        int
+            The amount of values.
+        """
+        return self.__count
+
+    def __parabolic(self, i: int, d: int) -> float:
+        heights = self.__heights
+        positions = self.__positions
+        return heights[i] + d / (positions[i + 1] - positions[i - 1]) * (
+            (positions[i] - positions[i - 1] + d) *
+            (heights[i + 1] - heights[i]) /
+            (positions[i + 1] - positions[i]) +
+            (positions[i + 1] - positions[i] - d) *
+            (heights[i] - heights[i - 1]) / (positions[i] - positions[i - 1]))
+
+
+class RunningStatistics(object):
+    """
+    A class used to keep the exact statistics of all the covered areas of a run in constant memory:
+    the covered areas are integers up to the area of the board, so they are counted in a histogram
+    by their values, which a batch (a generation) is added to with one vectorized operation.
+
+    Methods
+    -------
+    addAll(coverages: np.ndarray):
+        Adds a batch of covered areas to the statistics.
+    getStatistics() -> CoverageStatistics:
+        Gets the statistics of all the added covered areas.
+    """
+
+    def __init__(self):
+        self.__max = None
+        self.__min = None
+        self.__sum = 0
+        self.__count = 0
+        # the amount of every covered area
+        self.__histogram = np.zeros(0, dtype=np.int64)
+
+    def addAll(self, coverages: np.ndarray):
+        """
+        Adds a batch of covered areas to the statistics.
+
+        Parameters
+        ----------
+        coverages : np.ndarray
+            The covered areas, non-negative integers.
+        """
+        if len(coverages) == 0:
+            return
+        maximum = int(np.max(coverages))
+        minimum = int(np.min(coverages))
+        self.__max = maximum if self.__max is None else max(
+            self.__max, maximum)
+        self.__min = minimum if self.__min is None else min(
+            self.__min, minimum)
+        self.__sum += int(np.sum(coverages))
+        self.__count += len(coverages)
+        counts = np.bincount(coverages, minlength=len(self.__histogram))
+        counts[:len(self.__histogram)] += self.__histogram
+        self.__histogram = counts
+
+    def getStatistics(self) -> CoverageStatistics:
+        """
+        Gets the statistics of all the added covered areas.
+
+        Returns
+        -------
+        CoverageStatistics
+            The statistics, or None if no covered area was added.
+        """
+        if self.__count == 0:
+            return None
+        # the two middle values, which are the same value for an odd count
+        cumulative = np.cumsum(self.__histogram)
+        lower = np.searchsorted(cumulative, (self.__count - 1) // 2, "right")
+        upper = np.searchsorted(cumulative, self.__count // 2, "right")
+        return CoverageStatistics(self.__max, self.__min,
+                                  self.__sum / self.__count,
+                                  float(lower + upper) / 2, self.__sum,
+                                  self.__count)
+
+
+class RingBuffer(object):
+    """
+    A class used to keep the last rows of a table in a preallocated NumPy array,
+    a new row overwrites the oldest row when the buffer is full.
+
+    Methods
+    -------
+    append(row: List[float]):
+        Appends a row.
+    getRows() -> np.ndarray:
+        Gets the kept rows, from the oldest.
+    setRows(rows: np.ndarray, appended: int):
+        Replaces the kept rows, e.g. with the rows of a checkpoint.
+    getCapacity() -> int:
+        Gets the maximal amount of kept rows.
+    getAppendedAmount() -> int:
+        Gets the amount of rows that were appended, including the overwritten rows.
+    """
+
+    def __init__(self, capacity: int, columns: int, dtype=np.float64):
+        """
+        RingBuffer constructor.
+
+        Parameters
+        ----------
+        capacity : int
+            The maximal amount of kept rows.
+        columns : int
+            The amount of columns.
+        dtype : [default = np.float64]
+            The data type of the values.
+
+        Raises
+        ------
+        ValueError
+            If the capacity or the amount of columns is smaller than 1.
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be bigger then 0!")
+        if columns < 1:
+            raise ValueError("columns must be bigger then 0!")
+        self.__rows = np.zeros((capacity, columns), dtype=dtype)
+        self.__appended = 0
+        # the rows that were appended before the kept rows were set
+        self.__dropped = 0
+
+    def __len__(self) -> int:
+        return min(self.__appended, len(self.__rows))
+
+    def append(self, row: List[float]):
+        """
+        Appends a row, it overwrites the oldest row if the buffer is full.
+
+        Parameters
+        ----------
+        row : List[float]
+            The values of the row.
+        """
+        self.__rows[self.__appended % len(self.__rows)] = row
+        self.__appended += 1
+
+    def getRows(self) -> np.ndarray:
+        """
+        Gets the kept rows, from the oldest.
+
+        Returns
+        -------
+        np.ndarray
+            A copy of the kept rows, with the shape (rows, columns).
+        """
+        if self.__appended <= len(self.__rows):
+            return self.__rows[:self.__appended].copy()
+        start = self.__appended % len(self.__rows)
+        return np.concatenate([self.__rows[start:], self.__rows[:start]])
+
+    def setRows(self, rows: np.ndarray, appended: int):
+        """
+        Replaces the kept rows, e.g. with the rows of a checkpoint, only the newest rows
+        are kept if there are more rows than the capacity.
+
+        Parameters
+        ----------
+        rows : np.ndarray
+            The rows, from the oldest, with the shape (rows, columns).
+        appended : int
+            The amount of rows that were appended, including the overwritten rows.
+
+        Raises
+        ------
+        ValueError
+            If the amount of columns is different or the appended amount is smaller than
+            the amount of rows.
+        """
+        rows = np.asarray(rows)
+        if rows.ndim != 2 or rows.shape[1] != self.__rows.shape[1]:
+            raise ValueError("rows must have %d columns!" %
+                             self.__rows.shape[1])
+        if appended < len(rows):
+            raise ValueError("appended must be at least the amount of rows!")
+        rows = rows[max(len(rows) - len(self.__rows), 0):]
+        self.__rows[:len(rows)] = rows
+        self.__appended = len(rows)
+        self.__dropped = appended - len(rows)
+
+    def getCapacity(self) -> int:
+        """
+        Gets the maximal amount of kept rows.
+
+        Returns
+        -------
+        int
+            The capacity.
+        """
+        return len(self.__rows)
+
+    def getAppendedAmount(self) -> int:
+        """
+        Gets the amount of rows that were appended, including the overwritten rows.
+
+        Returns
+        -------
+        int
+            The amount of appended rows.
+        """
+        return self.__appended + self.__dropped
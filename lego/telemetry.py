@@ -0,0 +1,245 @@
+# telemetry.py
+
+import json
+import os
+import threading
+import time
+
+from lego.ga import GenerationSnapshot, LegoBrickGA
+
+
+def getRss() -> int:
+    """
+    The method gets the resident set size of the process.
+
+    Returns
+    ----------
+    int
+        The resident set size in bytes, the peak size where the current size isn't available,
+        or None if neither is available.
+    """
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+        # kilobytes on Linux, bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if os.uname().sysname == "Darwin" else peak * 1024
+    except (ImportError, AttributeError):
+        return None
+
+
+class TelemetrySink(LegoBrickGA.GaResultHandler):
+    """
+    A result handler that writes a JSON line of telemetry for every generation:
+    the generation number, the best, mean and minimal coverage, the wall-clock seconds,
+    the phases timings and the counters (when the GA profiles), the resident set size,
+    the offspring rejection rate, the calls and the successes of the operators
+    (when the operators are adaptive) and the measured bytes of a layer (when the memory is limited).
+    The lines are buffered and written to the file on a background thread, and the file is
+    rotated when it grows over a size: 'path' is renamed to 'path.1', 'path.1' to 'path.2' and so on.
+    The sink can wrap another handler, which receives the snapshots after they are buffered
+    (so the sink can wrap a HandlerDispatcher and still record every generation).
+
+    Methods
+    -------
+    onGaSnapshot(snapshot: GenerationSnapshot):
+        Buffers the telemetry line of a generation.
+    needsPopulation() -> bool:
+        Whether the wrapped handler needs the population.
+    flush():
+        Writes the buffered lines and waits until they are written.
+    close():
+        Writes the buffered lines and closes the file.
+    """
+
+    def __init__(self,
+                 path: str,
+                 maxBytes: int = 64 * 1024 * 1024,
+                 backupCount: int = 3,
+                 flushInterval: float = 1.0,
+                 generationResultHandler: LegoBrickGA.GaResultHandler = None):
+        """
+        TelemetrySink constructor.
+
+        Parameters
+        ----------
+        path : str
+            The file to append the telemetry lines to.
+        maxBytes : int [default = 64MB]
+            The file is rotated before it grows over this size, 0 for no rotation.
+        backupCount : int [default = 3]
+            The amount of rotated files that are kept.
+        flushInterval : float [default = 1.0]
+            The maximal seconds that a line waits in the buffer.
+        generationResultHandler : GaResultHandler [default = None]
+            A handler to pass the snapshots and the checkpoint state to, None for no handler.
+
+        Raises
+        ------
+        ValueError
+            If a parameter is negative or the flush interval isn't positive.
+        """
+        super(TelemetrySink, self).__init__()
+        if maxBytes < 0:
+            raise ValueError("max bytes must not be negative!")
+        if backupCount < 0:
+            raise ValueError("backup count must not be negative!")
+        if flushInterval <= 0.0:
+            raise ValueError("flush interval must be positive!")
+        self.__handler = generationResultHandler
+        self.__path = path
+        self.__maxBytes = maxBytes
+        self.__backupCount = backupCount
+        self.__flushInterval = flushInterval
+        self.__file = open(path, "a")
+        self.__lines = []
+        self.__writing = False
+        self.__closed = False
+        self.__error = None
+        self.__condition = threading.Condition()
+        self.__thread = threading.Thread(
+            target=self.__run, name="TelemetrySink", daemon=True)
+        self.__thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+
+    def onGaSnapshot(self, snapshot: GenerationSnapshot):
+        """
+        Buffers the telemetry line of a generation.
+
+        Parameters
+        ----------
+        snapshot : GenerationSnapshot
+            The snapshot of the generation.
+
+        Raises
+        ------
+        ValueError
+            If the sink is closed.
+        """
+        if self.__closed:
+            raise ValueError("the telemetry sink is closed!")
+        line = json.dumps(TelemetrySink.__createRecord(snapshot)) + "\n"
+        with self.__condition:
+            self.__lines.append(line)
+        if self.__handler is not None:
+            self.__handler.onGaSnapshot(snapshot)
+
+    def needsPopulation(self) -> bool:
+        # the telemetry lines don't need the population
+        return self.__handler is not None and self.__handler.needsPopulation()
+
+    def getCheckpointState(self) -> object:
+        if self.__handler is None:
+            return None
+        return self.__handler.getCheckpointState()
+
+    def setCheckpointState(self, state: object):
+        if self.__handler is not None:
+            self.__handler.setCheckpointState(state)
+
+    def flush(self):
+        """
+        Writes the buffered lines and waits until they are written.
+        """
+        with self.__condition:
+            self.__condition.notify_all()
+            while (len(self.__lines) > 0
+                   or self.__writing) and self.__thread.is_alive():
+                self.__condition.wait()
+
+    def close(self):
+        """
+        Writes the buffered lines and closes the file.
+
+        Raises
+        ------
+        OSError
+            The first error that writing the file raised, if any.
+        """
+        if not self.__closed:
+            with self.__condition:
+                self.__closed = True
+                self.__condition.notify_all()
+            self.__thread.join()
+            self.__file.close()
+        if self.__error is not None:
+            error, self.__error = self.__error, None
+            raise error
+
+    def __run(self):
+        while True:
+            with self.__condition:
+                self.__writing = False
+                self.__condition.notify_all()
+                if len(self.__lines) == 0 and not self.__closed:
+                    self.__condition.wait(self.__flushInterval)
+                lines, self.__lines = self.__lines, []
+                closed = self.__closed
+                self.__writing = len(lines) > 0
+            if len(lines) > 0:
+                try:
+                    self.__write("".join(lines))
+                except OSError as e:
+                    if self.__error is None:
+                        self.__error = e
+            if closed and len(lines) == 0:
+                return
+
+    def __write(self, text: str):
+        if self.__maxBytes > 0 and self.__file.tell() > 0 and (
+                self.__file.tell() + len(text) > self.__maxBytes):
+            self.__rotate()
+        self.__file.write(text)
+        self.__file.flush()
+
+    def __rotate(self):
+        self.__file.close()
+        if self.__backupCount > 0:
+            for i in range(self.__backupCount - 1, 0, -1):
+                source = "%s.%d" % (self.__path, i)
+                if os.path.exists(source):
+                    os.replace(source, "%s.%d" % (self.__path, i + 1))
+            os.replace(self.__path, self.__path + ".1")
+        self.__file = open(self.__path, "w")
+
+    @staticmethod
+    def __createRecord(snapshot: GenerationSnapshot) -> dict:
+        statistics = snapshot.statistics
+        coverage = statistics["coverage"]
+        record = {
+            "time": time.time(),
+            "generation": int(snapshot.generation),
+            "bestCoverage": int(snapshot.bestCoverage),
+            "meanCoverage": float(snapshot.meanCoverage),
+            "minCoverage": int(coverage.min),
+            "seconds": float(snapshot.seconds),
+            "elapsed": float(snapshot.elapsed),
+            "rss": getRss(),
+            "rejectionRate": float(statistics["stagnation"]["rejectionRate"])
+        }
+        if "profile" in statistics:
+            record["phases"] = statistics["profile"].phases
+            record["counters"] = statistics["profile"].counters
+        if "memory" in statistics:
+            record["bytesPerLayer"] = int(statistics["memory"].bytesPerLayer)
+        if "operators" in statistics:
+            record["operators"] = {
+                family: {
+                    name: {
+                        "calls": int(operator.calls),
+                        "successes": int(operator.successes)
+                    }
+                    for name, operator in operators.items()
+                }
+                for family, operators in statistics["operators"].items()
+            }
+        return record
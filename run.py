@@ -1,20 +1,27 @@
+import cProfile
 import getopt
+import json
 import math
+import pstats
 import sys
 import traceback
+from collections import namedtuple
 from typing import List
 
-import matplotlib.cm as cm
-import matplotlib.colors as colors
-import matplotlib.pyplot as plt
-import matplotlib.ticker as ticker
 import numpy as np
-import pandas as pd
 
+import lego.ga_utils as GaUtils
+import lego.memory as Memory
+import lego.profiling as Profiling
+import lego.render as Render
+import lego.rng as Rng
+import lego.statistics as Statistics
 from lego.brick import LegoBrick
 from lego.collection import LegoBrickCollection
-from lego.ga import LegoBrickGA
+from lego.dispatch import HandlerDispatcher
+from lego.ga import GenerationSnapshot, LegoBrickGA
 from lego.layout import LegoBrickLayout
+from lego.telemetry import TelemetrySink
 
 DEFAULT_WIDTH = 25
 DEFAULT_HEIGHT = 25
@@ -25,6 +32,37 @@ DEFAULT_POPULATION_SIZE = 100
 DEFAULT_MUTATION_THRESHOLD = 0.2
 DEFAULT_VERBOSE = True
 DEFAULT_COLOR_TYPE = 2
+DEFAULT_SEED = None
+DEFAULT_CROSSOVER = GaUtils.Crossovers.RECTANGLE
+DEFAULT_REPAIR = False
+DEFAULT_ADAPTIVE = False
+DEFAULT_LOCAL_SEARCH = 0
+DEFAULT_SEARCH_BUDGET = 0.05
+DEFAULT_SEEDED = 0.0
+DEFAULT_STAGNATION = None
+DEFAULT_STAGNATION_GENERATIONS = 10
+DEFAULT_TIME_BUDGET = None
+DEFAULT_CHECKPOINT = None
+DEFAULT_CHECKPOINT_INTERVAL = 10.0
+DEFAULT_RESUME = None
+DEFAULT_DISPATCH = 0
+DEFAULT_HISTORY = 10000
+DEFAULT_TIMINGS = False
+DEFAULT_PROFILE = None
+DEFAULT_TELEMETRY = None
+DEFAULT_MAX_MEMORY = None
+DEFAULT_HEADLESS = None
+DEFAULT_IMAGE = None
+# the biggest board rib that is drawn cell by cell, bigger boards are drawn as a preview
+PREVIEW_SIZE = 500
+# the biggest board rib whose cells are separated by grid lines
+GRID_SIZE = 100
+# the biggest board rib whose best coverage matrix is printed
+PRINT_SIZE = 200
+# the minimal rib in pixels of the written images
+IMAGE_SIZE = 1000
+PROFILED_MODULES = r"lego[\\/](layout|ga_utils|collection)\.py"
+PROFILED_FUNCTIONS = 20
 
 HELP = """\nGenetic Algorithm Solution to 2D-LEGO Brick Layout Problem:
               --help        : help description
@@ -40,13 +78,69 @@ HELP = """\nGenetic Algorithm Solution to 2D-LEGO Brick Layout Problem:
                               0 will prevent the mutation [default='%f']
               --verbose     : 0 for minimum prints and 1 for more prints [default='%d']
               --color       : 1 for discrete coloring style, 2 for gradient coloring style [default='%d']
+              --seed        : The seed of the random generators, a seeded run is reproducible [default=random]
+              --crossover   : The crossover operator, 'rectangle', 'guillotine' or 'band' [default='%s']
+              --repair      : 1 for filling the holes of the children with the biggest available bricks,
+                              0 for leaving them to the mutations [default='%d']
+              --adaptive    : 1 for selecting the crossover and the mutations by their measured gain per millisecond,
+                              0 for a fixed crossover and uniformly selected mutations [default='%d']
+              --local_search: The amount of elites that are improved by a hill climb every generation,
+                              0 for no local search [default='%d']
+              --search_budget: The wall-clock seconds of the local search every generation [default='%f']
+              --seeded      : The fraction of the population that is created by the constructive heuristics
+                              (bottom-left fill, maximal rectangles and skyline), in the range [0.0, 1.0] [default='%f']
+              --stagnation  : The response to a stagnation, 'reseed', 'mutation_boost' or 'stop',
+                              'none' for no stagnation detection [default='none']
+              --stagnation_generations: The generations without an improvement that count as a stagnation [default='%d']
+              --time_budget : The wall-clock seconds of the evolution, it stops at the last generation
+                              that is completed in time [default=no limit]
+              --checkpoint  : A file to save checkpoints of the evolution to, a stopped run can be resumed from it
+                              [default=no checkpoints]
+              --checkpoint_interval: The minimal seconds between two checkpoints [default='%f']
+              --resume      : A checkpoint file to resume the evolution from, the problem arguments are taken
+                              from the checkpoint and the checkpoints are saved back to it [default=new run]
+              --dispatch    : N for collecting the statistics of every N-th generation on a background thread,
+                              0 for collecting the statistics of every generation during the evolution [default='%d']
+              --history     : The amount of last generations whose statistics are kept for the plot [default='%d']
+              --timings     : 1 for measuring the time of every phase of the generations and counting their events,
+                              which are printed as a table at the end, 0 for no measuring [default='%d']
+              --profile     : A path prefix to profile the evolution to: the cProfile statistics are written to
+                              '<prefix>.pstats', the sampled call stacks (for flame graphs) to '<prefix>.collapsed',
+                              and the hot functions of the layout, the collection and the GA utilities are printed
+                              [default=no profiling]
+              --telemetry   : A file to append a JSON line of telemetry to for every generation (the coverages,
+                              the seconds, the phases timings, the memory and the operators statistics), it is
+                              rotated at 64MB [default=no telemetry]
+              --max_memory  : The megabytes that the populations may take, the population size is shrunk to fit
+                              in them, and the measured bytes of a layer are printed at the end [default=no limit]
+              --headless    : A path prefix to write the results to instead of showing them: the statistics to
+                              '<prefix>_statistics.csv', the best layer to '<prefix>.json' and the plots to
+                              '<prefix>.png' and '<prefix>_statistics.png' (when matplotlib is installed),
+                              no display is needed [default=show the results]
+              --image       : A PNG file to write the best layer to in full resolution, straight from the area
+                              matrix (without matplotlib), in the '--color' style [default=no image]
            """ % (
     DEFAULT_WIDTH, DEFAULT_HEIGHT, DEFAULT_NUMBER_OF_BRICKS_TYPES,
     DEFAULT_MAX_BRICK_RIB_SIZE, DEFAULT_GENERATIONS, DEFAULT_POPULATION_SIZE,
-    DEFAULT_MUTATION_THRESHOLD, DEFAULT_VERBOSE, DEFAULT_COLOR_TYPE)
+    DEFAULT_MUTATION_THRESHOLD, DEFAULT_VERBOSE, DEFAULT_COLOR_TYPE,
+    DEFAULT_CROSSOVER.name.lower(), DEFAULT_REPAIR, DEFAULT_ADAPTIVE,
+    DEFAULT_LOCAL_SEARCH, DEFAULT_SEARCH_BUDGET, DEFAULT_SEEDED,
+    DEFAULT_STAGNATION_GENERATIONS, DEFAULT_CHECKPOINT_INTERVAL,
+    DEFAULT_DISPATCH, DEFAULT_HISTORY, DEFAULT_TIMINGS)
 
 HELP_ON_ERROR = "\nIncorrect command!\n" + HELP
 
+Arguments = namedtuple(
+    "Arguments",
+    "width height numberOfBricksTypes maxBrickRibSize populationSize generations "
+    "mutationThreshold verbose colorType seed crossoverType repairChildren adaptiveOperators "
+    "localSearchElites localSearchBudget seededFraction stagnationResponse "
+    "stagnationGenerations timeBudget checkpointPath checkpointInterval resumePath dispatch "
+    "history timings profilePath telemetryPath maxMemory headlessPath imagePath")
+"""
+Arguments holds the parsed command line arguments (see HELP), by the names of their values.
+"""
+
 
 def readArguments(argv):
     width = DEFAULT_WIDTH
@@ -58,10 +152,38 @@ def readArguments(argv):
     mutationThreshold = DEFAULT_MUTATION_THRESHOLD
     verbose = DEFAULT_VERBOSE
     colorType = DEFAULT_COLOR_TYPE
+    seed = DEFAULT_SEED
+    crossoverType = DEFAULT_CROSSOVER
+    repairChildren = DEFAULT_REPAIR
+    adaptiveOperators = DEFAULT_ADAPTIVE
+    localSearchElites = DEFAULT_LOCAL_SEARCH
+    localSearchBudget = DEFAULT_SEARCH_BUDGET
+    seededFraction = DEFAULT_SEEDED
+    stagnationResponse = DEFAULT_STAGNATION
+    stagnationGenerations = DEFAULT_STAGNATION_GENERATIONS
+    timeBudget = DEFAULT_TIME_BUDGET
+    checkpointPath = DEFAULT_CHECKPOINT
+    checkpointInterval = DEFAULT_CHECKPOINT_INTERVAL
+    resumePath = DEFAULT_RESUME
+    dispatch = DEFAULT_DISPATCH
+    history = DEFAULT_HISTORY
+    timings = DEFAULT_TIMINGS
+    profilePath = DEFAULT_PROFILE
+    telemetryPath = DEFAULT_TELEMETRY
+    maxMemory = DEFAULT_MAX_MEMORY
+    headlessPath = DEFAULT_HEADLESS
+    imagePath = DEFAULT_IMAGE
     try:
         opts, args = getopt.getopt(argv, None, [
             "help", "width=", "height=", "types_num=", "max_brick=",
-            "population=", "generations=", "mutation=", "verbose=", "color="
+            "population=", "generations=", "mutation=", "verbose=", "color=",
+            "seed=", "crossover=", "repair=", "adaptive=", "local_search=",
+            "search_budget=", "seeded=", "stagnation=",
+            "stagnation_generations=", "time_budget=", "checkpoint=",
+            "checkpoint_interval=", "resume=", "dispatch=",
+            "history=", "timings=", "profile=",
+            "telemetry=", "max_memory=",
+            "headless=", "image="
         ])
         for opt, arg in opts:
             if opt == "--help":
@@ -85,21 +207,99 @@ def readArguments(argv):
                 verbose = int(arg)
             elif opt == "--color":
                 colorType = int(arg)
-    except getopt.GetoptError:
+            elif opt == "--seed":
+                seed = int(arg)
+            elif opt == "--crossover":
+                crossoverType = GaUtils.Crossovers[arg.upper()]
+            elif opt == "--repair":
+                repairChildren = int(arg) == 1
+            elif opt == "--adaptive":
+                adaptiveOperators = int(arg) == 1
+            elif opt == "--local_search":
+                localSearchElites = int(arg)
+            elif opt == "--search_budget":
+                localSearchBudget = float(arg)
+            elif opt == "--seeded":
+                seededFraction = float(arg)
+            elif opt == "--stagnation":
+                stagnationResponse = None
+                if arg != "none":
+                    stagnationResponse = LegoBrickGA.StagnationResponse[
+                        arg.upper()]
+            elif opt == "--stagnation_generations":
+                stagnationGenerations = int(arg)
+            elif opt == "--time_budget":
+                timeBudget = float(arg)
+            elif opt == "--checkpoint":
+                checkpointPath = arg
+            elif opt == "--checkpoint_interval":
+                checkpointInterval = float(arg)
+            elif opt == "--resume":
+                resumePath = arg
+            elif opt == "--dispatch":
+                dispatch = int(arg)
+            elif opt == "--history":
+                history = int(arg)
+            elif opt == "--timings":
+                timings = int(arg) == 1
+            elif opt == "--profile":
+                profilePath = arg
+            elif opt == "--telemetry":
+                telemetryPath = arg
+            elif opt == "--max_memory":
+                maxMemory = int(float(arg) * 1024 * 1024)
+            elif opt == "--headless":
+                headlessPath = arg
+            elif opt == "--image":
+                imagePath = arg
+    except (getopt.GetoptError, KeyError):
         print(HELP_ON_ERROR)
         sys.exit()
 
     print("\nArguments:")
-    print("width =", width)
-    print("height =", height)
-    if numberOfBricksTypes == -1:
-        print("number of bricks types = default")
+    if resumePath is None:
+        print("width =", width)
+        print("height =", height)
+        if numberOfBricksTypes == -1:
+            print("number of bricks types = default")
+        else:
+            print("number of bricks types =", numberOfBricksTypes)
+        print("max brick rib size =", maxBrickRibSize)
+        print("population size =", populationSize)
+        print("mutation threshold =", mutationThreshold)
+        if seed is None:
+            print("seed = random")
+        else:
+            print("seed =", seed)
+        print("crossover =", crossoverType.name.lower())
+        if repairChildren:
+            print("repair = true")
+        else:
+            print("repair = false")
+        if adaptiveOperators:
+            print("adaptive operators = true")
+        else:
+            print("adaptive operators = false")
+        print("local search elites =", localSearchElites)
+        if localSearchElites > 0:
+            print("local search budget =", localSearchBudget)
+        print("seeded fraction =", seededFraction)
+        if stagnationResponse is None:
+            print("stagnation response = none")
+        else:
+            print("stagnation response =", stagnationResponse.name.lower())
+            print("stagnation generations =", stagnationGenerations)
+        if maxMemory is None:
+            print("max memory = none")
+        else:
+            print("max memory = %.1f MB" % (maxMemory / (1024 * 1024)))
     else:
-        print("number of bricks types =", numberOfBricksTypes)
-    print("max brick rib size =", maxBrickRibSize)
-    print("population size =", populationSize)
+        # the problem arguments of the command line are ignored
+        print("resume from =", resumePath)
+        print("problem arguments = from the checkpoint")
+        if checkpointPath is None:
+            checkpointPath = resumePath
     print("generations =", generations)
-    print("mutation threshold =", mutationThreshold)
     if verbose == 1:
         print("verbose = true")
     else:
@@ -108,8 +308,71 @@ def readArguments(argv):
         print("Color type = discrete")
     else:
         print("color type = gradient")
-
-    return width, height, numberOfBricksTypes, maxBrickRibSize, populationSize, generations, mutationThreshold, verbose, colorType
+    if timeBudget is None:
+        print("time budget = no limit")
+    else:
+        print("time budget =", timeBudget)
+    if checkpointPath is None:
+        print("checkpoint = none")
+    else:
+        print("checkpoint =", checkpointPath)
+        print("checkpoint interval =", checkpointInterval)
+    if dispatch > 0:
+        print("dispatch = every", dispatch, "generations")
+    else:
+        print("dispatch = none")
+    print("statistics history =", history)
+    if timings:
+        print("timings = true")
+    else:
+        print("timings = false")
+    if profilePath is None:
+        print("profile = none")
+    else:
+        print("profile =", profilePath)
+    if telemetryPath is None:
+        print("telemetry = none")
+    else:
+        print("telemetry =", telemetryPath)
+    if headlessPath is None:
+        print("headless = false")
+    else:
+        print("headless =", headlessPath)
+    if imagePath is None:
+        print("image = none")
+    else:
+        print("image =", imagePath)
+
+    return Arguments(width=width,
+                     height=height,
+                     numberOfBricksTypes=numberOfBricksTypes,
+                     maxBrickRibSize=maxBrickRibSize,
+                     populationSize=populationSize,
+                     generations=generations,
+                     mutationThreshold=mutationThreshold,
+                     verbose=verbose,
+                     colorType=colorType,
+                     seed=seed,
+                     crossoverType=crossoverType,
+                     repairChildren=repairChildren,
+                     adaptiveOperators=adaptiveOperators,
+                     localSearchElites=localSearchElites,
+                     localSearchBudget=localSearchBudget,
+                     seededFraction=seededFraction,
+                     stagnationResponse=stagnationResponse,
+                     stagnationGenerations=stagnationGenerations,
+                     timeBudget=timeBudget,
+                     checkpointPath=checkpointPath,
+                     checkpointInterval=checkpointInterval,
+                     resumePath=resumePath,
+                     dispatch=dispatch,
+                     history=history,
+                     timings=timings,
+                     profilePath=profilePath,
+                     telemetryPath=telemetryPath,
+                     maxMemory=maxMemory,
+                     headlessPath=headlessPath,
+                     imagePath=imagePath)
 
 
 def generateBricks(width: int, height: int, numberOfBricksTypes: int,
@@ -131,8 +394,8 @@ def generateBricks(width: int, height: int, numberOfBricksTypes: int,
         maxBrickSize = maxBrickRibSize + 1
         bricks = []
         while len(bricks) < numberOfBricksTypes:
-            width = np.random.randint(1, maxBrickSize)
-            height = np.random.randint(1, maxBrickSize)
+            width = Rng.getGenerator().integers(1, maxBrickSize)
+            height = Rng.getGenerator().integers(1, maxBrickSize)
             if width > height:
                 temp = height
                 height = width
@@ -159,67 +422,220 @@ def generateGa(width: int,
                height: int,
                bricksCollection: LegoBrickCollection,
                populationSize=int,
-               mutationThreshold=float) -> LegoBrickGA:
+               mutationThreshold=float,
+               seed: int = None,
+               crossoverType: GaUtils.Crossovers = DEFAULT_CROSSOVER,
+               repairChildren: bool = DEFAULT_REPAIR,
+               adaptiveOperators: bool = DEFAULT_ADAPTIVE,
+               localSearchElites: int = DEFAULT_LOCAL_SEARCH,
+               localSearchBudget: float = DEFAULT_SEARCH_BUDGET,
+               seededFraction: float = DEFAULT_SEEDED,
+               stagnationResponse: LegoBrickGA.StagnationResponse = DEFAULT_STAGNATION,
+               stagnationGenerations: int = DEFAULT_STAGNATION_GENERATIONS,
+               profile: bool = DEFAULT_TIMINGS,
+               maxMemory: int = DEFAULT_MAX_MEMORY) -> LegoBrickGA:
+    if maxMemory is not None:
+        print("\nEstimated memory of the populations: %.1f MB" %
+              (Memory.estimatePopulationBytes(
+                  width, height, populationSize,
+                  bricksCollection.getAvailableBricksTypes()) /
+               (1024 * 1024)))
     ga = LegoBrickGA(width, height, bricksCollection, populationSize,
-                     mutationThreshold)
+                     mutationThreshold, seed, crossoverType, repairChildren,
+                     adaptiveOperators, localSearchElites, localSearchBudget,
+                     seededFraction, stagnationResponse, stagnationGenerations,
+                     profile=profile,
+                     maxMemory=maxMemory)
     return ga
 
 
 class GaResultHandler(LegoBrickGA.GaResultHandler):
-    def __init__(self):
+    # the columns of the statistics history
+    GENERATION, MAX, MIN, AVERAGE, MEDIAN, SUM = range(6)
+
+    def __init__(self, history: int = DEFAULT_HISTORY):
         super().__init__()
-        self.sum = []
-        self.average = []
-        self.median = []
-        self.max = []
-        self.min = []
+        self.statistics = Statistics.RingBuffer(history, 6)
+        self.runCoverage = None
+        self.profile = None
         self.area = 0
         self.generations = -1
+        self.operators = None
+        self.memory = None
 
     def onGaResult(self, generation: int, population: List[LegoBrickLayout]):
 
         covered = np.array([layout.getCoveredArea() for layout in population],
                            dtype=np.int32)
+        self.__addCoverage(generation,
+                           Statistics.getCoverageStatistics(covered))
 
-        covered = np.sort(covered)
+    def onGaSnapshot(self, snapshot: GenerationSnapshot):
+        self.__addCoverage(snapshot.generation,
+                           snapshot.statistics["coverage"])
+        self.onGaStatistics(snapshot.generation, snapshot.statistics)
 
+    def __addCoverage(self, generation: int,
+                      coverage: Statistics.CoverageStatistics):
         self.generations = max(self.generations, generation)
-        self.sum.append(np.sum(covered))
-        self.average.append(np.average(covered))
-        self.median.append(np.median(covered))
-        self.max.append(covered[len(covered) - 1])
-        self.min.append(covered[0])
+        self.statistics.append([
+            generation, coverage.max, coverage.min, coverage.mean,
+            coverage.median, coverage.sum
+        ])
+
+    def onGaStatistics(self, generation: int, statistics: dict):
+        self.operators = statistics.get("operators", self.operators)
+        self.runCoverage = statistics.get("runCoverage", self.runCoverage)
+        self.profile = statistics.get("profileTotal", self.profile)
+        self.memory = statistics.get("memory", self.memory)
+
+    def getCheckpointState(self) -> object:
+        return {
+            # the kept rows, not the preallocated buffer
+            "statistics": self.statistics.getRows(),
+            "appended": self.statistics.getAppendedAmount(),
+            "runCoverage": self.runCoverage,
+            "profile": self.profile,
+            "generations": self.generations,
+            "operators": self.operators
+        }
+
+    def setCheckpointState(self, state: object):
+        if state is None:
+            return
+        self.statistics.setRows(state["statistics"], state["appended"])
+        self.runCoverage = state["runCoverage"]
+        self.profile = state["profile"]
+        self.generations = state["generations"]
+        self.operators = state["operators"]
+
+
+def printOperatorsStatistics(gaResultHandler: GaResultHandler):
+    print("\nOperators statistics:")
+    print("%12s%10s%10s%10s%12s%12s" % ("operator", "calls", "success",
+                                        "gain", "ms/call", "probability"))
+    for family in ["crossovers", "mutations"]:
+        for name, statistics in gaResultHandler.operators[family].items():
+            print("%12s%10d%9.1f%%%10d%12.3f%12.3f" %
+                  (name.lower(), statistics.calls,
+                   100 * statistics.successes / max(statistics.calls, 1),
+                   statistics.gain,
+                   1000 * statistics.seconds / max(statistics.calls, 1),
+                   statistics.probability))
+
+
+def profileEvolution(ga: LegoBrickGA, profilePath: str,
+                     evolveArguments: dict) -> LegoBrickLayout:
+    # the deterministic profiler counts the calls, and the sampler keeps the
+    # call stacks that the flame graphs are drawn from
+    profiler = cProfile.Profile()
+    sampler = Profiling.StackSampler()
+    sampler.start()
+    profiler.enable()
+    try:
+        return ga.evolveGeneration(**evolveArguments)
+    finally:
+        profiler.disable()
+        sampler.stop()
+        profiler.dump_stats(profilePath + ".pstats")
+        sampler.writeCollapsed(profilePath + ".collapsed")
+        print("\nThe profile was written to '%s.pstats' and '%s.collapsed'" %
+              (profilePath, profilePath))
+        print("\nHot functions of the layout, the collection and the GA utilities:")
+        pstats.Stats(profiler, stream=sys.stdout).sort_stats(
+            "tottime").print_stats(PROFILED_MODULES, PROFILED_FUNCTIONS)
+
+
+def printProfile(gaResultHandler: GaResultHandler):
+    profile = gaResultHandler.profile
+    total = sum(profile.phases.values())
+    print("\nPhases timings of %d generations:" % profile.generations)
+    print("%14s%12s%12s%10s" % ("phase", "seconds", "ms/gen", "share"))
+    for phase, seconds in sorted(
+            profile.phases.items(), key=lambda item: item[1], reverse=True):
+        print("%14s%12.3f%12.3f%9.1f%%" %
+              (phase, seconds, 1000 * seconds / profile.generations,
+               100 * seconds / max(total, 1e-9)))
+    print("\nCounters:")
+    print("%26s%12s%12s" % ("counter", "total", "per gen"))
+    for counter, amount in sorted(profile.counters.items()):
+        print("%26s%12d%12.2f" % (counter, amount,
+                                  amount / profile.generations))
+
+
+def writeResults(resultsPath: str, gaResultHandler: GaResultHandler,
+                 result: LegoBrickLayout, coverageBound: int):
+    np.savetxt(
+        resultsPath + "_statistics.csv",
+        gaResultHandler.statistics.getRows(),
+        fmt=["%d", "%d", "%d", "%.3f", "%.3f", "%d"],
+        delimiter=",",
+        header="generation,max,min,average,median,sum",
+        comments="")
+    runCoverage = gaResultHandler.runCoverage
+    with open(resultsPath + ".json", "w") as file:
+        json.dump(
+            {
+                "width": result.getWidth(),
+                "height": result.getHeight(),
+                "coveredArea": int(result.getCoveredArea()),
+                "coverageBound": int(coverageBound),
+                "generations": gaResultHandler.generations,
+                "runCoverage":
+                None if runCoverage is None else dict(runCoverage._asdict()),
+                # the bricks as [row, column, width, height, orientation]
+                "bricks": [[
+                    int(brick[0]),
+                    int(brick[1]), brick[2].getWidth(), brick[2].getHeight(),
+                    brick[3].name.lower()
+                ] for brick in result.getAreaBricks()]
+            }, file)
+    print("\nThe results were written to '%s_statistics.csv' and '%s.json'" %
+          (resultsPath, resultsPath))
+
+
+def loadPyplot(headless: bool):
+    # matplotlib is imported only for drawing, it takes most of the start time of a run
+    import matplotlib
+    if headless:
+        # draws to files, without a display
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
 
 
 def drawStatisticsPlot(gaResultHandler: GaResultHandler):
-    df = pd.DataFrame({
-        "generation": range(gaResultHandler.generations + 1),
-        "max": gaResultHandler.max,
-        "min": gaResultHandler.min,
-        "avg": gaResultHandler.average,
-        "median": gaResultHandler.median,
-        "sum": gaResultHandler.sum
-    })
+    import matplotlib.pyplot as plt
+
+    statistics = gaResultHandler.statistics.getRows()
+    columns = [
+        GaResultHandler.MAX, GaResultHandler.MIN, GaResultHandler.AVERAGE,
+        GaResultHandler.MEDIAN, GaResultHandler.SUM
+    ]
 
     labels = [
         "Max Coverage", "Min Coverage", "Average Coverage", "Median Coverage",
         "Total Coverage"
     ]
 
-    # Initialize the figure
-    plt.style.use("seaborn-darkgrid")
+    # Initialize the figure, the seaborn styles were renamed in matplotlib 3.6
+    if "seaborn-v0_8-darkgrid" in plt.style.available:
+        plt.style.use("seaborn-v0_8-darkgrid")
+    else:
+        plt.style.use("seaborn-darkgrid")
+    figure = plt.figure()
 
     palette = plt.get_cmap("Set1")
 
     num = 0
-    for column in df.drop("generation", axis=1):
+    for column in columns:
 
         plt.subplot(2, 3, num + 1)
 
         # Plot the lineplot
         plt.plot(
-            df["generation"],
-            df[column],
+            statistics[:, GaResultHandler.GENERATION],
+            statistics[:, column],
             marker="o",
             color=palette(num),
             linewidth=2,
@@ -250,13 +666,21 @@ def drawStatisticsPlot(gaResultHandler: GaResultHandler):
         figManager.window.showMaximized()
     except:
         pass  # ignored
+    return figure
 
 
 def drawResultPlot(drawType: int, data: np.ndarray, covered: int):
-
+    import matplotlib.cm as cm
+    import matplotlib.colors as colors
+    import matplotlib.pyplot as plt
+    import matplotlib.ticker as ticker
+
+    area = data.size
+    # a big board is drawn as a preview, drawing a million cells takes longer than the evolution
+    step = Render.getPreviewStep(data.shape, PREVIEW_SIZE)
+    data = Render.getPreview(data, PREVIEW_SIZE)
     nx, ny = data.shape
     indx, indy = np.arange(nx), np.arange(ny)
-    x, y = np.meshgrid(indx, indy)
 
     fig, ax = plt.subplots()
 
@@ -271,26 +695,32 @@ def drawResultPlot(drawType: int, data: np.ndarray, covered: int):
         # plot grid values
         ax.imshow(data.T, interpolation="nearest", cmap=cm.YlGn)
 
-    cond = nx <= 25 and ny <= 25
-
-    for xval, yval in zip(x.flatten(), y.flatten()):
-        zval = data[xval, yval]
-        if zval == 0 or cond:
+    if nx <= 25 and ny <= 25:
+        x, y = np.meshgrid(indx, indy)
+        for xval, yval in zip(x.flatten(), y.flatten()):
+            zval = data[xval, yval]
             t = "%d" % (zval, )  # format value with 1 decimal point
             c = "w" if zval > 0.75 else "k"  # if dark-green, change text color to white
             ax.text(xval, yval, t, color=c, va="center", ha="center")
 
-    ax.set_xticks(indx + 0.5)
-    ax.set_yticks(indy + 0.5)
     ax.xaxis.tick_top()
-
-    for a, ind in zip((ax.xaxis, ax.yaxis), (indx, indy)):
-        a.set_major_formatter(ticker.NullFormatter())
-        a.set_minor_locator(ticker.FixedLocator(ind))
-
-    # draw gridlines
-    ax.grid(
-        which="major", axis="both", linestyle="-", color="w", linewidth=0.5)
+    if nx <= GRID_SIZE and ny <= GRID_SIZE:
+        ax.set_xticks(indx + 0.5)
+        ax.set_yticks(indy + 0.5)
+
+        for a, ind in zip((ax.xaxis, ax.yaxis), (indx, indy)):
+            a.set_major_formatter(ticker.NullFormatter())
+            a.set_minor_locator(ticker.FixedLocator(ind))
+
+        # draw gridlines
+        ax.grid(
+            which="major",
+            axis="both",
+            linestyle="-",
+            color="w",
+            linewidth=0.5)
+    else:
+        ax.grid(False)
 
     ax.set_xlabel(
         "\nNote!\nInside the cells, there is the brick ID (to identify their shapes), where 0 is uncovered place.\nThe IDs appear only in matrices smaller than 25x25, you can identify uncovered places by their white color.",
@@ -298,8 +728,9 @@ def drawResultPlot(drawType: int, data: np.ndarray, covered: int):
         horizontalalignment='left')
 
     plt.suptitle(
-        "Genetic Algorithm Solution to 2D-LEGO Brick Layout Problem\n\nCoverage %d/%d"
-        % (covered, (nx * ny)),
+        "Genetic Algorithm Solution to 2D-LEGO Brick Layout Problem\n\nCoverage %d/%d%s"
+        % (covered, area,
+           "" if step == 1 else " (a preview of every %d-th cell)" % step),
         fontsize=16,
         color="black",
     )
@@ -310,62 +741,147 @@ def drawResultPlot(drawType: int, data: np.ndarray, covered: int):
         figManager.window.showMaximized()
     except:
         pass  # ignored
+    return fig
 
 
 def main(argv):
-    width, height, numberOfBricksTypes, maxBrickRibSize, populationSize, generations, mutationThreshold, verbose, dispayType = readArguments(
-        argv)
+    arguments = readArguments(argv)
     try:
-
-        bricks = generateBricks(width, height, numberOfBricksTypes,
-                                maxBrickRibSize)
-        collection = generateCollection(width, height, bricks)
-        ga = generateGa(width, height, collection, populationSize,
-                        mutationThreshold)
-        resultHandler = GaResultHandler()
-
-        result = ga.evolveGeneration(
-            nTimes=generations, generationResultHandler=resultHandler)
+        Rng.seed(arguments.seed)
+
+        resultHandler = GaResultHandler(arguments.history)
+        handler = resultHandler
+        dispatcher = None
+        if arguments.dispatch > 0:
+            dispatcher = handler = HandlerDispatcher(
+                resultHandler, decimation=arguments.dispatch)
+        telemetry = None
+        if arguments.telemetryPath is not None:
+            # the telemetry records every generation, also when the statistics are dispatched
+            telemetry = handler = TelemetrySink(
+                arguments.telemetryPath, generationResultHandler=handler)
+        if arguments.resumePath is None:
+            bricks = generateBricks(arguments.width, arguments.height,
+                                    arguments.numberOfBricksTypes,
+                                    arguments.maxBrickRibSize)
+            collection = generateCollection(arguments.width, arguments.height,
+                                            bricks)
+            ga = generateGa(
+                arguments.width, arguments.height, collection,
+                arguments.populationSize, arguments.mutationThreshold,
+                arguments.seed, arguments.crossoverType,
+                arguments.repairChildren, arguments.adaptiveOperators,
+                arguments.localSearchElites, arguments.localSearchBudget,
+                arguments.seededFraction, arguments.stagnationResponse,
+                arguments.stagnationGenerations, arguments.timings
+                or arguments.telemetryPath is not None, arguments.maxMemory)
+        else:
+            ga = LegoBrickGA.loadCheckpoint(arguments.resumePath, handler)
+            print("\nResumed the evolution after", resultHandler.generations,
+                  "generations.")
+
+        evolveArguments = {
+            "nTimes": arguments.generations,
+            "generationResultHandler": handler,
+            "timeBudget": arguments.timeBudget,
+            "checkpointPath": arguments.checkpointPath,
+            "checkpointInterval": arguments.checkpointInterval
+        }
+        if arguments.profilePath is None:
+            result = ga.evolveGeneration(**evolveArguments)
+        else:
+            result = profileEvolution(ga, arguments.profilePath,
+                                      evolveArguments)
+        if telemetry is not None:
+            telemetry.close()
+        if dispatcher is not None:
+            dispatcher.close()
 
         if result.getCoveredArea() == result.getWidth() * result.getHeight():
             print("\nFound an optimal solution, a full coverage after",
                   resultHandler.generations, " generations!")
+        elif result.getCoveredArea() >= ga.getCoverageBound():
+            print(
+                "\nFound an optimal solution, the bricks can't cover more than",
+                ga.getCoverageBound(), "after", resultHandler.generations,
+                " generations!")
         print("\nBest layer cover %d from %d after %d generations" %
               (result.getCoveredArea(),
                (result.getWidth() * result.getHeight()),
                resultHandler.generations))
+        print("Coverage upper bound %d (%.2f%% reached)" %
+              (ga.getCoverageBound(),
+               100.0 * result.getCoveredArea() / max(ga.getCoverageBound(), 1)))
 
         # decrease the IDs to display:
-        resMat = result.getAreaMatrix()
-        index = 50
-        mapping = {}
-        for i in range(resMat.shape[0]):
-            for j in range(resMat.shape[1]):
-                if resMat[i][j] == 0:
-                    continue
-                mapped = mapping.get(resMat[i][j])
-                if mapped is None:
-                    mapping[resMat[i][j]] = index
-                    resMat[i][j] = index
-                    index += 1
-                else:
-                    resMat[i][j] = mapped
-
-        if (verbose):
-            print("\nBest Coverage:")
-            for i in range(result.getWidth()):
-                print("".join(("%5d" % x) for x in resMat[i]))
+        resMat = Render.remapIds(result.getAreaMatrix(), 50)
+
+        if resultHandler.runCoverage is not None:
+            print(
+                "Coverage of all the generations: max %d, min %d, average %.2f, median %.2f"
+                % (resultHandler.runCoverage.max,
+                   resultHandler.runCoverage.min,
+                   resultHandler.runCoverage.mean,
+                   resultHandler.runCoverage.median))
+
+        if resultHandler.memory is not None:
+            print(
+                "Memory of the population: %d layers of ~%d bytes, ~%.1f MB" %
+                (resultHandler.memory.layers,
+                 resultHandler.memory.bytesPerLayer,
+                 resultHandler.memory.totalBytes / (1024 * 1024)))
+
+        if arguments.verbose and resultHandler.operators is not None:
+            printOperatorsStatistics(resultHandler)
+
+        if arguments.timings and resultHandler.profile is not None:
+            printProfile(resultHandler)
 
-        drawStatisticsPlot(resultHandler)
-        drawResultPlot(dispayType, resMat, result.getCoveredArea())
-        plt.show()
+        if (arguments.verbose):
+            print("\nBest Coverage:")
+            if max(resMat.shape) <= PRINT_SIZE:
+                np.savetxt(sys.stdout, resMat, fmt="%5d", delimiter="")
+            else:
+                print("The board is too big to print, write it to an image with --image.")
+
+        if arguments.imagePath is not None:
+            Render.writeImage(arguments.imagePath,
+                              resMat,
+                              gradient=arguments.colorType != 1,
+                              scale=max(1, IMAGE_SIZE // max(resMat.shape)))
+            print("\nThe best layer was written to '%s'" % arguments.imagePath)
+
+        if arguments.headlessPath is None:
+            plt = loadPyplot(False)
+            drawStatisticsPlot(resultHandler)
+            drawResultPlot(arguments.colorType, resMat,
+                           result.getCoveredArea())
+            plt.show()
+        else:
+            writeResults(arguments.headlessPath, resultHandler, result,
+                         ga.getCoverageBound())
+            try:
+                loadPyplot(True)
+            except ImportError:
+                print("matplotlib isn't installed, the plots weren't drawn.")
+            else:
+                # the figures are sized for a maximized window
+                figure = drawStatisticsPlot(resultHandler)
+                figure.set_size_inches(16, 9)
+                figure.savefig(arguments.headlessPath + "_statistics.png")
+                figure = drawResultPlot(arguments.colorType, resMat,
+                                        result.getCoveredArea())
+                figure.set_size_inches(12, 12)
+                figure.savefig(arguments.headlessPath + ".png")
+                print("The plots were written to '%s.png' and '%s_statistics.png'"
+                      % (arguments.headlessPath, arguments.headlessPath))
     except KeyboardInterrupt:
         print("\n\nProcess aborted by the user!")
     except Exception as e:
         print(
         )  # There is a chance that there was a exception in the middle of progress bar
         print("Some error occurred during the running! Process aborted..")
-        if (verbose):
+        if (arguments.verbose):
             print("\nError:", str(e))
             traceback.print_tb(e.__traceback__)
         else:
@@ -0,0 +1,32 @@
+# bounds_test.py
+
+import unittest
+
+import lego.bounds as Bounds
+import test.fixtures as Fixtures
+from lego.brick import LegoBrick
+
+
+class Bounds_Test(unittest.TestCase):
+    def test_inventoryArea(self):
+        # 11 bricks of every type, 11 * (1 + 2 + 6) = 99 < 12 * 12
+        collection = Fixtures.createCollection(100)
+        self.assertEqual(99, Bounds.getCoverageBound(12, 12, collection))
+
+    def test_layerArea(self):
+        # 2 bricks of 3 cells can't cover 5 cells, but 1 of them and a single cell can
+        collection = Fixtures.createCollection(
+            8, [LegoBrick(1, 1), LegoBrick(1, 3)])
+        self.assertEqual(5, Bounds.getCoverageBound(1, 5, collection))
+
+        collection = Fixtures.createCollection(6, [LegoBrick(1, 3)])
+        self.assertEqual(3, Bounds.getCoverageBound(1, 5, collection))
+
+    def test_notFittingBricks(self):
+        collection = Fixtures.createCollection(
+            10, [LegoBrick(1, 1), LegoBrick(1, 4)])
+        self.assertEqual(2, Bounds.getCoverageBound(1, 3, collection))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -162,6 +162,28 @@ class LegoBrickCollection_Test(unittest.TestCase):
         col.initialize(10, list([LegoBrick(1, 1)]))
         self.assertIsNotNone(col.getBrick(1, 1))
         self.assertIsNone(col.getBrick(2, 1))
+        self.assertEqual(9, col.getAmountOfAvailableBricks())
+
+    def test_availableBricksTypes(self):
+        col = LegoBrickCollection()
+        col.initialize(3, list([LegoBrick(1, 2), LegoBrick(1, 1)]))
+        self.assertEqual([1, 2], [
+            brick.getArea() for brick in col.getAvailableBricksTypes()
+        ])
+        self.assertIsNotNone(col.getBrick(1, 1))
+        self.assertEqual(
+            [2], [brick.getArea() for brick in col.getAvailableBricksTypes()])
+        self.assertIsNotNone(col.getBrick(1, 2))
+        self.assertEqual([], col.getAvailableBricksTypes())
+
+    def test_availableBricksAmounts(self):
+        col = LegoBrickCollection()
+        col.initialize(6, list([LegoBrick(1, 2), LegoBrick(1, 1)]))
+        self.assertEqual([2, 2], col.getAvailableBricksAmounts())
+        self.assertIsNotNone(col.getBrick(1, 1))
+        self.assertEqual([1, 2], col.getAvailableBricksAmounts())
+        self.assertIsNotNone(col.getBrick(1, 1))
+        self.assertEqual([2], col.getAvailableBricksAmounts())
 
     def test_returnBrick(self):
         col = LegoBrickCollection()
@@ -0,0 +1,74 @@
+# dispatch_test.py
+
+import threading
+import unittest
+
+import test.fixtures as Fixtures
+from lego.dispatch import HandlerDispatcher
+
+
+class HandlerDispatcher_Test(unittest.TestCase):
+    def test_wrongInitialization(self):
+        with self.assertRaises(TypeError):
+            HandlerDispatcher(None)
+        with self.assertRaises(ValueError):
+            HandlerDispatcher(Fixtures.RecordingHandler(), queueSize=0)
+        with self.assertRaises(ValueError):
+            HandlerDispatcher(Fixtures.RecordingHandler(), decimation=0)
+
+    def test_decimation(self):
+        handler = Fixtures.RecordingHandler()
+        ga = Fixtures.createGa()
+        with HandlerDispatcher(handler, decimation=3) as dispatcher:
+            best = ga.evolveGeneration(10, dispatcher)
+        self.assertEqual([0, 3, 6, 9, 10],
+                         [snapshot.generation for snapshot in handler.snapshots])
+        for snapshot in handler.snapshots:
+            self.assertIsNone(snapshot.population)
+            self.assertEqual(10, len(snapshot.coverages))
+            self.assertEqual(snapshot.bestCoverage,
+                             snapshot.best.getCoveredArea())
+        # the evolution passes compact snapshots to the dispatcher
+        self.assertFalse(dispatcher.needsPopulation())
+        self.assertIs(best, handler.snapshots[-1].best)
+
+        with self.assertRaises(ValueError):
+            dispatcher.onGaSnapshot(handler.snapshots[-1])
+
+    def test_dropOldest(self):
+        event = threading.Event()
+        handler = Fixtures.RecordingHandler(lambda _: event.wait())
+        dispatcher = HandlerDispatcher(handler, queueSize=2)
+        snapshots = list(Fixtures.createGa().iterGenerations(5))
+        for snapshot in snapshots:
+            dispatcher.onGaSnapshot(snapshot)
+        event.set()
+        dispatcher.close()
+
+        received = [snapshot.generation for snapshot in handler.snapshots]
+        self.assertEqual(len(snapshots), len(received) +
+                         dispatcher.getDroppedAmount())
+        self.assertGreater(dispatcher.getDroppedAmount(), 0)
+        self.assertEqual([4, 5], received[-2:])
+
+    def test_checkpointState(self):
+        handler = Fixtures.RecordingHandler()
+        dispatcher = HandlerDispatcher(handler)
+        for snapshot in Fixtures.createGa().iterGenerations(3):
+            dispatcher.onGaSnapshot(snapshot)
+            self.assertEqual(list(range(snapshot.generation + 1)),
+                             dispatcher.getCheckpointState())
+        dispatcher.close()
+
+    def test_handlerError(self):
+        def fail(snapshot):
+            raise RuntimeError("handler failed")
+
+        dispatcher = HandlerDispatcher(Fixtures.RecordingHandler(fail))
+        Fixtures.createGa().evolveGeneration(2, dispatcher)
+        with self.assertRaises(RuntimeError):
+            dispatcher.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
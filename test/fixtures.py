@@ -0,0 +1,130 @@
+# fixtures.py
+
+from typing import Callable, List
+
+from lego.brick import LegoBrick
+from lego.collection import LegoBrickCollection
+from lego.exceptions import NotInitializedException
+from lego.ga import GenerationSnapshot, LegoBrickGA
+
+
+def createBricks() -> List[LegoBrick]:
+    """
+    The method creates the brick types of the tests: 1x1, 1x2 and 2x3.
+
+    Returns
+    ----------
+    List[LegoBrick]
+        The brick types.
+    """
+    return [LegoBrick(1, 1), LegoBrick(1, 2), LegoBrick(2, 3)]
+
+
+def createCollection(area: int,
+                     bricks: List[LegoBrick] = None) -> LegoBrickCollection:
+    """
+    The method creates a uniform collection of bricks.
+
+    Parameters
+    ----------
+    area : int
+        The area that the collection covers.
+    bricks : List[LegoBrick] [default = None]
+        The brick types, None for the brick types of the tests (see createBricks()).
+
+    Returns
+    ----------
+    LegoBrickCollection
+        The initialized collection.
+
+    Raises
+    ------
+    NotInitializedException
+        If the collection can't be initialized.
+    """
+    collection = LegoBrickCollection()
+    collection.initialize(area,
+                          createBricks() if bricks is None else bricks,
+                          uniform=True)
+    if not collection.isInitialized():
+        raise NotInitializedException(
+            "Failed on try to initialize LegoBrickCollection")
+    return collection
+
+
+def createGa(width: int = 8,
+             height: int = 8,
+             seed: int = 7,
+             **kwargs) -> LegoBrickGA:
+    """
+    The method creates a genetic algorithm of a population of 10 layers with a mutation
+    threshold of 0.5, over a collection of the brick types of the tests that covers the board.
+
+    Parameters
+    ----------
+    width : int [default = 8]
+        The width of the board.
+    height : int [default = 8]
+        The height of the board.
+    seed : int [default = 7]
+        The seed of the genetic algorithm.
+    **kwargs
+        The other arguments of the genetic algorithm.
+
+    Returns
+    ----------
+    LegoBrickGA
+        The genetic algorithm.
+    """
+    return LegoBrickGA(width,
+                       height,
+                       createCollection(width * height),
+                       10,
+                       0.5,
+                       seed=seed,
+                       **kwargs)
+
+
+class RecordingHandler(LegoBrickGA.GaResultHandler):
+    """
+    A result handler that records what it receives: the snapshots, the generation numbers,
+    the population sizes and the statistics of every generation.
+    Its checkpoint state is the recorded generation numbers.
+    """
+
+    def __init__(self,
+                 callback: Callable[[GenerationSnapshot], None] = None):
+        """
+        RecordingHandler constructor.
+
+        Parameters
+        ----------
+        callback : Callable[[GenerationSnapshot], None] [default = None]
+            Called with every snapshot before it is recorded (e.g. to block or to fail
+            the handler), None for no callback.
+        """
+        super(RecordingHandler, self).__init__()
+        self.callback = callback
+        self.snapshots = []
+        self.generations = []
+        self.populationSizes = []
+        self.statistics = []
+
+    def onGaSnapshot(self, snapshot: GenerationSnapshot):
+        if self.callback is not None:
+            self.callback(snapshot)
+        self.snapshots.append(snapshot)
+        super(RecordingHandler, self).onGaSnapshot(snapshot)
+
+    def onGaResult(self, generation: int, population):
+        self.generations.append(generation)
+        self.populationSizes.append(len(population))
+
+    def onGaStatistics(self, generation: int, statistics: dict):
+        self.statistics.append(statistics)
+
+    def getCheckpointState(self) -> object:
+        return list(self.generations)
+
+    def setCheckpointState(self, state: object):
+        self.generations = list(state)
@@ -0,0 +1,81 @@
+# ga_async_test.py
+
+import asyncio
+import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import lego.ga_async as GaAsync
+import test.fixtures as Fixtures
+from lego.ga import LegoBrickGA
+
+
+class GaAsync_Test(unittest.TestCase):
+    def test_evolveGeneration(self):
+        expected = Fixtures.createGa().evolveGeneration(5)
+        result = asyncio.run(
+            GaAsync.evolveGeneration(Fixtures.createGa(), 5))
+        self.assertTrue(expected.hasSameCoverage(result))
+
+    def test_sharedExecutor(self):
+        expected = [
+            Fixtures.createGa(seed=seed).evolveGeneration(3)
+            for seed in [1, 2, 3]
+        ]
+
+        async def runAll():
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                return await asyncio.gather(*[
+                    GaAsync.evolveGeneration(
+                        Fixtures.createGa(seed=seed), 3,
+                        executor=executor) for seed in [1, 2, 3]
+                ])
+
+        results = asyncio.run(runAll())
+        for first, second in zip(expected, results):
+            self.assertTrue(first.hasSameCoverage(second))
+
+    def test_processExecutor(self):
+        async def collect(ga, executor):
+            return [
+                snapshot async for snapshot in GaAsync.iterGenerations(
+                    ga, 7, executor=executor, chunkSize=2)
+            ]
+
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            # the second evolution stops at the end of a chunk
+            for seed, response in [(7, None),
+                                   (8, LegoBrickGA.StagnationResponse.STOP)]:
+                expected = list(
+                    Fixtures.createGa(
+                        seed=seed,
+                        stagnationResponse=response,
+                        stagnationGenerations=2).iterGenerations(7))
+                snapshots = asyncio.run(
+                    collect(
+                        Fixtures.createGa(seed=seed,
+                                          stagnationResponse=response,
+                                          stagnationGenerations=2), executor))
+                self.assertEqual([item.generation for item in expected],
+                                 [item.generation for item in snapshots])
+                for first, second in zip(expected, snapshots):
+                    self.assertEqual(first.bestCoverage, second.bestCoverage)
+                    self.assertTrue(first.best.hasSameCoverage(second.best))
+
+    def test_cancel(self):
+        async def runAndCancel():
+            started = asyncio.Event()
+            handler = Fixtures.RecordingHandler(lambda _: started.set())
+            task = asyncio.ensure_future(
+                GaAsync.evolveGeneration(
+                    Fixtures.createGa(), 10000, handler))
+            await started.wait()
+            task.cancel()
+            return handler, await task
+
+        handler, result = asyncio.run(runAndCancel())
+        self.assertIsNotNone(result)
+        self.assertLess(len(handler.generations), 10000)
+
+
+if __name__ == '__main__':
+    unittest.main()
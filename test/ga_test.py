@@ -0,0 +1,156 @@
+# ga_test.py
+
+import os
+import pickle
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import lego.ga_utils as GaUtils
+import test.fixtures as Fixtures
+from lego.ga import LegoBrickGA
+
+
+class LegoBrickGA_Test(unittest.TestCase):
+    def test_seededRunsAreIdentical(self):
+        first = Fixtures.createGa(seed=7).evolveGeneration(5)
+        second = Fixtures.createGa(seed=7).evolveGeneration(5)
+        self.assertTrue(
+            first.hasSameCoverage(second),
+            "Two runs with the same seed have to give the same result")
+        self.assertTrue((first.getAreaMatrix() != 0).tolist() == (
+            second.getAreaMatrix() != 0).tolist())
+
+    def test_saturatedPopulation(self):
+        # the guillotine children of small boards are often duplicates, the
+        # generations have to end anyway
+        result = Fixtures.createGa(
+            seed=3,
+            crossoverType=GaUtils.Crossovers.GUILLOTINE).evolveGeneration(3)
+        self.assertIsNotNone(result)
+
+    def test_stagnationResponses(self):
+        for response in LegoBrickGA.StagnationResponse:
+            handler = Fixtures.RecordingHandler()
+            result = Fixtures.createGa(
+                seed=3,
+                stagnationResponse=response,
+                stagnationGenerations=1).evolveGeneration(5, handler)
+            self.assertIsNotNone(result)
+            self.assertEqual([10], list(set(handler.populationSizes)))
+            stagnations = handler.statistics[-1]["stagnation"]["stagnations"]
+            self.assertGreaterEqual(stagnations, 1)
+            if response == LegoBrickGA.StagnationResponse.STOP:
+                self.assertEqual(1, stagnations)
+                self.assertLess(len(handler.populationSizes), 6)
+
+    def test_iterGenerations(self):
+        generations = []
+        for snapshot in Fixtures.createGa(seed=7).iterGenerations(10):
+            generations.append(snapshot.generation)
+            self.assertIsNone(snapshot.population)
+            self.assertEqual(snapshot.bestCoverage,
+                             snapshot.best.getCoveredArea())
+            self.assertLessEqual(snapshot.meanCoverage, snapshot.bestCoverage)
+            self.assertIn("coverageBound", snapshot.statistics)
+            self.assertEqual(snapshot.bestCoverage,
+                             snapshot.statistics["coverage"].max)
+            self.assertEqual(10 * (snapshot.generation + 1),
+                             snapshot.statistics["runCoverage"].count)
+            if snapshot.generation == 2:
+                break
+        self.assertEqual([0, 1, 2], generations)
+
+        snapshots = list(
+            Fixtures.createGa(seed=7).iterGenerations(
+                2, includePopulation=True))
+        for snapshot in snapshots:
+            self.assertEqual(10, len(snapshot.population))
+            self.assertEqual(snapshot.bestCoverage,
+                             max(layout.getCoveredArea()
+                                 for layout in snapshot.population))
+
+        result = Fixtures.createGa(seed=7).evolveGeneration(2)
+        self.assertTrue(result.hasSameCoverage(snapshots[-1].best))
+
+    def test_timeBudget(self):
+        handler = Fixtures.RecordingHandler()
+        Fixtures.createGa(seed=7).evolveGeneration(
+            100, handler, timeBudget=0.0)
+        self.assertEqual([0], handler.generations)
+
+        handler = Fixtures.RecordingHandler()
+        Fixtures.createGa(seed=7).evolveGeneration(
+            3, handler, deadline=time.monotonic() + 60.0)
+        self.assertEqual(3, handler.generations[-1])
+
+    def test_checkpoint(self):
+        expected = [
+            snapshot.bestCoverage
+            for snapshot in Fixtures.createGa(seed=7).iterGenerations(6)
+        ]
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "ga.checkpoint")
+            handler = Fixtures.RecordingHandler()
+            Fixtures.createGa(seed=7).evolveGeneration(
+                3, handler, checkpointPath=path)
+            self.assertTrue(os.path.isfile(path))
+            self.assertFalse(os.path.exists(path + ".tmp"))
+
+            handler = Fixtures.RecordingHandler()
+            ga = LegoBrickGA.loadCheckpoint(path, handler)
+            self.assertEqual([0, 1, 2, 3], handler.generations)
+            resumed = [
+                snapshot.bestCoverage
+                for snapshot in ga.iterGenerations(6)
+            ]
+            # the resumed run starts from the generation of the checkpoint
+            self.assertEqual(expected[len(expected) - len(resumed):], resumed)
+            self.assertEqual(7, len(expected))
+            self.assertEqual(4, len(resumed))
+
+            # a caller that stops in the middle of the iteration
+            generations = Fixtures.createGa(seed=7).iterGenerations(
+                6, checkpointPath=path)
+            for snapshot in generations:
+                if snapshot.generation == 2:
+                    break
+            generations.close()
+            resumed = [(snapshot.generation, snapshot.bestCoverage)
+                       for snapshot in LegoBrickGA.loadCheckpoint(
+                           path).iterGenerations(6)]
+            self.assertEqual(list(enumerate(expected))[2:], resumed)
+
+            # the user interrupts the evolution in the middle of generation 3
+            os.remove(path)
+            handler = Fixtures.RecordingHandler()
+            evolvePairs = GaUtils.evolvePairs
+
+            def interruptedEvolvePairs(*args, **kwargs):
+                if handler.generations[-1] == 2:
+                    raise KeyboardInterrupt()
+                return evolvePairs(*args, **kwargs)
+
+            with mock.patch.object(GaUtils, "evolvePairs",
+                                   interruptedEvolvePairs):
+                Fixtures.createGa(seed=7).evolveGeneration(
+                    6, handler, checkpointPath=path, checkpointInterval=1000)
+            self.assertEqual([0, 1, 2], handler.generations)
+            handler = Fixtures.RecordingHandler()
+            resumed = list(
+                LegoBrickGA.loadCheckpoint(path, handler).iterGenerations(6))
+            self.assertEqual([0, 1, 2], handler.generations)
+            self.assertEqual([2, 3, 4, 5, 6],
+                             [snapshot.generation for snapshot in resumed])
+            self.assertEqual(expected[2], resumed[0].bestCoverage)
+
+            with open(path, "wb") as file:
+                pickle.dump({"version": 0}, file)
+            with self.assertRaises(ValueError):
+                LegoBrickGA.loadCheckpoint(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
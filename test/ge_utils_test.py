@@ -1,7 +1,10 @@
 # brick_test.py
 
+import time
 import unittest
 
+import numpy as np
+
 import lego.ga_utils as GaUtils
 from lego.brick import LegoBrick
 from lego.collection import LegoBrickCollection
@@ -85,6 +88,29 @@ class GaUtils_Test(unittest.TestCase):
         for _ in range(GaUtils_Test.__manyTestValue):
             self.test_addMutation()
 
+    def test_slideMutation(self):
+        for snap in [False, True]:
+            layout = self.__createBrickLayout(5, 5)
+            copy = layout.copy()
+            sizeBeforeMutation = len(layout.getAreaBricks())
+            if GaUtils.slideMutation(layout, snap):
+                self.assertFalse(
+                    copy.hasSameCoverage(layout),
+                    "Coverage should be different after slide mutation")
+            else:
+                self.assertTrue(
+                    copy.hasSameCoverage(layout),
+                    "Coverage should be the same if slide mutation failed")
+            self.assertEqual(sizeBeforeMutation, len(layout.getAreaBricks()))
+            self.assertEqual(copy.getCoveredArea(), layout.getCoveredArea())
+            self.assertEqual(
+                np.count_nonzero(layout.getAreaMatrix()),
+                layout.getCoveredArea())
+
+    def test_manySlideMutation(self):
+        for _ in range(GaUtils_Test.__manyTestValue):
+            self.test_slideMutation()
+
     def test_removeMutation(self):
         layout = self.__createBrickLayout(5, 5)
         copy = layout.copy()
@@ -109,6 +135,133 @@ class GaUtils_Test(unittest.TestCase):
         for _ in range(GaUtils_Test.__manyTestValue):
             self.test_removeMutation()
 
+    def test_guillotineCrossover(self):
+        first = self.__createBrickLayout(6, 6)
+        second = self.__createBrickLayout(6, 6)
+        commonCuts = len(
+            np.intersect1d(first.getFreeRowCuts(),
+                           second.getFreeRowCuts())) + len(
+                               np.intersect1d(first.getFreeColumnCuts(),
+                                              second.getFreeColumnCuts()))
+        children = GaUtils.guillotineCrossover(first, second)
+        self.assertIsNotNone(children)
+        for child in children:
+            self.assertEqual(
+                np.count_nonzero(child.getAreaMatrix()),
+                child.getCoveredArea())
+            self.assertEqual(
+                sum(brick[2].getArea() for brick in child.getAreaBricks()),
+                child.getCoveredArea())
+        if commonCuts > 0:
+            self.assertEqual(
+                first.getCoveredArea() + second.getCoveredArea(),
+                children[0].getCoveredArea() + children[1].getCoveredArea())
+
+    def test_manyGuillotineCrossover(self):
+        for _ in range(GaUtils_Test.__manyTestValue):
+            self.test_guillotineCrossover()
+
+    def test_guillotineCrossoverOnRandomLayers(self):
+        for _ in range(GaUtils_Test.__manyTestValue):
+            first = self.__createBrickLayout(25, 25)
+            second = self.__createBrickLayout(25, 25)
+            children = GaUtils.guillotineCrossover(first, second)
+            self.assertIsNotNone(children)
+            for child in children:
+                self.assertEqual(
+                    np.count_nonzero(child.getAreaMatrix()),
+                    child.getCoveredArea())
+                self.assertEqual(
+                    sum(brick[2].getArea()
+                        for brick in child.getAreaBricks()),
+                    child.getCoveredArea())
+
+    def test_bandCrossover(self):
+        # the crossover may fail on some parents, but not on all of them
+        succeeded = 0
+        for _ in range(GaUtils_Test.__manyTestValue):
+            first = self.__createBrickLayout(6, 6)
+            second = self.__createBrickLayout(6, 6)
+            children = GaUtils.bandCrossover(first, second)
+            if children is None:
+                continue
+            succeeded += 1
+            for child in children:
+                self.assertEqual(
+                    np.count_nonzero(child.getAreaMatrix()),
+                    child.getCoveredArea())
+                self.assertEqual(
+                    sum(brick[2].getArea()
+                        for brick in child.getAreaBricks()),
+                    child.getCoveredArea())
+            self.assertEqual(
+                first.getCoveredArea() + second.getCoveredArea(),
+                children[0].getCoveredArea() + children[1].getCoveredArea())
+        self.assertGreater(succeeded, 0)
+
+    def test_manyBandCrossover(self):
+        for _ in range(GaUtils_Test.__manyTestValue):
+            self.test_bandCrossover()
+
+    def test_repair(self):
+        layout = self.__createBrickLayout(5, 5)
+        self.assertEqual(0, GaUtils.repair(layout))
+        coveredBefore = layout.getCoveredArea()
+        brickToRemove = layout.getAreaBricks()[0]
+        self.assertTrue(layout.removeBrick(brickToRemove))
+        self.assertTrue(layout.getCollection().returnBrick(brickToRemove[2]))
+        self.assertIsNotNone(layout.getChangedArea())
+
+        added = GaUtils.repair(layout)
+        self.assertIsNone(layout.getChangedArea())
+        self.assertGreaterEqual(added, brickToRemove[2].getArea())
+        self.assertGreaterEqual(layout.getCoveredArea(), coveredBefore)
+        self.assertEqual(
+            np.count_nonzero(layout.getAreaMatrix()), layout.getCoveredArea())
+
+    def test_manyRepair(self):
+        for _ in range(GaUtils_Test.__manyTestValue):
+            self.test_repair()
+
+    def test_mutateBatch(self):
+        layouts = [self.__createBrickLayout(5, 5) for _ in range(8)]
+        copies = [layout.copy() for layout in layouts]
+        GaUtils.mutateBatch(0.0, layouts)
+        for layout, copy in zip(layouts, copies):
+            self.assertTrue(copy.hasSameCoverage(layout))
+
+        GaUtils.mutateBatch(1.0, layouts)
+        for layout in layouts:
+            self.assertEqual(
+                np.count_nonzero(layout.getAreaMatrix()),
+                layout.getCoveredArea())
+
+    def test_manyMutateBatch(self):
+        for _ in range(GaUtils_Test.__manyTestValue):
+            self.test_mutateBatch()
+
+    def test_localSearch(self):
+        layout = self.__createBrickLayout(6, 6)
+        GaUtils.removeMutation(layout)
+        coveredBefore = layout.getCoveredArea()
+        bricksBefore = len(layout.getAreaBricks()) + layout.getCollection(
+        ).getAmountOfAvailableBricks()
+        gain = GaUtils.localSearch(layout, time.monotonic() + 1.0)
+        self.assertGreaterEqual(gain, 0)
+        self.assertEqual(coveredBefore + gain, layout.getCoveredArea())
+        self.assertEqual(
+            np.count_nonzero(layout.getAreaMatrix()), layout.getCoveredArea())
+        self.assertEqual(
+            bricksBefore,
+            len(layout.getAreaBricks()) +
+            layout.getCollection().getAmountOfAvailableBricks())
+
+        self.assertEqual(0, GaUtils.localSearch(layout, 0.0))
+
+    def test_manyLocalSearch(self):
+        for _ in range(GaUtils_Test.__manyTestValue):
+            self.test_localSearch()
+
     def __createBrickLayout(self, width: int, height: int) -> LegoBrickLayout:
         bricks = []
         bricks.append(LegoBrick(1, 1))
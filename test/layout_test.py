@@ -1,5 +1,6 @@
 # brick_test.py
 
+import pickle
 import unittest
 
 from lego.brick import LegoBrick
@@ -123,6 +124,123 @@ class LegoBrickLayout_Test(unittest.TestCase):
             layout.hasSameCoverage(copy),
             "The coverage of the layout have to be the same")
 
+    def test_freeCuts(self):
+        collection = LegoBrickCollection()
+        collection.initialize(4, [LegoBrick(1, 2)], uniform=True)
+        layout = LegoBrickLayout()
+        layout.initialize(4, 4, collection)
+        for brick in list(layout.getAreaBricks()):
+            self.assertTrue(layout.removeBrick(brick))
+        self.assertEqual(0, layout.getCoveredArea())
+        self.assertEqual([1, 2, 3], layout.getFreeRowCuts().tolist())
+        self.assertEqual([1, 2, 3], layout.getFreeColumnCuts().tolist())
+
+        self.assertTrue(
+            layout.tryAddBrick(1, 0, LegoBrick(1, 2, 1),
+                               LegoBrickLayout.Orientation.HORIZONTAL))
+        self.assertEqual([1, 3], layout.getFreeRowCuts().tolist())
+        self.assertEqual([1, 2, 3], layout.getFreeColumnCuts().tolist())
+
+        copy = layout.copy()
+        brick = layout.getAreaBricks()[0]
+        self.assertTrue(layout.removeBrick(brick))
+        self.assertFalse(layout.removeBrick(brick))
+        self.assertEqual([1, 2, 3], layout.getFreeRowCuts().tolist())
+        self.assertEqual([1, 3], copy.getFreeRowCuts().tolist())
+        self.assertTrue(copy.validateLayer())
+        self.assertEqual([1, 3], copy.getFreeRowCuts().tolist())
+
+    def test_bricksInArea(self):
+        width = 8
+        height = 8
+        layout = LegoBrickLayout()
+        layout.initialize(width, height,
+                          self.__createBrickCollection(width * height))
+        for row, column, rowEnd, columnEnd in [(0, 0, 8, 8), (2, 3, 5, 4),
+                                               (7, 7, 8, 8), (4, 0, 5, 8)]:
+            expected = []
+            for brick in layout.getAreaBricks():
+                ids = layout.getAreaMatrix()[row:rowEnd, column:columnEnd]
+                if brick[2].getId() in ids:
+                    expected.append(brick)
+            self.assertEqual(
+                expected,
+                layout.getBricksInArea(row, column, rowEnd, columnEnd))
+
+    def test_slideDistances(self):
+        collection = LegoBrickCollection()
+        collection.initialize(1, [LegoBrick(1, 1)], uniform=True)
+        layout = LegoBrickLayout()
+        layout.initialize(6, 5, collection)
+        for brick in list(layout.getAreaBricks()):
+            layout.removeBrick(brick)
+
+        self.assertTrue(
+            layout.tryAddBrick(2, 1, LegoBrick(2, 3, 1),
+                               LegoBrickLayout.Orientation.HORIZONTAL))
+        self.assertTrue(layout.tryAddBrick(0, 2, LegoBrick(1, 1, 2)))
+        self.assertTrue(layout.tryAddBrick(3, 4, LegoBrick(1, 1, 3)))
+        brick = layout.getBricksInArea(2, 1, 3, 2)[0]
+        self.assertEqual((1, 1, 1, 1), layout.getSlideDistances(brick))
+
+    def test_transaction(self):
+        width = 6
+        height = 6
+        layout = LegoBrickLayout()
+        layout.initialize(width, height,
+                          self.__createBrickCollection(width * height))
+        copy = layout.copy()
+
+        layout.beginTransaction()
+        for brick in list(layout.getAreaBricks())[::2]:
+            self.assertTrue(layout.removeBrick(brick))
+        layout.beginTransaction()
+        self.assertTrue(layout.tryAddBrick(0, 0, LegoBrick(1, 1, 1)) or
+                        layout.getAreaMatrix()[0][0] != 0)
+        layout.commitTransaction()
+        self.assertFalse(layout.hasSameCoverage(copy))
+        layout.rollbackTransaction()
+
+        self.assertTrue(layout.hasSameCoverage(copy))
+        self.assertTrue((layout.getAreaMatrix() == copy.getAreaMatrix()).all())
+        self.assertEqual(copy.getChangedArea(), layout.getChangedArea())
+        self.assertEqual(copy.getFreeRowCuts().tolist(),
+                         layout.getFreeRowCuts().tolist())
+
+        throws = False
+        try:
+            layout.commitTransaction()
+        except ValueError as e:
+            throws = True
+        self.assertTrue(throws, "Commit without an open transaction")
+
+    def test_pickle(self):
+        width = 6
+        height = 6
+        layout = LegoBrickLayout()
+        layout.initialize(width, height,
+                          self.__createBrickCollection(width * height))
+        loaded = pickle.loads(pickle.dumps(layout))
+
+        self.assertTrue(loaded.isInitialized())
+        self.assertTrue(loaded.hasSameCoverage(layout))
+        self.assertTrue((loaded.getAreaMatrix() == layout.getAreaMatrix()).all())
+        self.assertEqual(layout.getCoveredArea(), loaded.getCoveredArea())
+        self.assertEqual(layout.getFreeRowCuts().tolist(),
+                         loaded.getFreeRowCuts().tolist())
+        self.assertEqual(
+            layout.getCollection().getAmountOfAvailableBricks(),
+            loaded.getCollection().getAmountOfAvailableBricks())
+
+        # the bricks generated after loading don't reuse the loaded IDs
+        ids = [brick[2].getId() for brick in loaded.getAreaBricks()]
+        brick = loaded.getCollection().getRandomBrick()
+        if brick is not None:
+            self.assertGreater(brick.getId(), max(ids, default=0))
+
+        self.assertFalse(
+            pickle.loads(pickle.dumps(LegoBrickLayout())).isInitialized())
+
     def __createBrickCollection(self, area: int) -> LegoBrickCollection:
         bricks = []
         bricks.append(LegoBrick(2, 3))
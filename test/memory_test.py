@@ -0,0 +1,96 @@
+# memory_test.py
+
+import unittest
+
+import numpy as np
+
+import lego.memory as Memory
+from lego.brick import LegoBrick
+from lego.collection import LegoBrickCollection
+from lego.ga import LegoBrickGA
+from lego.layout import LegoBrickLayout
+
+
+class Memory_Test(unittest.TestCase):
+    def setUp(self):
+        self.bricks = [
+            LegoBrick(1, 1),
+            LegoBrick(2, 1),
+            LegoBrick(3, 2),
+            LegoBrick(4, 2)
+        ]
+
+    def test_objectBytes(self):
+        array = np.zeros(1000, dtype=np.int32)
+        self.assertGreaterEqual(Memory.getObjectBytes(array), array.nbytes)
+        self.assertGreaterEqual(Memory.getObjectBytes(array[10:]),
+                                array.nbytes)
+
+        seen = set()
+        first = Memory.getObjectBytes([array], seen)
+        self.assertLess(Memory.getObjectBytes([array], seen), array.nbytes)
+        self.assertGreater(first, array.nbytes)
+
+    def test_estimation(self):
+        with self.assertRaises(ValueError):
+            Memory.estimateLayoutBytes(0, 10, self.bricks)
+        with self.assertRaises(TypeError):
+            Memory.estimateLayoutBytes(10, 10, None)
+
+        for width, height in [(10, 20), (48, 40)]:
+            population = []
+            for _ in range(3):
+                collection = LegoBrickCollection()
+                collection.initialize(width * height, self.bricks)
+                layout = LegoBrickLayout()
+                layout.initialize(width, height, collection)
+                population.append(layout.copy())
+            usage = Memory.getPopulationUsage(population)
+            self.assertEqual(3, usage.layers)
+            self.assertEqual(3 * usage.bytesPerLayer, usage.totalBytes)
+            estimation = Memory.estimateLayoutBytes(width, height,
+                                                    self.bricks)
+            self.assertAlmostEqual(1.0,
+                                   estimation / usage.bytesPerLayer,
+                                   delta=0.3)
+
+    def test_maxPopulationSize(self):
+        with self.assertRaises(ValueError):
+            Memory.getMaxPopulationSize(10, 10, self.bricks, 0)
+        layoutBytes = Memory.estimateLayoutBytes(10, 10, self.bricks)
+        self.assertEqual(
+            layoutBytes * 10 * Memory.POPULATIONS_IN_MEMORY,
+            Memory.estimatePopulationBytes(10, 10, 10, self.bricks))
+        self.assertEqual(
+            10,
+            Memory.getMaxPopulationSize(
+                10, 10, self.bricks,
+                layoutBytes * 11 * Memory.POPULATIONS_IN_MEMORY))
+        self.assertEqual(
+            0, Memory.getMaxPopulationSize(10, 10, self.bricks, layoutBytes))
+
+    def test_gaMaxMemory(self):
+        collection = LegoBrickCollection()
+        collection.initialize(100, self.bricks)
+        layoutBytes = Memory.estimateLayoutBytes(10, 10, self.bricks)
+        with self.assertRaises(ValueError):
+            LegoBrickGA(10, 10, collection, 10, 0.5, maxMemory=layoutBytes)
+
+        ga = LegoBrickGA(
+            10,
+            10,
+            collection,
+            20,
+            0.5,
+            seed=3,
+            maxMemory=layoutBytes * 6 * Memory.POPULATIONS_IN_MEMORY)
+        snapshots = list(ga.iterGenerations(2))
+        for snapshot in snapshots:
+            self.assertEqual(6, len(snapshot.coverages))
+            memory = snapshot.statistics["memory"]
+            self.assertEqual(6, memory.layers)
+            self.assertGreater(memory.bytesPerLayer, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
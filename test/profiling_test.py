@@ -0,0 +1,129 @@
+# profiling_test.py
+
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+import lego.profiling as Profiling
+import test.fixtures as Fixtures
+from lego.brick import LegoBrick
+from lego.collection import LegoBrickCollection
+from lego.ga import LegoBrickGA
+
+
+class Profiling_Test(unittest.TestCase):
+    def tearDown(self):
+        Profiling.setProfiler(None)
+
+    def test_profiler(self):
+        profiler = Profiling.Profiler()
+        profiler.addSeconds("crossover", 1.0)
+        profiler.count("crossovers", 3)
+        self.assertEqual({"crossover": 1.0}, profiler.getGeneration().phases)
+        profiler.nextGeneration()
+        profiler.addSeconds("crossover", 0.5)
+        profiler.count("crossovers")
+
+        self.assertEqual({"crossovers": 1}, profiler.getGeneration().counters)
+        total = profiler.getTotal()
+        self.assertEqual({"crossover": 1.5}, total.phases)
+        self.assertEqual({"crossovers": 4}, total.counters)
+        self.assertEqual(2, total.generations)
+
+    def test_disabled(self):
+        Profiling.setProfiler(None)
+        start = Profiling.start()
+        self.assertIsNone(start)
+        Profiling.stop("phase", start)
+        Profiling.count("counter")
+
+    def test_threadProfiler(self):
+        profiler = Profiling.Profiler()
+        Profiling.setProfiler(profiler)
+        thread = threading.Thread(target=lambda: Profiling.count("counter"))
+        thread.start()
+        thread.join()
+        Profiling.stop("phase", Profiling.start())
+        Profiling.count("counter", 2)
+        self.assertEqual({"counter": 2}, profiler.getGeneration().counters)
+        self.assertIn("phase", profiler.getGeneration().phases)
+
+    def test_stackSampler(self):
+        def busyFunction():
+            end = time.perf_counter() + 0.2
+            while time.perf_counter() < end:
+                pass
+
+        sampler = Profiling.StackSampler(0.001)
+        sampler.start()
+        busyFunction()
+        sampler.stop()
+
+        stacks = sampler.getStacks()
+        self.assertGreater(len(stacks), 0)
+        self.assertTrue(
+            any(
+                stack.split(";")[-1].startswith("busyFunction")
+                for stack in stacks))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "profile.collapsed")
+            sampler.writeCollapsed(path)
+            with open(path) as file:
+                lines = file.read().splitlines()
+        self.assertEqual(len(stacks), len(lines))
+        for line in lines:
+            stack, samples = line.rsplit(" ", 1)
+            self.assertEqual(stacks[stack], int(samples))
+
+        with self.assertRaises(ValueError):
+            sampler.start()
+
+    def test_gaProfile(self):
+        collection = LegoBrickCollection()
+        collection.initialize(
+            64, [LegoBrick(1, 1), LegoBrick(1, 2),
+                 LegoBrick(2, 3)], uniform=True)
+        snapshots = list(
+            LegoBrickGA(8, 8, collection, 10, 0.5, seed=7,
+                        profile=True).iterGenerations(3))
+
+        self.assertIn("population", snapshots[0].statistics["profile"].phases)
+        for snapshot in snapshots[1:]:
+            profile = snapshot.statistics["profile"]
+            for phase in ["selection", "crossover", "mutation", "dedup"]:
+                self.assertIn(phase, profile.phases)
+            self.assertGreater(profile.counters["crossovers"], 0)
+        total = snapshots[-1].statistics["profileTotal"]
+        self.assertEqual(len(snapshots), total.generations)
+        self.assertEqual(
+            sum(snapshot.statistics["profile"].counters["crossovers"]
+                for snapshot in snapshots[1:]), total.counters["crossovers"])
+
+        collection = LegoBrickCollection()
+        collection.initialize(64, [LegoBrick(1, 1)], uniform=True)
+        snapshot = next(
+            LegoBrickGA(8, 8, collection, 10, 0.5, seed=7).iterGenerations(1))
+        self.assertNotIn("profile", snapshot.statistics)
+
+    def test_gaProfileResumed(self):
+        expected = list(
+            Fixtures.createGa(seed=7, profile=True).iterGenerations(6))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "ga.checkpoint")
+            Fixtures.createGa(seed=7, profile=True).evolveGeneration(
+                3, checkpointPath=path)
+            resumed = list(
+                LegoBrickGA.loadCheckpoint(path).iterGenerations(6))
+
+        # the generation of the checkpoint is published again, but it isn't measured again
+        self.assertEqual(3, resumed[0].generation)
+        for first, second in zip(expected[4:], resumed[1:]):
+            self.assertEqual(first.statistics["profileTotal"].generations,
+                             second.statistics["profileTotal"].generations)
+        self.assertEqual(7, resumed[-1].statistics["profileTotal"].generations)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+# render_test.py
+
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+import zlib
+
+import numpy as np
+
+import lego.render as Render
+
+
+class Render_Test(unittest.TestCase):
+    def test_remapIds(self):
+        matrix = np.array([[0, 9, 9], [4, 4, 0], [7, 9, 2]], dtype=np.int32)
+        self.assertEqual([[0, 50, 50], [51, 51, 0], [52, 50, 53]],
+                         Render.remapIds(matrix, 50).tolist())
+        self.assertEqual([[0, 1, 1], [2, 2, 0], [3, 1, 4]],
+                         Render.remapIds(matrix).tolist())
+        self.assertEqual([[0, 9, 9]], matrix[:1].tolist())
+        self.assertEqual([[0, 0]],
+                         Render.remapIds(np.zeros((1, 2),
+                                                  dtype=np.int32)).tolist())
+
+    def test_preview(self):
+        with self.assertRaises(ValueError):
+            Render.getPreview(np.zeros((4, 4)), 0)
+        matrix = np.arange(100).reshape(10, 10)
+        self.assertIs(matrix, Render.getPreview(matrix, 10))
+        preview = Render.getPreview(matrix, 4)
+        self.assertEqual(3, Render.getPreviewStep(matrix.shape, 4))
+        self.assertEqual((4, 4), preview.shape)
+        self.assertEqual(matrix[3, 6], preview[1, 2])
+
+    def test_colors(self):
+        matrix = np.array([[0, 5], [10, 0]])
+        colors = Render.getColors(matrix, gradient=False)
+        self.assertEqual(list(Render.UNCOVERED_COLOR), colors[0, 0].tolist())
+        self.assertEqual(list(Render.COVERED_COLOR), colors[0, 1].tolist())
+        colors = Render.getColors(matrix)
+        self.assertEqual(list(Render.GRADIENT_LOW_COLOR), colors[0, 0].tolist())
+        self.assertEqual(list(Render.GRADIENT_HIGH_COLOR),
+                         colors[1, 0].tolist())
+
+    def test_writeImage(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "layer.png")
+            matrix = np.array([[0, 1, 1], [2, 2, 0]], dtype=np.int32)
+            with self.assertRaises(ValueError):
+                Render.writeImage(path, matrix, scale=0)
+            Render.writeImage(path, matrix, gradient=False, scale=2)
+            with open(path, "rb") as file:
+                data = file.read()
+        finally:
+            shutil.rmtree(directory)
+
+        self.assertEqual(b"\x89PNG\r\n\x1a\n", data[:8])
+        width, height = struct.unpack(">II", data[16:24])
+        # the rows of the matrix are the columns of the image
+        self.assertEqual((4, 6), (width, height))
+        length = struct.unpack(">I", data[33:37])[0]
+        self.assertEqual(b"IDAT", data[37:41])
+        rows = np.frombuffer(
+            zlib.decompress(data[41:41 + length]),
+            dtype=np.uint8).reshape(height, width * 3 + 1)
+        pixels = rows[:, 1:].reshape(height, width, 3)
+        self.assertEqual(list(Render.UNCOVERED_COLOR), pixels[1, 1].tolist())
+        self.assertEqual(list(Render.COVERED_COLOR), pixels[2, 1].tolist())
+        self.assertEqual(list(Render.UNCOVERED_COLOR), pixels[5, 3].tolist())
+
+
+if __name__ == '__main__':
+    unittest.main()
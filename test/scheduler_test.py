@@ -0,0 +1,68 @@
+# scheduler_test.py
+
+import unittest
+
+import lego.ga_utils as GaUtils
+import test.fixtures as Fixtures
+from lego.scheduler import OperatorScheduler
+
+
+class OperatorScheduler_Test(unittest.TestCase):
+    def test_wrongInitialization(self):
+        throws = False
+        try:
+            OperatorScheduler([])
+        except ValueError as e:
+            throws = True
+        self.assertTrue(
+            throws,
+            "OperatorScheduler constructor didn't throw ValueError on illegal parameter"
+        )
+
+        throws = False
+        try:
+            OperatorScheduler(list(GaUtils.Crossovers), minProbability=0.5)
+        except ValueError as e:
+            throws = True
+        self.assertTrue(
+            throws,
+            "OperatorScheduler constructor didn't throw ValueError on illegal parameter"
+        )
+
+    def test_adaptation(self):
+        operators = list(GaUtils.Mutations)
+        scheduler = OperatorScheduler(operators, minProbability=0.05)
+        self.assertAlmostEqual(1.0 / len(operators),
+                               scheduler.getProbabilities()[0])
+
+        for _ in range(20):
+            scheduler.update(GaUtils.Mutations.ADD, True, 4, 0.001)
+            scheduler.update(GaUtils.Mutations.REMOVE, True, -4, 0.001)
+            scheduler.update(GaUtils.Mutations.MOVE, False, 0, 0.001)
+
+        probabilities = scheduler.getProbabilities()
+        self.assertAlmostEqual(1.0, probabilities.sum())
+        self.assertAlmostEqual(0.05, probabilities.min())
+        self.assertEqual(
+            operators.index(GaUtils.Mutations.ADD), probabilities.argmax())
+
+        statistics = scheduler.getStatistics()
+        self.assertEqual(20, statistics["ADD"].calls)
+        self.assertEqual(80, statistics["ADD"].gain)
+        self.assertEqual(0, statistics["MOVE"].successes)
+        self.assertEqual(0, statistics["CHANGE"].calls)
+        self.assertIn(scheduler.select(), operators)
+
+    def test_adaptiveMutations(self):
+        # the slide and the snap mutations are left to the adaptive operators
+        self.assertNotIn(GaUtils.Mutations.SLIDE, GaUtils.MutationsList)
+        self.assertNotIn(GaUtils.Mutations.SNAP, GaUtils.MutationsList)
+        snapshot = list(
+            Fixtures.createGa(adaptiveOperators=True).iterGenerations(1))[-1]
+        mutations = snapshot.statistics["operators"]["mutations"]
+        self.assertEqual(set(mutation.name for mutation in GaUtils.Mutations),
+                         set(mutations.keys()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+# seeding_test.py
+
+import unittest
+
+import numpy as np
+
+import lego.seeding as Seeding
+import test.fixtures as Fixtures
+from lego.brick import LegoBrick
+from lego.layout import LegoBrickLayout
+
+
+class Seeding_Test(unittest.TestCase):
+
+    __manyTestValue = 10
+
+    def test_emptyLayout(self):
+        layout = LegoBrickLayout()
+        layout.initialize(5, 5, Fixtures.createCollection(
+            5 * 5, Fixtures.createBricks() + [LegoBrick(1, 4)]), False)
+        self.assertTrue(layout.isInitialized())
+        self.assertEqual(0, layout.getCoveredArea())
+        self.assertEqual(0, len(layout.getAreaBricks()))
+
+    def test_createLayout(self):
+        for seeding in Seeding.Seedings:
+            collection = Fixtures.createCollection(
+                7 * 9, Fixtures.createBricks() + [LegoBrick(1, 4)])
+            layout = Seeding.createLayout(seeding, 7, 9, collection)
+            self.assertTrue(layout.isInitialized())
+            self.assertEqual(
+                np.count_nonzero(layout.getAreaMatrix()),
+                layout.getCoveredArea())
+            self.assertEqual(
+                sum(brick[2].getArea() for brick in layout.getAreaBricks()),
+                layout.getCoveredArea())
+            self.assertEqual(
+                collection.getAmountOfAvailableBricks(),
+                len(layout.getAreaBricks()) +
+                layout.getCollection().getAmountOfAvailableBricks())
+
+    def test_manyCreateLayout(self):
+        for _ in range(Seeding_Test.__manyTestValue):
+            self.test_createLayout()
+
+    def test_fullCoverage(self):
+        # the unit bricks are enough to cover the whole layout
+        collection = Fixtures.createCollection(6 * 6, [LegoBrick(1, 1)])
+        for seeding in Seeding.Seedings:
+            layout = Seeding.createLayout(seeding, 6, 6, collection)
+            self.assertEqual(6 * 6, layout.getCoveredArea())
+
+
+if __name__ == '__main__':
+    unittest.main()
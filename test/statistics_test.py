@@ -0,0 +1,99 @@
+# statistics_test.py
+
+import unittest
+
+import numpy as np
+
+import lego.statistics as Statistics
+
+
+class Statistics_Test(unittest.TestCase):
+    def test_coverageStatistics(self):
+        statistics = Statistics.getCoverageStatistics(
+            np.array([5, 1, 3, 9], dtype=np.int32))
+        self.assertEqual(
+            Statistics.CoverageStatistics(9, 1, 4.5, 4.0, 18, 4), statistics)
+
+        with self.assertRaises(ValueError):
+            Statistics.getCoverageStatistics(np.array([]))
+
+    def test_p2QuantileIsExactForFewValues(self):
+        quantile = Statistics.P2Quantile()
+        self.assertIsNone(quantile.getQuantile())
+        values = [7, 1, 4, 3]
+        quantile.addAll(values)
+        self.assertEqual(np.median(values), quantile.getQuantile())
+        self.assertEqual(4, quantile.getCount())
+
+        with self.assertRaises(ValueError):
+            Statistics.P2Quantile(1.0)
+
+    def test_p2Quantile(self):
+        generator = np.random.default_rng(3)
+        for p in [0.1, 0.5, 0.9]:
+            values = generator.normal(500, 50, 20000)
+            quantile = Statistics.P2Quantile(p)
+            quantile.addAll(values)
+            self.assertAlmostEqual(
+                np.quantile(values, p), quantile.getQuantile(), delta=5)
+
+    def test_runningStatistics(self):
+        running = Statistics.RunningStatistics()
+        self.assertIsNone(running.getStatistics())
+        generator = np.random.default_rng(5)
+        generations = [generator.integers(0, 1000, 50) for _ in range(40)]
+        for coverages in generations:
+            running.addAll(coverages)
+
+        values = np.concatenate(generations)
+        statistics = running.getStatistics()
+        self.assertEqual(values.max(), statistics.max)
+        self.assertEqual(values.min(), statistics.min)
+        self.assertAlmostEqual(values.mean(), statistics.mean)
+        self.assertEqual(values.sum(), statistics.sum)
+        self.assertEqual(len(values), statistics.count)
+        self.assertEqual(np.median(values), statistics.median)
+
+        # an odd amount of values, with a value above the counted ones
+        running.addAll(np.array([1500]))
+        values = np.append(values, 1500)
+        self.assertEqual(np.median(values), running.getStatistics().median)
+
+    def test_ringBuffer(self):
+        with self.assertRaises(ValueError):
+            Statistics.RingBuffer(0, 1)
+
+        buffer = Statistics.RingBuffer(3, 2)
+        self.assertEqual((0, 2), buffer.getRows().shape)
+        buffer.append([0, 0])
+        buffer.append([1, 10])
+        self.assertEqual([[0, 0], [1, 10]], buffer.getRows().tolist())
+        for i in range(2, 5):
+            buffer.append([i, i * 10])
+        self.assertEqual(3, len(buffer))
+        self.assertEqual(5, buffer.getAppendedAmount())
+        self.assertEqual([[2, 20], [3, 30], [4, 40]],
+                         buffer.getRows().tolist())
+
+        # the rows of a checkpoint, in a bigger and in a smaller buffer
+        rows, appended = buffer.getRows(), buffer.getAppendedAmount()
+        bigger = Statistics.RingBuffer(4, 2)
+        bigger.setRows(rows, appended)
+        self.assertEqual(5, bigger.getAppendedAmount())
+        bigger.append([5, 50])
+        bigger.append([6, 60])
+        self.assertEqual([[3, 30], [4, 40], [5, 50], [6, 60]],
+                         bigger.getRows().tolist())
+        self.assertEqual(7, bigger.getAppendedAmount())
+        smaller = Statistics.RingBuffer(2, 2)
+        smaller.setRows(rows, appended)
+        self.assertEqual([[3, 30], [4, 40]], smaller.getRows().tolist())
+        self.assertEqual(5, smaller.getAppendedAmount())
+        with self.assertRaises(ValueError):
+            smaller.setRows(rows, 2)
+        with self.assertRaises(ValueError):
+            smaller.setRows(np.zeros((1, 3)), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
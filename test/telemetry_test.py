@@ -0,0 +1,78 @@
+# telemetry_test.py
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import lego.telemetry as Telemetry
+import test.fixtures as Fixtures
+from lego.telemetry import TelemetrySink
+
+
+class TelemetrySink_Test(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "telemetry.jsonl")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_wrongInitialization(self):
+        with self.assertRaises(ValueError):
+            TelemetrySink(self.path, maxBytes=-1)
+        with self.assertRaises(ValueError):
+            TelemetrySink(self.path, backupCount=-1)
+        with self.assertRaises(ValueError):
+            TelemetrySink(self.path, flushInterval=0.0)
+
+    def test_records(self):
+        handler = Fixtures.RecordingHandler()
+        with TelemetrySink(self.path,
+                           generationResultHandler=handler) as sink:
+            # the wrapped handler receives the populations
+            self.assertTrue(sink.needsPopulation())
+            best = Fixtures.createGa(adaptiveOperators=True,
+                                     profile=True).evolveGeneration(5, sink)
+            self.assertEqual(handler.generations, sink.getCheckpointState())
+        self.assertEqual([0, 1, 2, 3, 4, 5], handler.generations)
+
+        with open(self.path) as file:
+            records = [json.loads(line) for line in file]
+        self.assertEqual([0, 1, 2, 3, 4, 5],
+                         [record["generation"] for record in records])
+        last = records[-1]
+        self.assertEqual(best.getCoveredArea(), last["bestCoverage"])
+        self.assertLessEqual(last["minCoverage"], last["meanCoverage"])
+        self.assertLessEqual(last["meanCoverage"], last["bestCoverage"])
+        self.assertIn("crossover", last["phases"])
+        self.assertIn("crossovers", last["operators"])
+        self.assertGreaterEqual(last["rejectionRate"], 0.0)
+
+        with self.assertRaises(ValueError):
+            sink.onGaSnapshot(None)
+
+    def test_rotation(self):
+        with TelemetrySink(self.path, maxBytes=2000, backupCount=2) as sink:
+            self.assertFalse(sink.needsPopulation())
+            for snapshot in Fixtures.createGa(
+                    adaptiveOperators=True, profile=True).iterGenerations(30):
+                sink.onGaSnapshot(snapshot)
+                sink.flush()
+        self.assertTrue(os.path.exists(self.path + ".1"))
+        self.assertTrue(os.path.exists(self.path + ".2"))
+        self.assertFalse(os.path.exists(self.path + ".3"))
+        for path in [self.path, self.path + ".1", self.path + ".2"]:
+            self.assertLessEqual(os.path.getsize(path), 2000)
+        with open(self.path) as file:
+            self.assertEqual(30, json.loads(file.readlines()[-1])["generation"])
+
+    def test_rss(self):
+        rss = Telemetry.getRss()
+        if rss is not None:
+            self.assertGreater(rss, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,10 +9,6 @@ def checkDependencies():
     import matplotlib
     print("checked!")
 
-    print("checking pandas..")
-    import pandas
-    print("checked!")
-
     print("checking numpy..")
     import numpy
     print("checked!")
@@ -26,7 +22,11 @@ def checkDependencies():
 def runUnittests():
     testmodules = [
         "test.brick_test", "test.collection_test", "test.ge_utils_test",
-        "test.layout_test"
+        "test.layout_test", "test.ga_test", "test.scheduler_test",
+        "test.seeding_test", "test.bounds_test", "test.ga_async_test",
+        "test.dispatch_test", "test.statistics_test", "test.profiling_test",
+        "test.telemetry_test", "test.memory_test",
+        "test.render_test"
     ]
 
     suite = unittest.TestSuite()